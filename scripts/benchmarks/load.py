@@ -0,0 +1,362 @@
+"""End-to-end load test of the app with concurrent virtual users.
+
+Each scenario (login, /users/me, list users, create and update a user) runs
+for `--duration` seconds with `--users` virtual users issuing requests back
+to back, and is reported as RPS and p50/p95/p99 latency in JSON. The app is
+driven in-process through ASGI, or with `--socket` over a local uvicorn port.
+
+The database is an in-memory Motor stand-in (mongomock-motor, a dev
+dependency) by default, or with `--backend mongo` a throwaway database on
+`MONGO_URI`, dropped afterwards. Pass `--baseline previous.json` to exit
+with status 1 when a scenario regresses by more than `--threshold`.
+
+Run with `python -m scripts.benchmarks.load`.
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import httpx
+import uvicorn
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from src.db.client import create_client
+from src.db.collections import collections
+from src.db.indexes import ensure_indexes
+from src.main import app
+from src.models.role import Permissions, Role
+from src.models.user import UserIn
+
+PASSWORD = "load-test"  # noqa: S105 - password of the seeded users
+# Reports are only comparable when measured the same way
+COMPARABLE_KEYS = ("backend", "transport", "users")
+SEED_USERS = 200
+PAGE_SIZE = 50
+
+
+@dataclass
+class Fixture:
+    role_id: str
+    username: str
+    user_ids: list[str]
+    headers: dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class Stats:
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+    elapsed: float = 0.0
+
+    def summary(self) -> dict:
+        ok = len(self.latencies)
+        cuts = (
+            statistics.quantiles(self.latencies, n=100, method="inclusive")
+            if ok > 1
+            else [self.latencies[0] if ok else 0.0] * 99
+        )
+        return {
+            "requests": ok + self.errors,
+            "errors": self.errors,
+            "rps": round(ok / self.elapsed, 1) if self.elapsed else 0.0,
+            "p50_ms": round(cuts[49] * 1000, 2),
+            "p95_ms": round(cuts[94] * 1000, 2),
+            "p99_ms": round(cuts[98] * 1000, 2),
+        }
+
+
+Scenario = Callable[[httpx.AsyncClient, Fixture, int, int], Awaitable[httpx.Response]]
+
+
+async def login(client: httpx.AsyncClient, fixture: Fixture, *_) -> httpx.Response:
+    return await client.post(
+        "/auth",
+        json={"username": fixture.username, "password": PASSWORD},
+    )
+
+
+async def me(client: httpx.AsyncClient, fixture: Fixture, *_) -> httpx.Response:
+    return await client.get("/users/me", headers=fixture.headers)
+
+
+async def list_users(client: httpx.AsyncClient, fixture: Fixture, *_) -> httpx.Response:
+    return await client.get(
+        "/users",
+        params={"limit": PAGE_SIZE},
+        headers=fixture.headers,
+    )
+
+
+async def create_user(
+    client: httpx.AsyncClient,
+    fixture: Fixture,
+    user: int,
+    step: int,
+) -> httpx.Response:
+    return await client.post(
+        "/users",
+        json={
+            "username": f"load_{ObjectId()}",
+            "name": f"Load {user}.{step}",
+            "role_id": fixture.role_id,
+            "password": PASSWORD,
+        },
+        headers=fixture.headers,
+    )
+
+
+async def update_user(
+    client: httpx.AsyncClient,
+    fixture: Fixture,
+    user: int,
+    step: int,
+) -> httpx.Response:
+    user_id = fixture.user_ids[(user + step) % len(fixture.user_ids)]
+    return await client.patch(
+        f"/users/{user_id}",
+        json={"name": f"Updated {user}.{step}"},
+        headers=fixture.headers,
+    )
+
+
+SCENARIOS: dict[str, Scenario] = {
+    "login": login,
+    "me": me,
+    "list_users": list_users,
+    "create_user": create_user,
+    "update_user": update_user,
+}
+
+
+async def open_database(backend: str) -> tuple[AsyncIOMotorDatabase, Callable]:
+    name = f"load-test-{ObjectId()}"
+    if backend == "mongo":
+        client = create_client()
+
+        async def close() -> None:
+            await client.drop_database(name)
+            client.close()
+
+    else:
+        try:
+            from mongomock_motor import AsyncMongoMockClient  # noqa: PLC0415
+        except ImportError:
+            sys.exit("The memory backend needs mongomock-motor, run `uv sync`")
+        client = AsyncMongoMockClient()
+
+        async def close() -> None:
+            client.close()
+
+    return client.get_database(name), close
+
+
+async def seed(db: AsyncIOMotorDatabase) -> Fixture:
+    role = Role(
+        id=str(ObjectId()),
+        name="Load test",
+        permissions=Permissions.root_user(),
+    )
+    await db[collections.roles_collection].insert_one(role.model_dump_mongo())
+    # Hash the password once, bcrypt would dominate the seeding otherwise
+    template = UserIn(
+        username="load_template",
+        name="Load",
+        role_id=role.id,
+        password=PASSWORD,
+    )
+    users = [
+        template.model_copy(
+            update={"id": str(ObjectId()), "username": f"load_seed_{i}"},
+        )
+        for i in range(SEED_USERS)
+    ]
+    await db[collections.users_collection].insert_many(
+        [user.model_dump_mongo() for user in users],
+    )
+    return Fixture(
+        role_id=role.id,
+        username=users[0].username,
+        user_ids=[user.id for user in users],
+    )
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    fixture: Fixture,
+    scenario: Scenario,
+    users: int,
+    duration: float,
+) -> Stats:
+    stats = Stats()
+    deadline = time.perf_counter() + duration
+
+    async def virtual_user(user: int) -> None:
+        step = 0
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                response = await scenario(client, fixture, user, step)
+            except httpx.HTTPError:
+                # Refused or reset connections and timeouts of the socket mode
+                stats.errors += 1
+            else:
+                if response.is_success:
+                    stats.latencies.append(time.perf_counter() - start)
+                else:
+                    stats.errors += 1
+            step += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(virtual_user(user) for user in range(users)))
+    stats.elapsed = time.perf_counter() - start
+    return stats
+
+
+async def serve(port: int):
+    server = uvicorn.Server(
+        uvicorn.Config(
+            app,
+            host="127.0.0.1",
+            port=port,
+            lifespan="off",
+            log_level="warning",
+            access_log=False,
+        ),
+    )
+    task = asyncio.ensure_future(server.serve())
+    while not server.started:
+        if task.done():
+            task.result()
+        await asyncio.sleep(0.01)
+
+    async def stop() -> None:
+        server.should_exit = True
+        await task
+
+    return stop
+
+
+async def benchmark(args: argparse.Namespace) -> dict:
+    db, close_database = await open_database(args.backend)
+    app.state.db = db
+    await ensure_indexes(db)
+    fixture = await seed(db)
+
+    stop_server = None
+    if args.socket:
+        stop_server = await serve(args.port)
+        client = httpx.AsyncClient(
+            base_url=f"http://127.0.0.1:{args.port}",
+            limits=httpx.Limits(max_connections=args.users),
+        )
+    else:
+        client = httpx.AsyncClient(
+            # Unhandled exceptions become 500 responses, as behind a server
+            transport=httpx.ASGITransport(app=app, raise_app_exceptions=False),
+            base_url="http://load-test",
+        )
+
+    results = {}
+    try:
+        token = (await login(client, fixture)).json()["access_token"]
+        fixture.headers = {"Authorization": f"Bearer {token}"}
+        for name in args.scenarios:
+            scenario = SCENARIOS[name]
+            await run_scenario(client, fixture, scenario, args.users, args.warmup)
+            stats = await run_scenario(
+                client,
+                fixture,
+                scenario,
+                args.users,
+                args.duration,
+            )
+            results[name] = stats.summary()
+    finally:
+        await client.aclose()
+        if stop_server is not None:
+            await stop_server()
+        await close_database()
+
+    return {
+        "backend": args.backend,
+        "transport": "socket" if args.socket else "asgi",
+        "users": args.users,
+        "duration": args.duration,
+        "scenarios": results,
+    }
+
+
+def find_regressions(current: dict, baseline: dict, threshold: float) -> list[str]:
+    """Scenarios slower or with fewer RPS than `baseline` beyond `threshold`."""
+    regressions = []
+    for name, result in current["scenarios"].items():
+        base = baseline.get("scenarios", {}).get(name)
+        if base is None:
+            continue
+        regressions.extend(
+            f"{name}: {metric} {result[metric]} > {base[metric]}"
+            for metric in ("p50_ms", "p95_ms", "p99_ms")
+            if result[metric] > base[metric] * (1 + threshold)
+        )
+        if result["rps"] < base["rps"] * (1 - threshold):
+            regressions.append(f"{name}: rps {result['rps']} < {base['rps']}")
+        if result["errors"] and not base["errors"]:
+            regressions.append(f"{name}: {result['errors']} errors")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backend", choices=("memory", "mongo"), default="memory")
+    parser.add_argument("--socket", action="store_true", help="serve on a port")
+    parser.add_argument("--port", type=int, default=8078)
+    parser.add_argument("--users", type=int, default=16, help="virtual users")
+    parser.add_argument("--duration", type=float, default=5, help="per scenario")
+    parser.add_argument("--warmup", type=float, default=1, help="per scenario")
+    parser.add_argument(
+        "--scenarios",
+        type=lambda value: value.split(","),
+        default=list(SCENARIOS),
+        help=f"comma separated, of {', '.join(SCENARIOS)}",
+    )
+    parser.add_argument("--output", type=Path, help="write the JSON report here")
+    parser.add_argument("--baseline", type=Path, help="JSON report to compare to")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="allowed relative regression, eg. 0.2 for 20%%",
+    )
+    args = parser.parse_args()
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    report = asyncio.run(benchmark(args))
+    output = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(output + "\n")
+    print(output)  # noqa: T201
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+        mismatch = [key for key in COMPARABLE_KEYS if baseline.get(key) != report[key]]
+        if mismatch:
+            sys.exit(f"baseline differs in {', '.join(mismatch)}, not comparable")
+        regressions = find_regressions(report, baseline, args.threshold)
+        for regression in regressions:
+            print(f"regression: {regression}", file=sys.stderr)  # noqa: T201
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Measure the per-request cost of the default and production log profiles.
+
+Replays the events of a typical request (start, three router logs, end)
+through each processor chain into a null handler, so only the logging
+overhead is timed. Run with `python -m scripts.benchmarks.logging_profiles`.
+"""
+
+import logging
+import timeit
+import uuid
+
+import structlog
+from structlog import contextvars
+
+from src.core.logger.context import request_log_state
+from src.core.logger.log import get_processors
+from src.core.logger.sampling import RequestLogState, RouteSampler
+
+REQUESTS = 20_000
+
+
+class Route:
+    path = "/users/me"
+
+
+def get_logger(profile: str):
+    stdlib_logger = logging.getLogger(f"benchmark.{profile}")
+    stdlib_logger.addHandler(logging.NullHandler())
+    stdlib_logger.setLevel(logging.INFO)
+    stdlib_logger.propagate = False
+    return structlog.wrap_logger(
+        stdlib_logger,
+        processors=get_processors(profile),
+        wrapper_class=structlog.stdlib.BoundLogger,
+        context_class=dict,
+    )
+
+
+def default_request(logger) -> None:
+    contextvars.bind_contextvars(request_id=str(uuid.uuid4()), path="/users/me")
+    contextvars.bind_contextvars(error=None, extra_str=None, spans=None)
+    logger.info(event="http.request.start", status_code=None)
+    for event in ("router.user.get_me", "db.user.lookup", "db.role.lookup"):
+        logger.info(event)
+    contextvars.bind_contextvars(error=None, extra_str=None)
+    logger.info(event="http.response.end", latency=1.0, status_code=200, spans=[])
+
+
+def production_request(logger, sampler: RouteSampler) -> None:
+    state = RequestLogState(scope={"route": Route()})
+    state.sampled = sampler.sample(Route.path)
+    request_log_state.set(state)
+    contextvars.bind_contextvars(
+        request_id=str(uuid.uuid4()),
+        path="/users/me",
+        error=None,
+        extra_str=None,
+    )
+    for event in ("router.user.get_me", "db.user.lookup", "db.role.lookup"):
+        logger.info(event)
+    logger.info(event="http.response.end", latency=1.0, status_code=200, spans=[])
+
+
+def main() -> None:
+    default_logger = get_logger("default")
+    production_logger = get_logger("production")
+    sampler = RouteSampler(rate=0.1)
+
+    default_time = timeit.timeit(
+        lambda: default_request(default_logger),
+        number=REQUESTS,
+    )
+    production_time = timeit.timeit(
+        lambda: production_request(production_logger, sampler),
+        number=REQUESTS,
+    )
+    request_log_state.set(None)
+    print(  # noqa: T201
+        f"default: {default_time / REQUESTS * 1e6:.1f}us/request, "
+        f"production (10% sampled): {production_time / REQUESTS * 1e6:.1f}us/request, "
+        f"reduction {1 - production_time / default_time:.0%}",
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Compare stdlib json and orjson for API responses and log lines.
+
+Run with `python -m scripts.benchmarks.serialization`, needs the `fast` extra.
+"""
+
+import timeit
+from datetime import UTC, datetime
+
+import structlog
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from src.core.utils.json import ORJSONResponse, orjson_log_serializer
+from src.models.common import Page
+from src.models.user import User
+
+ROUNDS = 200
+
+
+def get_page(size: int = 500) -> dict:
+    users = [
+        User(
+            id=str(ObjectId()),
+            username=f"user_{i}",
+            name=f"User {i}",
+            role_id=str(ObjectId()),
+        )
+        for i in range(size)
+    ]
+    page = Page[User](items=users, next_cursor="abc", estimated_total=size)
+    return jsonable_encoder(page, by_alias=True)
+
+
+def get_event() -> dict:
+    return {
+        "event": "http.response.end",
+        "request_id": str(ObjectId()),
+        "method": "GET",
+        "path": "/users",
+        "latency": 12.34,
+        "status_code": 200,
+        "timestamp": datetime.now(UTC).isoformat(),
+        "spans": [{"name": "get_users_page_db", "time": 3.21}] * 4,
+    }
+
+
+def compare(name: str, baseline, fast, number: int) -> None:
+    base_time = timeit.timeit(baseline, number=number)
+    fast_time = timeit.timeit(fast, number=number)
+    print(  # noqa: T201
+        f"{name}: json {base_time / number * 1e6:.1f}us, "
+        f"orjson {fast_time / number * 1e6:.1f}us, "
+        f"speedup {base_time / fast_time:.1f}x",
+    )
+
+
+def main() -> None:
+    page = get_page()
+    compare(
+        "response (500 users)",
+        lambda: JSONResponse(page).body,
+        lambda: ORJSONResponse(page).body,
+        ROUNDS,
+    )
+
+    event = get_event()
+    stdlib_renderer = structlog.processors.JSONRenderer()
+    orjson_renderer = structlog.processors.JSONRenderer(
+        serializer=orjson_log_serializer,
+    )
+    compare(
+        "log line",
+        lambda: stdlib_renderer(None, "info", dict(event)),
+        lambda: orjson_renderer(None, "info", dict(event)),
+        ROUNDS * 100,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""Measure how request throughput scales with the number of server workers.
+
+Starts `python -m src.server` with 1, 2, 4... workers up to the CPU count and
+drives it from separate client processes for a fixed time, so the load
+generator is not the bottleneck. Needs the Mongo of `MONGO_URI` running.
+Run with `python -m scripts.benchmarks.workers`.
+"""
+
+import argparse
+import asyncio
+import os
+import signal
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import httpx
+
+HOST = "127.0.0.1"
+PORT = 8077
+STARTUP_TIMEOUT = 30
+
+
+def default_worker_counts() -> list[int]:
+    cpus = os.cpu_count() or 1
+    counts, count = [], 1
+    while count < cpus:
+        counts.append(count)
+        count *= 2
+    return [*counts, cpus]
+
+
+def start_server(workers: int) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "SERVER_HOST": HOST,
+        "SERVER_PORT": str(PORT),
+        "SERVER_WORKERS": str(workers),
+        "JWT_SECRET": os.environ.get("JWT_SECRET", "benchmark-secret"),
+        # Measure raw throughput, not the shedding or the log volume
+        "ADMISSION_ENABLED": "False",
+        "APP_LOGGER_LEVEL": "40",
+    }
+    server = subprocess.Popen(
+        [sys.executable, "-m", "src.server"],
+        env=env,
+        stdout=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f"http://{HOST}:{PORT}/version", timeout=1)
+        except httpx.TransportError:
+            time.sleep(0.2)
+        else:
+            return server
+    server.kill()
+    message = f"server with {workers} workers did not start"
+    raise RuntimeError(message)
+
+
+def stop_server(server: subprocess.Popen) -> None:
+    server.send_signal(signal.SIGINT)
+    try:
+        server.wait(timeout=STARTUP_TIMEOUT)
+    except subprocess.TimeoutExpired:
+        server.kill()
+        server.wait()
+
+
+async def drive(path: str, connections: int, duration: float) -> int:
+    limits = httpx.Limits(max_connections=connections)
+    deadline = time.monotonic() + duration
+    async with httpx.AsyncClient(
+        base_url=f"http://{HOST}:{PORT}",
+        limits=limits,
+    ) as client:
+
+        async def connection() -> int:
+            done = 0
+            while time.monotonic() < deadline:
+                response = await client.get(path)
+                done += response.status_code == 200  # noqa: PLR2004
+            return done
+
+        return sum(
+            await asyncio.gather(*(connection() for _ in range(connections))),
+        )
+
+
+def client_process(path: str, connections: int, duration: float) -> int:
+    return asyncio.run(drive(path, connections, duration))
+
+
+def measure(
+    pool: ProcessPoolExecutor,
+    clients: int,
+    path: str,
+    connections: int,
+    duration: float,
+) -> float:
+    futures = [
+        pool.submit(client_process, path, connections, duration) for _ in range(clients)
+    ]
+    return sum(future.result() for future in futures) / duration
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--workers",
+        type=lambda value: [int(count) for count in value.split(",")],
+        default=default_worker_counts(),
+        help="comma separated worker counts, eg. 1,2,4",
+    )
+    parser.add_argument("--path", default="/version")
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--clients", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--connections", type=int, default=32)
+    args = parser.parse_args()
+
+    baseline = None
+    with ProcessPoolExecutor(max_workers=args.clients) as pool:
+        for workers in args.workers:
+            server = start_server(workers)
+            try:
+                # Warm up connections, the pools and the code paths
+                measure(pool, args.clients, args.path, args.connections, 1)
+                rps = measure(
+                    pool,
+                    args.clients,
+                    args.path,
+                    args.connections,
+                    args.duration,
+                )
+            finally:
+                stop_server(server)
+            baseline = baseline or rps
+            print(  # noqa: T201
+                f"{workers} workers: {rps:,.0f} req/s, speedup {rps / baseline:.2f}x",
+            )
+
+
+if __name__ == "__main__":
+    main()
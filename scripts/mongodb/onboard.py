@@ -1,12 +1,20 @@
 from pymongo.mongo_client import MongoClient
 
 from src.config.settings import settings
+from src.db.client import client_options
 from src.db.collections import collections
+from src.db.indexes import ensure_indexes_sync
 from src.models.role import Permissions, Role
 from src.models.user import UserIn
 
-client = MongoClient(settings.MONGO_URI)
+client = MongoClient(settings.MONGO_URI, **client_options())
 db = client.get_database(settings.DB_NAME)
+conflicts = ensure_indexes_sync(db)
+for collection_name, names in conflicts.items():
+    print(
+        f"Index conflict on {collection_name}: {', '.join(names)} "
+        "differ from src/db/collections.py, fix or drop them manually !",
+    )
 
 user_collection = db.get_collection(collections.users_collection)
 role_collection = db.get_collection(collections.roles_collection)
@@ -1,5 +1,6 @@
 import secrets
 import string
+from typing import Literal
 
 from pydantic import SecretStr
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -20,6 +21,14 @@ class EnvSettings(BaseSettings):
     model_config = SettingsConfigDict(case_sensitive=True, env_file=".env")
     PROJECT_NAME: str = "FastAPI Auth"
     MONGO_URI: str = "mongodb://localhost:27017"
+    MONGO_MAX_POOL_SIZE: int = 100
+    MONGO_MIN_POOL_SIZE: int = 0  # Connections opened before taking traffic
+    MONGO_MAX_IDLE_TIME_MS: int | None = None
+    MONGO_WAIT_QUEUE_TIMEOUT_MS: int | None = None  # Max wait for a free connection
+    MONGO_SERVER_SELECTION_TIMEOUT_MS: int = 30_000
+    MONGO_CONNECT_TIMEOUT_MS: int = 20_000
+    MONGO_COMPRESSORS: str | None = None  # eg. "zstd,snappy,zlib"
+    MONGO_ENSURE_INDEXES: bool = True  # Create missing indexes at startup
     ENV: str = Environments().TEST
     DB_NAME: str = Environments().TEST_DB_NAME
     TOKEN_EXPIRY_PERIOD: int = 30  # In minutes
@@ -27,8 +36,17 @@ class EnvSettings(BaseSettings):
     APP_LOGGER_LEVEL: int = 10
     APP_LOGGER_ADDRESS: str | None = None
     APP_LOGGER_PORT: int | None = None
+    APP_LOGGER_QUEUE_SIZE: int = 10_000
+    APP_LOGGER_QUEUE_OVERFLOW: Literal["drop", "block"] = "drop"
+    APP_LOGGER_QUEUE_BLOCK_TIMEOUT: float = 0.05  # In seconds
+    APP_LOGGER_PROFILE: Literal["default", "production"] = "default"
+    APP_LOGGER_SAMPLE_RATE: float = 0.1  # Share of success logs kept in production
+    APP_LOGGER_SAMPLE_ROUTE_RATES: str | None = None  # eg. "/health=0,/auth=1"
+    APP_LOGGER_SLOW_REQUEST_MS: float = 500
+    TRACING_EXPORTER: Literal["none", "otlp", "console"] = "none"
 
     JWT_ALGORITHM: str = "HS256"
+    FAST_JSON: bool = False  # Serialize responses and logs with orjson
     APP_LOGGER_SYS_LOG: bool = False
     ORIGINS: str = Environments().ORIGINS
     ROOT_USERNAME: SecretStr = SecretStr(create_random())
@@ -38,6 +56,51 @@ class EnvSettings(BaseSettings):
     MAIL_USERNAME: str | None = None
     MAIL_PASSWORD: str | None = None
     ENABLE_MAIL: bool = True
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_QUEUE: int = 64
+    PASSWORD_HASH_RETRY_AFTER: int = 1  # In seconds
+    TOKEN_CACHE_SIZE: int = 1024  # 0 disables the verified token cache
+    ENTITY_CACHE_ENABLED: bool = True
+    ENTITY_CACHE_TTL: int = 60  # In seconds
+    ENTITY_CACHE_NEGATIVE_TTL: int = 5  # In seconds
+    ENTITY_CACHE_ROLES_SIZE: int = 256
+    ENTITY_CACHE_USERS_SIZE: int = 4096
+    PAGE_SIZE_DEFAULT: int = 50
+    PAGE_SIZE_MAX: int = 500
+    UNPAGINATED_MAX: int = 1000  # Largest collection served with paginate=false
+    EXPORT_BATCH_SIZE: int = 500
+    EXPORT_BATCH_SIZE_MAX: int = 10_000
+    BULK_MAX_ITEMS: int = 1000
+    BULK_CHUNK_SIZE: int = 500
+    DB_LOADER_MAX_BATCH: int = 100  # Max ids per coalesced by-id query
+    CHANGELOG_CHECK_INTERVAL: float = 5  # Seconds between changelog mtime checks
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_CODINGS: str = "zstd,br,gzip"  # Server preference on q-value ties
+    COMPRESSION_MIN_SIZE: int = 1024  # Smaller bodies are sent as is
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    COMPRESSION_ZSTD_LEVEL: int = 3
+    COMPRESSION_THREAD_MIN_SIZE: int = 256 * 1024  # Larger bodies use the pool
+    COMPRESSION_WORKERS: int = 2
+    LOOP_LAG_INTERVAL: float = 0.25  # Seconds between event loop lag probes
+    LOOP_WATCHDOG_ENABLED: bool = False
+    LOOP_WATCHDOG_THRESHOLD_MS: float = 100
+    ADMISSION_ENABLED: bool = True
+    ADMISSION_LIMITS: str = "auth=16,write=64,read=256"  # In-flight per class
+    ADMISSION_QUEUE_SIZE: int = 128  # Waiting requests per class
+    ADMISSION_QUEUE_TIMEOUT: float = 2  # In seconds
+    ADMISSION_MAX_LOOP_LAG_MS: float = 250
+    ADMISSION_MAX_POOL_WAIT_MS: float = 500
+    ADMISSION_RETRY_AFTER: int = 1  # In seconds
+    ADMISSION_EXEMPT_PATHS: str = "/health,/health/live,/health/ready,/metrics"
+    READINESS_PING_INTERVAL: float = 5  # Seconds between background Mongo pings
+    READINESS_PING_TIMEOUT: float = 2  # In seconds
+    SHUTDOWN_DRAIN_DELAY: float = 5  # Seconds not ready before closing on SIGTERM
+    SERVER_HOST: str = "0.0.0.0"  # noqa: S104
+    SERVER_PORT: int = 8000
+    SERVER_WORKERS: int | None = None  # Defaults to the CPU count
+    SERVER_BACKLOG: int = 2048
+    SERVER_GRACEFUL_SHUTDOWN: int = 30  # In seconds
 
     def get_origins(self) -> list[str]:
         """Get list of origings."""
@@ -47,6 +110,11 @@ class EnvSettings(BaseSettings):
 class Settings(EnvSettings, Environments):
     def __init__(self):
         super().__init__()
+        # The random default differs per process, tokens would not verify
+        # across workers or restarts
+        if self.ENV == self.PROD and "JWT_SECRET" not in self.model_fields_set:
+            message = "JWT_SECRET must be set in production"
+            raise ValueError(message)
         if self.ENV == self.TEST and not self.APP_LOGGER_SYS_LOG:
             self.APP_LOGGER_ADDRESS = None
             self.APP_LOGGER_PORT = None
@@ -41,3 +41,19 @@ class ResourceInsertionFailedError(ResourceError):
 
     def __str__(self) -> str:
         return f"Resource {self.resource_name} - {self.resource_id} insertion failed!"
+
+
+class ResourceConflictError(ResourceError):
+    def __init__(
+        self,
+        resource_name: str,
+        resource_id: str,
+        status_code: int = 409,
+        event: str | None = None,
+    ) -> None:
+        super().__init__(
+            resource_name, resource_id, status_code=status_code, event=event,
+        )
+
+    def __str__(self) -> str:
+        return f"Resource {self.resource_name} - {self.resource_id} already exists!"
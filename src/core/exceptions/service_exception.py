@@ -0,0 +1,17 @@
+from src.core.exceptions.client_exception import ClientError
+
+
+class ServiceUnavailableError(ClientError):
+    def __init__(
+        self,
+        reason: str,
+        retry_after: int = 1,
+        status_code: int = 503,
+        event: str | None = None,
+    ) -> None:
+        self.reason = reason
+        self.retry_after = retry_after
+        super().__init__(status_code=status_code, event=event)
+
+    def __str__(self) -> str:
+        return f"Service unavailable: {self.reason}"
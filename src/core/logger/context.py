@@ -5,4 +5,6 @@ extra_str = ContextVar("extra_str", default=None)
 request_id = ContextVar("request_id", default=None)
 error = ContextVar("error", default=None)
 
-span_list = ContextVar("span_list", default=None)
+# Innermost open span of the request, see src.core.logger.spans
+current_span = ContextVar("current_span", default=None)
+request_log_state = ContextVar("request_log_state", default=None)
@@ -1,11 +1,24 @@
+import atexit
+import contextlib
 import logging
+import queue
+import threading
+from collections.abc import Callable
 from datetime import UTC, datetime
-from logging.handlers import RotatingFileHandler, SysLogHandler
+from logging.handlers import (
+    QueueHandler,
+    QueueListener,
+    RotatingFileHandler,
+    SysLogHandler,
+)
 from pathlib import Path
 
 import structlog
 
 from src.config.settings import settings
+from src.core.logger.context import request_log_state
+from src.core.metrics.registry import log_records_dropped
+from src.core.utils.json import fast_json_enabled, orjson_log_serializer
 
 logging.getLogger().setLevel(logging.CRITICAL)
 
@@ -16,48 +29,181 @@ app_logger_level = settings.APP_LOGGER_LEVEL
 app_logger.setLevel(app_logger_level)
 debug_logger.setLevel(app_logger_level)
 
-# First bind the local stdout logger to stream the output
 
-console_handler = logging.StreamHandler()
-console_handler.setLevel(app_logger_level)
+class BoundedQueueHandler(QueueHandler):
+    """Queue handler that drops records, or blocks for a while, when full.
+
+    `start` is called on the first record, to start whatever consumes the
+    queue in processes that did not start it themselves.
+    """
+
+    def __init__(
+        self,
+        log_queue: queue.Queue,
+        block: bool,
+        timeout: float,
+        start: Callable[[], None] | None = None,
+    ) -> None:
+        super().__init__(log_queue)
+        self.block = block
+        self.timeout = timeout
+        self.start = start
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self.start is not None:
+            start, self.start = self.start, None
+            start()
+        try:
+            self.queue.put(record, block=self.block, timeout=self.timeout)
+        except queue.Full:
+            self.dropped += 1
+            log_records_dropped.inc()
 
-if not Path.exists("logs"):
-    Path.mkdir("logs")
 
-file_handler = RotatingFileHandler(
-    f"logs/{datetime.strftime(datetime.now(UTC), '%Y_%m_%d')}.log",
-    maxBytes=1_000_000,
+log_queue = queue.Queue(maxsize=settings.APP_LOGGER_QUEUE_SIZE)
+queue_handler = BoundedQueueHandler(
+    log_queue,
+    block=settings.APP_LOGGER_QUEUE_OVERFLOW == "block",
+    timeout=settings.APP_LOGGER_QUEUE_BLOCK_TIMEOUT,
 )
 
-app_logger.addHandler(console_handler)
-app_logger.addHandler(file_handler)
-debug_logger.addHandler(console_handler)
+app_logger.addHandler(queue_handler)
+debug_logger.addHandler(queue_handler)
 
-if settings.APP_LOGGER_ADDRESS is None:
-    app_logger.warning("App logger address not set. Syslog will not be enabled.")
-elif settings.APP_LOGGER_ADDRESS and settings.APP_LOGGER_PORT:
-    web_handler = SysLogHandler(
-        address=(settings.APP_LOGGER_ADDRESS, settings.APP_LOGGER_PORT),
+# The handlers do blocking disk and socket I/O, so they only run on the
+# listener thread. Loggers just put records on the bounded queue. The handlers
+# are opened by `start_logging`, at startup or else on the first record, so
+# importing the app opens no file.
+handlers: list[logging.Handler] = []
+log_listener = QueueListener(log_queue, respect_handler_level=True)
+# Reentrant, the warning `start_logging` logs may be the first record
+start_lock = threading.RLock()
+
+
+def create_handlers() -> list[logging.Handler]:
+    console_handler = logging.StreamHandler()
+    console_handler.setLevel(app_logger_level)
+
+    Path("logs").mkdir(exist_ok=True)
+    file_handler = RotatingFileHandler(
+        f"logs/{datetime.strftime(datetime.now(UTC), '%Y_%m_%d')}.log",
+        maxBytes=1_000_000,
     )
-    web_handler.setLevel(app_logger_level)
-    app_logger.addHandler(web_handler)
+    created = [console_handler, file_handler]
 
-structlog.configure(
-    processors=[
+    if settings.APP_LOGGER_ADDRESS and settings.APP_LOGGER_PORT:
+        web_handler = SysLogHandler(
+            address=(settings.APP_LOGGER_ADDRESS, settings.APP_LOGGER_PORT),
+        )
+        web_handler.setLevel(app_logger_level)
+        created.append(web_handler)
+    return created
+
+
+def start_logging() -> None:
+    """Open the handlers and start writing queued records, once."""
+    with start_lock:
+        if not handlers:
+            handlers.extend(create_handlers())
+            log_listener.handlers = tuple(handlers)
+            if settings.APP_LOGGER_ADDRESS is None:
+                app_logger.warning(
+                    "App logger address not set. Syslog will not be enabled.",
+                )
+        if log_listener._thread is None:  # noqa: SLF001
+            log_listener.start()
+
+
+# Scripts and tests log without running the lifespan
+queue_handler.start = start_logging
+
+
+def stop_logging() -> None:
+    """Flush queued records to the handlers and stop the listener thread."""
+    if log_listener._thread is not None:  # noqa: SLF001
+        log_listener.stop()
+    for handler in handlers:
+        # The stream may already be closed at interpreter exit
+        with contextlib.suppress(OSError, ValueError):
+            handler.flush()
+
+
+atexit.register(stop_logging)
+
+
+def drop_unsampled(_, method_name: str, event_dict: dict) -> dict:
+    """Drop debug and info events of requests the sampler did not keep.
+
+    Until the response starts they are held on the request state, so that
+    `replay_events` can still log them if the request fails or is slow.
+    """
+    if method_name not in ("debug", "info"):
+        return event_dict
+    state = request_log_state.get()
+    if state is None or state.is_sampled():
+        return event_dict
+    state.hold(method_name, event_dict)
+    raise structlog.DropEvent
+
+
+def replay_events(events: list[tuple[str, dict]]) -> None:
+    """Log events held by `drop_unsampled` through the rest of the chain."""
+    processors = structlog.get_config()["processors"]
+    remaining = processors[processors.index(drop_unsampled) + 1 :]
+    for method_name, event_dict in events:
+        for processor in remaining:
+            event_dict = processor(app_logger, method_name, event_dict)  # noqa: PLW2901
+        getattr(app_logger, method_name)(event_dict)
+
+
+def get_processors(profile: str = settings.APP_LOGGER_PROFILE) -> list:
+    """Processor chain of a logging profile.
+
+    The production profile samples success logs and skips the stack info and
+    callsite processors, the latter walks the stack on every call.
+    """
+    renderer = (
+        structlog.processors.JSONRenderer(serializer=orjson_log_serializer)
+        if fast_json_enabled
+        else structlog.processors.JSONRenderer()
+    )
+    timestamper = structlog.processors.TimeStamper(
+        fmt="%Y-%m-%d %H:%M:%S",
+        utc=False,
+    )
+    if profile == "production":
+        # Timestamped before sampling, replayed events keep their time
+        return [
+            structlog.stdlib.filter_by_level,
+            timestamper,
+            drop_unsampled,
+            structlog.contextvars.merge_contextvars,
+            structlog.processors.add_log_level,
+            structlog.dev.set_exc_info,
+            structlog.processors.format_exc_info,
+            renderer,
+        ]
+    return [
         structlog.contextvars.merge_contextvars,
         structlog.processors.add_log_level,
         structlog.processors.StackInfoRenderer(),
         structlog.dev.set_exc_info,
-        structlog.processors.TimeStamper(fmt="%Y-%m-%d %H:%M:%S", utc=False),
+        timestamper,
         structlog.processors.CallsiteParameterAdder(
             parameters=[structlog.processors.CallsiteParameter.FILENAME],
         ),
         structlog.processors.format_exc_info,
-        structlog.processors.JSONRenderer(),
-    ],
+        renderer,
+    ]
+
+
+structlog.configure(
+    processors=get_processors(),
     context_class=dict,
     wrapper_class=structlog.stdlib.BoundLogger,
     logger_factory=structlog.stdlib.LoggerFactory(),
+    cache_logger_on_first_use=True,
 )
 
 logger = structlog.get_logger("applogger")
@@ -0,0 +1,81 @@
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+from starlette.types import Scope
+
+from src.config.settings import settings
+
+
+def parse_route_rates(value: str | None) -> dict[str, float]:
+    """Parse `"/health=0,/auth=1"` into a route template to rate mapping."""
+    rates = {}
+    for item in (value or "").split(","):
+        route, _, rate = item.strip().partition("=")
+        if route and rate:
+            rates[route.strip()] = float(rate)
+    return rates
+
+
+class RouteSampler:
+    """Keep 1 in N success logs per route template.
+
+    Counting per route instead of rolling a die keeps low traffic routes
+    visible and makes the kept share exact.
+    """
+
+    def __init__(self, rate: float, route_rates: dict[str, float] | None = None):
+        self.rate = rate
+        self.route_rates = route_rates or {}
+        self._counters: defaultdict[str, int] = defaultdict(int)
+
+    def sample(self, route: str) -> bool:
+        rate = self.route_rates.get(route, self.rate)
+        if rate >= 1:
+            return True
+        if rate <= 0:
+            return False
+        count = self._counters[route]
+        self._counters[route] = count + 1
+        return count % max(1, round(1 / rate)) == 0
+
+
+def route_template(scope: Scope) -> str:
+    """Route path template, the router sets it on the scope once matched."""
+    # Newer FastAPI keeps included routes unprefixed and records the full
+    # path on the effective route context instead
+    context = scope.get("fastapi", {}).get("effective_route_context")
+    route = context if context is not None else scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+# Events of an unsampled request held back until its outcome is known
+PENDING_EVENTS_LIMIT = 100
+
+
+@dataclass(slots=True)
+class RequestLogState:
+    scope: Scope
+    sampled: bool | None = None
+    pending: list[tuple[str, dict]] = field(default_factory=list)
+    settled: bool = False
+
+    def is_sampled(self) -> bool:
+        if self.sampled is None:
+            self.sampled = route_sampler.sample(route_template(self.scope))
+        return self.sampled
+
+    def hold(self, method_name: str, event_dict: dict) -> None:
+        """Keep an unsampled event until the response status is known."""
+        if not self.settled and len(self.pending) < PENDING_EVENTS_LIMIT:
+            self.pending.append((method_name, event_dict))
+
+    def settle(self) -> list[tuple[str, dict]]:
+        """Stop holding events, the ones held so far are returned."""
+        pending, self.pending, self.settled = self.pending, [], True
+        return pending
+
+
+route_sampler = RouteSampler(
+    rate=settings.APP_LOGGER_SAMPLE_RATE,
+    route_rates=parse_route_rates(settings.APP_LOGGER_SAMPLE_ROUTE_RATES),
+)
@@ -2,55 +2,113 @@ import functools
 import inspect
 import time
 from contextlib import contextmanager
+from dataclasses import dataclass, field
 
-from src.core.logger.context import span_list
+from opentelemetry.trace import Status, StatusCode
+
+from src.core.logger.context import current_span
+from src.core.logger.tracing import tracer
+from src.core.metrics.registry import db_operation_duration, observe_duration
+
+
+@dataclass(slots=True)
+class SpanNode:
+    """In-process copy of a span, rendered into the request log line."""
+
+    name: str
+    attributes: dict = field(default_factory=dict)
+    children: list["SpanNode"] = field(default_factory=list)
+    time: float | None = None
+    error: str | None = None
+    parent: "SpanNode | None" = field(default=None, repr=False)
+
+    def to_dict(self) -> dict:
+        out = {"name": self.name, "time": self.time}
+        if self.error:
+            out["error"] = self.error
+        if self.attributes:
+            out["attributes"] = self.attributes
+        if self.children:
+            out["children"] = [child.to_dict() for child in self.children]
+        return out
+
+
+def get_span_tree() -> list[dict]:
+    """Spans recorded under the root of the current request."""
+    root = current_span.get()
+    if root is None:
+        return []
+    while root.parent is not None:
+        root = root.parent
+    return [child.to_dict() for child in root.children]
 
 
 @contextmanager
-def create_span(name: str | None = None):
+def create_span(name: str | None = None, **attributes):
+    """Record a child of the current span, locally and for OpenTelemetry."""
+    parent = current_span.get()
+    node = SpanNode(name=name, attributes=attributes, parent=parent)
+    if parent is not None:
+        parent.children.append(node)
+    token = current_span.set(node)
     start = time.perf_counter()
-    yield
-    period = time.perf_counter() - start
-    prev_list = span_list.get() if span_list.get() else []
-    prev_list.append({"name": name, "time": round(period * 1000, 2)})
-    span_list.set(prev_list)
+    with tracer.start_as_current_span(
+        name,
+        attributes=attributes,
+        record_exception=False,
+        set_status_on_exception=False,
+    ) as span:
+        try:
+            yield span
+        except BaseException as ex:
+            node.error = type(ex).__name__
+            span.record_exception(ex)
+            span.set_status(Status(StatusCode.ERROR, str(ex)))
+            raise
+        finally:
+            node.time = round((time.perf_counter() - start) * 1000, 2)
+            current_span.reset(token)
 
 
 def monitor(arg):
+    """Wrap a db function in a span and time it in the db operation histogram."""
     if callable(arg):
         # arg is a function
         # check if coroutine or function
+        histogram = db_operation_duration.labels(operation=arg.__name__)
         if inspect.iscoroutinefunction(arg):
 
             @functools.wraps(arg)
             async def wrapper(*args, **kwargs):
-                with create_span(arg.__name__):
+                with create_span(arg.__name__), observe_duration(histogram):
                     return await arg(*args, **kwargs)
 
             return wrapper
 
         @functools.wraps(arg)
         def wrapper(*args, **kwargs):
-            with create_span(arg.__name__):
+            with create_span(arg.__name__), observe_duration(histogram):
                 return arg(*args, **kwargs)
 
         return wrapper
     # arg is name
     # check function type
+    histogram = db_operation_duration.labels(operation=arg)
+
     def inner_wrapper(func):
         # check func type
         if inspect.iscoroutinefunction(func):
 
             @functools.wraps(func)
             async def wrapper(*args, **kwargs):
-                with create_span(arg):
+                with create_span(arg), observe_duration(histogram):
                     return await func(*args, **kwargs)
 
             return wrapper
 
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            with create_span(arg):
+            with create_span(arg), observe_duration(histogram):
                 return func(*args, **kwargs)
 
         return wrapper
@@ -0,0 +1,57 @@
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import SpanProcessor, TracerProvider
+from opentelemetry.sdk.trace.export import (
+    BatchSpanProcessor,
+    ConsoleSpanExporter,
+    SimpleSpanProcessor,
+    SpanExporter,
+)
+from opentelemetry.trace.propagation.tracecontext import (
+    TraceContextTextMapPropagator,
+)
+
+from src.config.settings import settings
+
+# Owned by the app rather than installed as the global provider, so tests can
+# attach their own exporter without fighting over global state.
+tracer_provider = TracerProvider(
+    resource=Resource.create({"service.name": settings.PROJECT_NAME}),
+)
+tracer = tracer_provider.get_tracer("src")
+
+# W3C `traceparent` / `tracestate` headers
+propagator = TraceContextTextMapPropagator()
+
+
+def add_span_exporter(exporter: SpanExporter, batch: bool = True) -> SpanProcessor:
+    """Export finished spans, batched off the event loop unless `batch` is False.
+
+    The provider cannot detach a processor, shutting the returned one down
+    stops the export.
+    """
+    processor = BatchSpanProcessor(exporter) if batch else SimpleSpanProcessor(exporter)
+    tracer_provider.add_span_processor(processor)
+    return processor
+
+
+def get_span_exporter(name: str) -> SpanExporter | None:
+    if name == "otlp":
+        # Configured through the standard OTEL_EXPORTER_OTLP_* variables
+        from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import (  # noqa: PLC0415
+            OTLPSpanExporter,
+        )
+
+        return OTLPSpanExporter()
+    if name == "console":
+        return ConsoleSpanExporter()
+    return None
+
+
+def shutdown_tracing() -> None:
+    """Flush pending spans to the exporters."""
+    tracer_provider.shutdown()
+
+
+span_exporter = get_span_exporter(settings.TRACING_EXPORTER)
+if span_exporter is not None:
+    add_span_exporter(span_exporter)
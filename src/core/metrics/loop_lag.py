@@ -0,0 +1,178 @@
+import asyncio
+import contextlib
+import contextvars
+import sys
+import threading
+import time
+import traceback
+import weakref
+from collections import deque
+
+from src.config.settings import settings
+from src.core.logger.context import request_id
+from src.core.logger.log import logger
+from src.core.metrics.registry import (
+    event_loop_blocked,
+    event_loop_lag,
+    event_loop_lag_quantile,
+)
+
+LAG_QUANTILES = (0.5, 0.9, 0.99)
+TASK_GET_CONTEXT = hasattr(asyncio.Task, "get_context")  # Python 3.12+
+
+
+class LoopLagMonitor:
+    """Measure how late the event loop wakes a task that sleeps `interval`.
+
+    The lag is how long a ready callback currently waits for the loop, the
+    delay every request adds on top of its own work. Quantiles over the last
+    `window` probes are exported next to the histogram.
+    """
+
+    def __init__(self, interval: float, window: int = 240) -> None:
+        self.interval = interval
+        self.lag = 0.0
+        # Monotonic time the loop last ran the probe, read by the watchdog
+        self.heartbeat = time.monotonic()
+        self._samples: deque[float] = deque(maxlen=window)
+        self._quantiles = [
+            event_loop_lag_quantile.labels(str(q)) for q in LAG_QUANTILES
+        ]
+        self._task: asyncio.Task | None = None
+
+    async def _run(self) -> None:
+        while True:
+            expected = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            self.heartbeat = time.monotonic()
+            self.lag = max(0.0, time.perf_counter() - expected)
+            event_loop_lag.observe(self.lag)
+            self._samples.append(self.lag)
+            self._export_quantiles()
+
+    def quantiles(self) -> dict[float, float]:
+        """Lag quantiles over the recent probes, nearest rank."""
+        if not self._samples:
+            return dict.fromkeys(LAG_QUANTILES, 0.0)
+        ordered = sorted(self._samples)
+        last = len(ordered) - 1
+        return {q: ordered[round(q * last)] for q in LAG_QUANTILES}
+
+    def _export_quantiles(self) -> None:
+        for gauge, value in zip(
+            self._quantiles,
+            self.quantiles().values(),
+            strict=True,
+        ):
+            gauge.set(value)
+
+    def start(self) -> None:
+        if self._task is None:
+            self.heartbeat = time.monotonic()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+            self.lag = 0.0
+            self._samples.clear()
+
+
+class LoopWatchdog:
+    """Report callbacks that block the event loop longer than `threshold`.
+
+    A sidecar thread watches the heartbeat of the lag monitor. Once it is
+    `threshold` past due, the loop is stuck in one callback: the thread
+    takes the stack of the loop thread and the `request_id` of the task
+    running there and logs them, once per stall. While the loop is healthy
+    the thread only reads a float every `threshold / 2`.
+    """
+
+    def __init__(self, monitor: LoopLagMonitor, threshold: float) -> None:
+        self.monitor = monitor
+        self.threshold = threshold
+        self.stalls = 0
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread_id: int | None = None
+        self._stopping = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._contexts: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    def start(self) -> None:
+        """Watch the running loop, call from the loop thread."""
+        if self._thread is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        if not TASK_GET_CONTEXT and self._loop.get_task_factory() is None:
+            self._loop.set_task_factory(self._task_factory)
+        self._stopping.clear()
+        self._thread = threading.Thread(
+            target=self._watch,
+            name="loop-watchdog",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._stopping.set()
+            self._thread.join()
+            self._thread = None
+        if (
+            self._loop is not None
+            and self._loop.get_task_factory() == self._task_factory
+        ):
+            self._loop.set_task_factory(None)
+
+    def _watch(self) -> None:
+        reported = None
+        while not self._stopping.wait(self.threshold / 2):
+            heartbeat = self.monitor.heartbeat
+            blocked = time.monotonic() - heartbeat - self.monitor.interval
+            if blocked >= self.threshold and heartbeat != reported:
+                reported = heartbeat
+                self.report(blocked)
+
+    def _task_factory(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        coro,
+        context: contextvars.Context | None = None,
+    ) -> asyncio.Task:
+        # Python 3.11 tasks hide their context, so keep it for `report`
+        context = contextvars.copy_context() if context is None else context
+        task = asyncio.Task(coro, loop=loop, context=context)
+        self._contexts[task] = context
+        return task
+
+    def _task_context(self, task: asyncio.Task) -> contextvars.Context | None:
+        if TASK_GET_CONTEXT:
+            return task.get_context()
+        return self._contexts.get(task)
+
+    def report(self, blocked: float) -> None:
+        frame = sys._current_frames().get(self._loop_thread_id)  # noqa: SLF001
+        stack = "".join(traceback.format_stack(frame)) if frame else None
+        task = asyncio.current_task(self._loop)
+        # The request of the blocking task, contextvars are per task
+        context = self._task_context(task) if task is not None else None
+        self.stalls += 1
+        event_loop_blocked.inc()
+        logger.warning(
+            event="app.loop.blocked",
+            blocked_ms=round(blocked * 1000, 1),
+            request_id=context.get(request_id) if context is not None else None,
+            task=task.get_name() if task is not None else None,
+            stack=stack,
+        )
+
+
+loop_lag_monitor = LoopLagMonitor(interval=settings.LOOP_LAG_INTERVAL)
+loop_watchdog = LoopWatchdog(
+    loop_lag_monitor,
+    threshold=settings.LOOP_WATCHDOG_THRESHOLD_MS / 1000,
+)
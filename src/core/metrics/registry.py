@@ -0,0 +1,238 @@
+"""Prometheus metrics of the app.
+
+With several worker processes set ``PROMETHEUS_MULTIPROC_DIR`` to an empty
+directory before start, every process then writes its samples there and
+``/metrics`` aggregates them across workers.
+"""
+
+import os
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+# Request latencies, from sub-millisecond cache hits to slow list requests
+LATENCY_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1,
+    2.5,
+    5,
+    10,
+)
+
+http_requests = Counter(
+    "http_requests_total",
+    "HTTP requests by route template and status.",
+    ["method", "route", "status"],
+)
+http_request_duration = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency until the response starts.",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+http_requests_in_flight = Gauge(
+    "http_requests_in_flight",
+    "HTTP requests being served.",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+
+db_operation_duration = Histogram(
+    "db_operation_duration_seconds",
+    "Duration of @monitor wrapped db functions.",
+    ["operation"],
+    buckets=LATENCY_BUCKETS,
+)
+
+password_hash_duration = Histogram(
+    "password_hash_duration_seconds",
+    "bcrypt hash or verify time on the worker pool.",
+    ["operation"],
+    buckets=(0.05, 0.1, 0.15, 0.2, 0.3, 0.5, 1, 2),
+)
+password_hash_queue_wait = Histogram(
+    "password_hash_queue_wait_seconds",
+    "Time bcrypt calls wait for a free worker.",
+    buckets=LATENCY_BUCKETS,
+)
+password_hash_rejected = Counter(
+    "password_hash_rejected_total",
+    "bcrypt calls rejected because the queue was full.",
+)
+
+jwt_decode_duration = Histogram(
+    "jwt_decode_duration_seconds",
+    "jwt.decode and claims validation time on token cache misses.",
+    buckets=(0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005),
+)
+token_cache_requests = Counter(
+    "token_cache_requests_total",
+    "Verified token cache lookups.",
+    ["result"],
+)
+
+entity_cache_requests = Counter(
+    "entity_cache_requests_total",
+    "Entity cache lookups.",
+    ["cache", "result"],
+)
+entity_cache_evictions = Counter(
+    "entity_cache_evictions_total",
+    "Entity cache LRU evictions.",
+    ["cache"],
+)
+
+admission_in_flight = Gauge(
+    "admission_in_flight",
+    "Requests admitted and being served, by route class.",
+    ["route_class"],
+    multiprocess_mode="livesum",
+)
+admission_queue_wait = Histogram(
+    "admission_queue_wait_seconds",
+    "Time admitted requests waited for a free slot.",
+    ["route_class"],
+    buckets=LATENCY_BUCKETS,
+)
+admission_rejected = Counter(
+    "admission_rejected_total",
+    "Requests shed with a 503, by route class and reason.",
+    ["route_class", "reason"],
+)
+event_loop_lag = Histogram(
+    "event_loop_lag_seconds",
+    "Delay of the event loop in waking a sleeping task.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+event_loop_lag_quantile = Gauge(
+    "event_loop_lag_quantile_seconds",
+    "Event loop lag quantiles over the recent probes.",
+    ["quantile"],
+    multiprocess_mode="max",
+)
+event_loop_blocked = Counter(
+    "event_loop_blocked_total",
+    "Callbacks the watchdog caught blocking the event loop.",
+)
+
+http_compression_bytes = Counter(
+    "http_compression_bytes_total",
+    "Response bytes before (in) and after (out) compression.",
+    ["coding", "stage"],
+)
+http_compression_seconds = Histogram(
+    "http_compression_seconds",
+    "CPU time spent compressing one body or streamed chunk.",
+    ["coding"],
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1),
+)
+
+db_loader_keys = Counter(
+    "db_loader_keys_total",
+    "By-id lookups, batched into a query or coalesced with a pending one.",
+    ["loader", "outcome"],
+)
+db_loader_batch_size = Histogram(
+    "db_loader_batch_size",
+    "Ids per batched $in query.",
+    ["loader"],
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128),
+)
+
+mongo_command_duration = Histogram(
+    "mongo_command_duration_seconds",
+    "Mongo command round trip time, as seen by the driver.",
+    ["command", "outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+mongo_pool_checkout_wait = Histogram(
+    "mongo_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled Mongo connection.",
+    ["outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+mongo_pool_checkout_failures = Counter(
+    "mongo_pool_checkout_failures_total",
+    "Failed connection checkouts, timeout means the pool was exhausted.",
+    ["reason"],
+)
+mongo_pool_connections = Gauge(
+    "mongo_pool_connections",
+    "Open pooled Mongo connections.",
+    ["address"],
+    multiprocess_mode="livesum",
+)
+mongo_pool_checked_out = Gauge(
+    "mongo_pool_checked_out",
+    "Pooled Mongo connections in use, compare with the max pool size.",
+    ["address"],
+    multiprocess_mode="livesum",
+)
+mongo_pool_max_size = Gauge(
+    "mongo_pool_max_size",
+    "Configured max Mongo pool size.",
+    multiprocess_mode="liveall",
+)
+mongo_up = Gauge(
+    "mongo_up",
+    "Whether the last background Mongo ping succeeded.",
+    multiprocess_mode="liveall",
+)
+mongo_connections_created = Counter(
+    "mongo_connections_created_total",
+    "Mongo connections opened.",
+)
+mongo_connections_closed = Counter(
+    "mongo_connections_closed_total",
+    "Mongo connections closed by reason.",
+    ["reason"],
+)
+
+log_records_dropped = Counter(
+    "log_records_dropped_total",
+    "Log records dropped because the log queue was full.",
+)
+
+
+@contextmanager
+def observe_duration(histogram: Histogram) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        histogram.observe(time.perf_counter() - start)
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """Exposition of all metrics, aggregated across processes if enabled."""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead() -> None:
+    """Drop the live gauge samples of this worker process as it exits."""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        multiprocess.mark_process_dead(os.getpid())
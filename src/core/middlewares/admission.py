@@ -0,0 +1,175 @@
+import asyncio
+import time
+from collections import deque
+from collections.abc import Callable
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from src.config.settings import settings
+from src.core.exceptions.service_exception import ServiceUnavailableError
+from src.core.logger.context import request_id
+from src.core.logger.log import logger
+from src.core.metrics.loop_lag import loop_lag_monitor
+from src.core.metrics.registry import (
+    admission_in_flight,
+    admission_queue_wait,
+    admission_rejected,
+)
+from src.core.utils.json import json_response_class
+from src.db.client import pool_wait as mongo_pool_wait
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+def parse_limits(value: str | None) -> dict[str, int]:
+    """Parse `class=limit` pairs, eg. "auth=16,write=64,read=256"."""
+    limits = {}
+    for item in (value or "").split(","):
+        name, _, limit = item.partition("=")
+        if name.strip() and limit.strip():
+            limits[name.strip()] = int(limit)
+    return limits
+
+
+def route_class(scope: Scope) -> str:
+    """Class of a request, known before routing from its path and method."""
+    path = scope.get("path", "")
+    if path == "/auth" or path.startswith("/auth/"):
+        return "auth"
+    return "read" if scope.get("method") in SAFE_METHODS else "write"
+
+
+class ConcurrencyLimiter:
+    """At most `limit` holders, then a FIFO queue of `queue_size` waiters."""
+
+    def __init__(self, limit: int, queue_size: int) -> None:
+        self.limit = limit
+        self.queue_size = queue_size
+        self.in_flight = 0
+        self._waiters: deque[asyncio.Future] = deque()
+
+    async def acquire(self, queue_timeout: float) -> str | None:
+        """Take a slot, or return why the request must be rejected."""
+        if self.in_flight < self.limit and not self._waiters:
+            self.in_flight += 1
+            return None
+        if len(self._waiters) >= self.queue_size:
+            return "queue_full"
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait({waiter}, timeout=queue_timeout)
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+        finally:
+            if not waiter.done():
+                waiter.cancel()
+                self._waiters.remove(waiter)
+        # `release` hands its slot over by resolving the waiter
+        if waiter.cancelled():
+            return "queue_timeout"
+        return None
+
+    def release(self) -> None:
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
+
+
+class AdmissionASGIMiddleware:
+    """Admission control and load shedding in front of the routes.
+
+    Each route class gets a concurrency limit and a bounded wait queue.
+    While the event loop lags or Mongo connection checkouts wait longer than
+    their thresholds, new requests are shed at once with a 503 and
+    Retry-After. Exempt paths, health and metrics, always pass.
+    """
+
+    def __init__(  # noqa: PLR0913 - one option per ADMISSION_* setting
+        self,
+        app: ASGIApp,
+        *,
+        limits: dict[str, int] | None = None,
+        queue_size: int = settings.ADMISSION_QUEUE_SIZE,
+        queue_timeout: float = settings.ADMISSION_QUEUE_TIMEOUT,
+        max_loop_lag: float = settings.ADMISSION_MAX_LOOP_LAG_MS / 1000,
+        max_pool_wait: float = settings.ADMISSION_MAX_POOL_WAIT_MS / 1000,
+        retry_after: int = settings.ADMISSION_RETRY_AFTER,
+        exempt_paths: set[str] | None = None,
+        loop_lag: Callable[[], float] = lambda: loop_lag_monitor.lag,
+        pool_wait: Callable[[], float] = lambda: mongo_pool_wait.average,
+    ) -> None:
+        self.app = app
+        limits = parse_limits(settings.ADMISSION_LIMITS) if limits is None else limits
+        self.limiters = {
+            name: ConcurrencyLimiter(limit, queue_size)
+            for name, limit in limits.items()
+        }
+        self.queue_timeout = queue_timeout
+        self.max_loop_lag = max_loop_lag
+        self.max_pool_wait = max_pool_wait
+        self.retry_after = retry_after
+        self.exempt_paths = (
+            set(settings.ADMISSION_EXEMPT_PATHS.split(","))
+            if exempt_paths is None
+            else exempt_paths
+        )
+        self.loop_lag = loop_lag
+        self.pool_wait = pool_wait
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope.get("type") != "http" or scope.get("path") in self.exempt_paths:
+            return await self.app(scope, receive, send)
+
+        name = route_class(scope)
+        if self.loop_lag() > self.max_loop_lag:
+            return await self.reject(scope, receive, send, name, "loop_lag")
+        if self.pool_wait() > self.max_pool_wait:
+            return await self.reject(scope, receive, send, name, "pool_wait")
+
+        limiter = self.limiters.get(name)
+        if limiter is None:
+            return await self.app(scope, receive, send)
+
+        queued_at = time.perf_counter()
+        reason = await limiter.acquire(self.queue_timeout)
+        if reason is not None:
+            return await self.reject(scope, receive, send, name, reason)
+        admission_queue_wait.labels(name).observe(time.perf_counter() - queued_at)
+        in_flight = admission_in_flight.labels(name)
+        in_flight.inc()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            in_flight.dec()
+            limiter.release()
+
+    async def reject(
+        self,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+        name: str,
+        reason: str,
+    ) -> None:
+        admission_rejected.labels(name, reason).inc()
+        logger.warning(
+            event="app.admission.rejected",
+            route_class=name,
+            reason=reason,
+        )
+        exc = ServiceUnavailableError(
+            reason=reason.replace("_", " "),
+            retry_after=self.retry_after,
+        )
+        response = json_response_class(
+            content={"detail": str(exc), "trace_id": request_id.get()},
+            status_code=exc.status_code,
+            headers={"Retry-After": str(exc.retry_after)},
+        )
+        await response(scope, receive, send)
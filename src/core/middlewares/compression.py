@@ -0,0 +1,206 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.config.settings import settings
+from src.core.metrics.registry import http_compression_bytes, http_compression_seconds
+from src.core.utils.compression import (
+    Codec,
+    StreamCompressor,
+    brotli_codec,
+    gzip_codec,
+    select_codec,
+    zstd_codec,
+)
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+    "text/",
+)
+
+
+def configured_codecs() -> list[Codec]:
+    """Installed codecs at their configured levels, in server preference."""
+    factories = {
+        "gzip": lambda: gzip_codec(settings.COMPRESSION_GZIP_LEVEL),
+        "br": lambda: brotli_codec(settings.COMPRESSION_BROTLI_QUALITY),
+        "zstd": lambda: zstd_codec(settings.COMPRESSION_ZSTD_LEVEL),
+    }
+    codecs = []
+    for name in settings.COMPRESSION_CODINGS.split(","):
+        factory = factories.get(name.strip())
+        codec = factory() if factory else None
+        if codec is not None:
+            codecs.append(codec)
+    return codecs
+
+
+class CompressionPool:
+    """Thread pool running compression too slow for the event loop.
+
+    zlib, brotli and zstandard release the GIL while compressing.
+    """
+
+    def __init__(self, workers: int, min_size: int) -> None:
+        self.workers = workers
+        self.min_size = min_size
+        self._executor: ThreadPoolExecutor | None = None
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers,
+                thread_name_prefix="compression",
+            )
+        return self._executor
+
+    async def run(self, codec: Codec, func, data: bytes, *args) -> bytes:
+        def timed() -> bytes:
+            started = time.thread_time()
+            out = func(data, *args)
+            http_compression_seconds.labels(codec.name).observe(
+                time.thread_time() - started,
+            )
+            return out
+
+        if codec.heavy or len(data) >= self.min_size:
+            loop = asyncio.get_running_loop()
+            out = await loop.run_in_executor(self.executor, timed)
+        else:
+            out = timed()
+        http_compression_bytes.labels(codec.name, "in").inc(len(data))
+        http_compression_bytes.labels(codec.name, "out").inc(len(out))
+        return out
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+compression_pool = CompressionPool(
+    workers=settings.COMPRESSION_WORKERS,
+    min_size=settings.COMPRESSION_THREAD_MIN_SIZE,
+)
+
+
+class CompressionASGIMiddleware:
+    """Compress response bodies with the best coding the client accepts.
+
+    Bodies below ``minimum_size`` and responses that already carry a
+    ``Content-Encoding`` are sent as is. Streaming responses are compressed
+    chunk by chunk, each chunk flushed so the client can decode it at once.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        codecs: list[Codec] | None = None,
+        minimum_size: int = settings.COMPRESSION_MIN_SIZE,
+    ) -> None:
+        self.app = app
+        self.codecs = configured_codecs() if codecs is None else codecs
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        codec = None
+        if scope.get("type") == "http" and scope.get("method") != "HEAD":
+            codec = select_codec(
+                Headers(scope=scope).get("accept-encoding"),
+                self.codecs,
+            )
+        if codec is not None:
+            send = _CompressionResponder(codec, send, self.minimum_size).send
+        await self.app(scope, receive, send)
+
+
+class _CompressionResponder:
+    def __init__(self, codec: Codec, send: Send, minimum_size: int) -> None:
+        self.codec = codec
+        self._send = send
+        self.minimum_size = minimum_size
+        self.start: Message | None = None
+        self.passthrough = False
+        self.stream: StreamCompressor | None = None
+
+    async def send(self, message: Message) -> None:
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            status = message["status"]
+            content_type = headers.get("content-type", "")
+            self.passthrough = (
+                status < 200  # noqa: PLR2004
+                or status in (204, 304)
+                or "content-encoding" in headers
+                or not content_type.startswith(COMPRESSIBLE_TYPES)
+            )
+            if self.passthrough:
+                await self._send(message)
+            else:
+                # Held back until the first body chunk tells how to encode
+                self.start = message
+            return
+        if message_type != "http.response.body" or self.passthrough:
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.stream is None and not more_body:
+            await self._send_whole(body)
+            return
+
+        if self.stream is None:
+            self._set_headers(encoded=True)
+            del MutableHeaders(raw=self.start["headers"])["content-length"]
+            await self._send(self.start)
+            self.stream = self.codec.stream()
+        chunk = await compression_pool.run(
+            self.codec,
+            self.stream.compress,
+            body,
+            not more_body,
+        )
+        if chunk or not more_body:
+            await self._send(
+                {"type": "http.response.body", "body": chunk, "more_body": more_body},
+            )
+
+    async def _send_whole(self, body: bytes) -> None:
+        if len(body) >= self.minimum_size:
+            compressed = await compression_pool.run(
+                self.codec,
+                self.codec.compress,
+                body,
+            )
+            if len(compressed) < len(body):
+                self._set_headers(encoded=True)
+                MutableHeaders(raw=self.start["headers"])["content-length"] = str(
+                    len(compressed),
+                )
+                await self._send(self.start)
+                await self._send({"type": "http.response.body", "body": compressed})
+                return
+        self._set_headers(encoded=False)
+        await self._send(self.start)
+        await self._send({"type": "http.response.body", "body": body})
+
+    def _set_headers(self, encoded: bool) -> None:
+        headers = MutableHeaders(raw=self.start["headers"])
+        headers.add_vary_header("Accept-Encoding")
+        if not encoded:
+            return
+        headers["content-encoding"] = self.codec.name
+        # The encoded bytes differ, so a strong validator no longer applies
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["etag"] = f"W/{etag}"
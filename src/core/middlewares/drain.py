@@ -0,0 +1,127 @@
+import asyncio
+import contextlib
+import os
+import signal
+import threading
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.logger.log import logger
+
+
+class DrainState:
+    """In-flight requests and whether the process is shutting down.
+
+    On SIGTERM, readiness fails first while the app keeps serving for
+    `delay` seconds, the time load balancers take to stop routing here.
+    Only then does the server get the signal, stop accepting connections
+    and finish the requests it holds.
+    """
+
+    def __init__(self) -> None:
+        self._previous_handler = None
+        self._reset()
+
+    def _reset(self) -> None:
+        self.draining = False
+        self.in_flight = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._task: asyncio.Task | None = None
+
+    def begin(self) -> None:
+        if not self.draining:
+            self.draining = True
+            logger.info(event="app.drain.begin", in_flight=self.in_flight)
+
+    def request_started(self) -> None:
+        self.in_flight += 1
+        self._idle.clear()
+
+    def request_finished(self) -> None:
+        self.in_flight -= 1
+        if self.in_flight == 0:
+            self._idle.set()
+
+    async def wait_idle(self, grace: float | None) -> bool:
+        """Wait until no request is in flight, False past `grace` seconds."""
+        with contextlib.suppress(TimeoutError):
+            await asyncio.wait_for(self._idle.wait(), grace)
+        return self.in_flight == 0
+
+    def install(self, delay: float) -> None:
+        """Drain on SIGTERM, then pass the signal on to the server.
+
+        Called at startup, it clears what a previous run of the app in this
+        process left, a finished drain would keep readiness failing.
+        """
+        self.uninstall()
+        self._reset()
+        if threading.current_thread() is not threading.main_thread():
+            return
+        loop = asyncio.get_running_loop()
+
+        def handle(signum: int, frame) -> None:
+            if self.draining:
+                # A second signal does not wait for the delay
+                return self._forward(signum, frame)
+            self.begin()
+            loop.call_soon_threadsafe(self._schedule_forward, signum, frame, delay)
+            return None
+
+        self._previous_handler = signal.signal(signal.SIGTERM, handle)
+
+    def uninstall(self) -> None:
+        if self._previous_handler is not None:
+            signal.signal(signal.SIGTERM, self._previous_handler)
+            self._previous_handler = None
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def _schedule_forward(self, signum: int, frame, delay: float) -> None:
+        async def forward() -> None:
+            await asyncio.sleep(delay)
+            self._forward(signum, frame)
+
+        self._task = asyncio.get_running_loop().create_task(forward())
+
+    def _forward(self, signum: int, frame) -> None:
+        previous = self._previous_handler
+        if callable(previous):
+            previous(signum, frame)
+            return
+        # No server handler to pass it to, let the default action run
+        self.uninstall()
+        os.kill(os.getpid(), signum)
+
+
+drain_state = DrainState()
+
+
+class DrainASGIMiddleware:
+    """Track in-flight requests, and close connections while draining.
+
+    ``Connection: close`` on responses sent during the drain makes
+    keep-alive clients reconnect, landing on instances still in service.
+    """
+
+    def __init__(self, app: ASGIApp, state: DrainState = drain_state) -> None:
+        self.app = app
+        self.state = state
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope.get("type") != "http":
+            return await self.app(scope, receive, send)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and self.state.draining:
+                MutableHeaders(scope=message)["connection"] = "close"
+            await send(message)
+
+        self.state.request_started()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.state.request_finished()
@@ -1,11 +1,46 @@
 import time
 import uuid
 
+from opentelemetry.trace import SpanKind, Status, StatusCode
 from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from structlog import contextvars
 
-from src.core.logger.context import error, extra_str, request_id, span_list
-from src.core.logger.log import logger
+from src.config.settings import settings
+from src.core.logger.context import (
+    current_span,
+    error,
+    extra_str,
+    request_id,
+    request_log_state,
+)
+from src.core.logger.log import logger, replay_events
+from src.core.logger.sampling import RequestLogState, route_template
+from src.core.logger.spans import SpanNode, get_span_tree
+from src.core.logger.tracing import propagator, tracer
+
+PRODUCTION_PROFILE = settings.APP_LOGGER_PROFILE == "production"
+
+
+def log_response_end(state: RequestLogState, status_code: int, latency: float) -> None:
+    """Log the response end, skipped with its span tree for unsampled requests."""
+    if PRODUCTION_PROFILE:
+        if (
+            status_code >= 400  # noqa: PLR2004
+            or latency >= settings.APP_LOGGER_SLOW_REQUEST_MS
+        ):
+            # Errors and slow requests are kept whatever the sample, along
+            # with the events held back before the status was known
+            state.sampled = True
+        pending = state.settle()
+        if not state.is_sampled():
+            return
+        replay_events(pending)
+    logger.info(
+        event="http.response.end",
+        latency=latency,
+        status_code=status_code,
+        spans=get_span_tree(),
+    )
 
 
 class LoggingASGIMiddleware:
@@ -19,35 +54,70 @@ class LoggingASGIMiddleware:
         start = time.perf_counter()
         uid = str(uuid.uuid4())
         request_id.set(uid)
+        state = RequestLogState(scope=scope)
+        request_log_state.set(state)
+        # Fresh root per request, spans of the request hang below it
+        current_span.set(SpanNode(name="request"))
+        # Bound once, every event of the request picks these up
         contextvars.bind_contextvars(
             request_id=uid,
             method=scope.get("method"),
             path=scope.get("path"),
-            spans=span_list.get(),
+            error=error.get(),
+            extra_str=extra_str.get(),
         )
 
-        try:
-            contextvars.bind_contextvars(error=error.get(), extra_str=extra_str.get())
-            logger.info(event="http.request.start", status_code=None)
-
-            async def send_wrapper(message: Message) -> None:
-                await send(message)
-                if message.get("type") == "http.response.start":
-                    contextvars.bind_contextvars(
-                        error=error.get(), extra_str=extra_str.get(),
-                    )
-                    req_time = time.perf_counter() - start
-                    logger.info(
-                        event="http.response.end",
-                        latency=round(req_time * 1000, 2),
-                        status_code=message.get("status"),
-                        spans=span_list.get(),
-                    )
-
-            await self.app(scope, receive, send_wrapper)
-        except Exception as ex:
-            logger.error(
-                error=str(ex),
-                event=ex.event if hasattr(ex, "event") else "app.middleware.error",
-            )
-            raise ex
+        carrier = {
+            key.decode("latin-1"): value.decode("latin-1")
+            for key, value in scope.get("headers", [])
+            if key in (b"traceparent", b"tracestate")
+        }
+        with tracer.start_as_current_span(
+            f"{scope.get('method')} {scope.get('path')}",
+            context=propagator.extract(carrier),
+            kind=SpanKind.SERVER,
+            attributes={
+                "http.request.method": scope.get("method"),
+                "url.path": scope.get("path"),
+                "request_id": uid,
+            },
+        ) as server_span:
+            try:
+                if not PRODUCTION_PROFILE:
+                    logger.info(event="http.request.start", status_code=None)
+
+                async def send_wrapper(message: Message) -> None:
+                    if message.get("type") == "http.response.start":
+                        headers = {}
+                        propagator.inject(headers)
+                        message = {
+                            **message,
+                            "headers": [
+                                *message.get("headers", []),
+                                *[
+                                    (key.encode("latin-1"), value.encode("latin-1"))
+                                    for key, value in headers.items()
+                                ],
+                            ],
+                        }
+                    await send(message)
+                    if message.get("type") == "http.response.start":
+                        latency = round((time.perf_counter() - start) * 1000, 2)
+                        status_code = message.get("status")
+                        route = route_template(scope)
+                        server_span.update_name(f"{scope.get('method')} {route}")
+                        server_span.set_attribute("http.route", route)
+                        server_span.set_attribute(
+                            "http.response.status_code", status_code,
+                        )
+                        if status_code >= 500:  # noqa: PLR2004
+                            server_span.set_status(Status(StatusCode.ERROR))
+                        log_response_end(state, status_code, latency)
+
+                await self.app(scope, receive, send_wrapper)
+            except Exception as ex:
+                logger.error(
+                    error=str(ex),
+                    event=ex.event if hasattr(ex, "event") else "app.middleware.error",
+                )
+                raise ex
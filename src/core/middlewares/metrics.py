@@ -0,0 +1,44 @@
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.logger.sampling import route_template
+from src.core.metrics.registry import (
+    http_request_duration,
+    http_requests,
+    http_requests_in_flight,
+)
+
+
+class MetricsASGIMiddleware:
+    """Count requests and time them by route template, method and status."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope.get("type") != "http":
+            return await self.app(scope, receive, send)
+
+        method = scope.get("method")
+        start = time.perf_counter()
+        status_code = 500
+        in_flight = http_requests_in_flight.labels(method)
+        in_flight.inc()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message.get("type") == "http.response.start":
+                status_code = message.get("status")
+                # Route templates keep the label set bounded, unlike raw paths
+                labels = (method, route_template(scope), str(status_code))
+                http_request_duration.labels(*labels).observe(
+                    time.perf_counter() - start,
+                )
+                http_requests.labels(*labels).inc()
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            in_flight.dec()
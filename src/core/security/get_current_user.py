@@ -7,6 +7,8 @@ from fastapi.security.utils import get_authorization_scheme_param
 
 from src.config.settings import settings
 from src.core.logger.log import logger
+from src.core.metrics.registry import jwt_decode_duration, observe_duration
+from src.core.security.token_cache import token_cache
 from src.models.token import TokenDecrypted
 
 
@@ -67,21 +69,25 @@ async def get_current_user(
     security_scopes: SecurityScopes,
     token: str = Depends(oauth2_scheme),
 ):
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    user = jwt.decode(token, settings.JWT_SECRET, algorithms=settings.JWT_ALGORITHM)
-    if user is None:
-        logger.warning(event="app.security.token_error")
-        raise credentials_exception
-    user = TokenDecrypted(**user)
-    if security_scopes.scopes:
-        for scope in security_scopes.scopes:
-            if scope not in user.scopes:
-                logger.warning(event="app.security.forbidden", status_code=403)
+    cached = token_cache.get(token)
+    if cached is None:
+        with observe_duration(jwt_decode_duration):
+            user = jwt.decode(
+                token, settings.JWT_SECRET, algorithms=settings.JWT_ALGORITHM,
+            )
+            if user is None:
+                logger.warning(event="app.security.token_error")
                 raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions",
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Could not validate credentials",
+                    headers={"WWW-Authenticate": "Bearer"},
                 )
-    return user
+            cached = token_cache.put(token, TokenDecrypted(**user))
+    if security_scopes.scopes and not cached.scopes.issuperset(
+        security_scopes.scopes,
+    ):
+        logger.warning(event="app.security.forbidden", status_code=403)
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions",
+        )
+    return cached.user
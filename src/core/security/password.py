@@ -0,0 +1,124 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+import bcrypt
+
+from src.config.settings import settings
+from src.core.exceptions.service_exception import ServiceUnavailableError
+from src.core.metrics.registry import (
+    password_hash_duration,
+    password_hash_queue_wait,
+    password_hash_rejected,
+)
+
+
+@dataclass
+class HashStats:
+    """Counters of the password hashing pool."""
+
+    submitted: int = 0
+    rejected: int = 0
+    completed: int = 0
+    queue_wait_ms: float = 0.0
+    max_queue_wait_ms: float = 0.0
+    hash_ms: float = 0.0
+    max_hash_ms: float = 0.0
+
+
+class PasswordHasher:
+    """Run bcrypt on a bounded thread pool instead of the event loop.
+
+    bcrypt releases the GIL while hashing, so the workers hash in parallel.
+    Calls beyond ``workers + max_queue`` in flight are rejected straight
+    away with a 503 instead of queueing behind the pool.
+    """
+
+    def __init__(self, workers: int, max_queue: int, retry_after: int = 1) -> None:
+        self.workers = workers
+        self.max_queue = max_queue
+        self.retry_after = retry_after
+        self.pending = 0
+        self.stats = HashStats()
+        self._executor: ThreadPoolExecutor | None = None
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers,
+                thread_name_prefix="password-hasher",
+            )
+        return self._executor
+
+    @staticmethod
+    def hash_sync(password: str) -> str:
+        """Hash password on the calling thread."""
+        return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode(
+            "utf-8",
+        )
+
+    @staticmethod
+    def verify_sync(password: str, hashed: str) -> bool:
+        """Verify password on the calling thread."""
+        return bcrypt.checkpw(password.encode("utf-8"), hashed.encode("utf-8"))
+
+    async def hash(self, password: str) -> str:
+        """Hash password on the worker pool."""
+        return await self._run("hash", self.hash_sync, password)
+
+    async def verify(self, password: str, hashed: str) -> bool:
+        """Verify password on the worker pool."""
+        return await self._run("verify", self.verify_sync, password, hashed)
+
+    async def _run(self, operation: str, func, *args):
+        if self.pending >= self.workers + self.max_queue:
+            self.stats.rejected += 1
+            password_hash_rejected.inc()
+            raise ServiceUnavailableError(
+                reason="password hashing queue is full",
+                retry_after=self.retry_after,
+                event="app.security.password.rejected",
+            )
+
+        def timed():
+            started = time.perf_counter()
+            result = func(*args)
+            return result, started, time.perf_counter()
+
+        self.stats.submitted += 1
+        self.pending += 1
+        submitted = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            result, started, finished = await loop.run_in_executor(
+                self.executor,
+                timed,
+            )
+        finally:
+            self.pending -= 1
+
+        wait_ms = (started - submitted) * 1000
+        hash_ms = (finished - started) * 1000
+        self.stats.completed += 1
+        self.stats.queue_wait_ms += wait_ms
+        self.stats.hash_ms += hash_ms
+        self.stats.max_queue_wait_ms = max(self.stats.max_queue_wait_ms, wait_ms)
+        self.stats.max_hash_ms = max(self.stats.max_hash_ms, hash_ms)
+        password_hash_queue_wait.observe(started - submitted)
+        password_hash_duration.labels(operation=operation).observe(finished - started)
+        return result
+
+    def shutdown(self) -> None:
+        """Stop the worker pool, dropping queued work."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+    retry_after=settings.PASSWORD_HASH_RETRY_AFTER,
+)
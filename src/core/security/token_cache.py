@@ -0,0 +1,84 @@
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from src.config.settings import settings
+from src.core.metrics.registry import token_cache_requests
+from src.models.token import TokenDecrypted
+
+token_cache_hits = token_cache_requests.labels(result="hit")
+token_cache_misses = token_cache_requests.labels(result="miss")
+
+
+@dataclass(slots=True)
+class CachedToken:
+    user: TokenDecrypted
+    scopes: frozenset[str]
+    expires_at: float
+
+
+class TokenCache:
+    """LRU cache of verified tokens, keyed by token digest.
+
+    Entries expire at the token ``exp``, so a cached token is never honoured
+    for longer than ``jwt.decode`` would have honoured it. A ``max_size`` of
+    0 disables caching.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[bytes, CachedToken] = OrderedDict()
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.blake2b(token.encode("utf-8"), digest_size=16).digest()
+
+    def get(self, token: str) -> CachedToken | None:
+        """Return the cached token if present and not expired."""
+        if not self.max_size:
+            self.misses += 1
+            token_cache_misses.inc()
+            return None
+        key = self._key(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            token_cache_misses.inc()
+            return None
+        if entry.expires_at <= time.time():
+            del self._entries[key]
+            self.misses += 1
+            token_cache_misses.inc()
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        token_cache_hits.inc()
+        return entry
+
+    def put(self, token: str, user: TokenDecrypted) -> CachedToken:
+        """Build the cache entry for a verified token and store it."""
+        entry = CachedToken(
+            user=user,
+            scopes=frozenset(user.scopes),
+            expires_at=user.exp.timestamp(),
+        )
+        if not self.max_size:
+            return entry
+        self._entries[self._key(token)] = entry
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return entry
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+token_cache = TokenCache(max_size=settings.TOKEN_CACHE_SIZE)
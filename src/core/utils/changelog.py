@@ -0,0 +1,79 @@
+import asyncio
+import hashlib
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from src.core.logger.log import logger
+from src.core.utils.compression import brotli_compress, gzip_compress
+
+
+@dataclass(frozen=True, slots=True)
+class RenderedPage:
+    """Rendered HTML with its precompressed variants, keyed by coding."""
+
+    etag: str
+    mtime: float
+    variants: dict[str, bytes] = field(default_factory=dict)
+
+    def variant(self, coding: str) -> tuple[str, bytes]:
+        """ETag and body of a coding, each representation gets its own ETag."""
+        if coding == "identity":
+            return f'"{self.etag}"', self.variants[coding]
+        return f'"{self.etag}-{coding}"', self.variants[coding]
+
+
+def render_page(path: Path) -> RenderedPage:
+    """Read and render the markdown file, blocking."""
+    # Imported here, markdown is only needed once the changelog is rendered
+    import markdown  # noqa: PLC0415
+
+    mtime = path.stat().st_mtime
+    html = markdown.markdown(path.read_text(encoding="utf-8")).encode("utf-8")
+    variants = {"identity": html, "gzip": gzip_compress(html)}
+    brotli_body = brotli_compress(html)
+    if brotli_body is not None:
+        variants["br"] = brotli_body
+    etag = hashlib.blake2b(html, digest_size=16).hexdigest()
+    return RenderedPage(etag=etag, mtime=mtime, variants=variants)
+
+
+class CachedMarkdown:
+    """Markdown file rendered once and served from memory.
+
+    ``get`` checks the file mtime at most every ``check_interval`` seconds,
+    on a worker thread, and renders again only when it changed.
+    """
+
+    def __init__(self, path: Path, check_interval: float) -> None:
+        self.path = path
+        self.check_interval = check_interval
+        self.page: RenderedPage | None = None
+        self._checked_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def refresh(self) -> RenderedPage | None:
+        """Render again if the file changed since the last render."""
+        async with self._lock:
+            self._checked_at = time.monotonic()
+            try:
+                mtime = await asyncio.to_thread(lambda: self.path.stat().st_mtime)
+                if self.page is None or mtime != self.page.mtime:
+                    self.page = await asyncio.to_thread(render_page, self.path)
+                    logger.info(
+                        event="app.changelog.rendered",
+                        extra_str=str(self.path),
+                    )
+            except OSError as ex:
+                logger.error(
+                    event="app.changelog.unavailable",
+                    extra_str=str(self.path),
+                    error=str(ex),
+                )
+        return self.page
+
+    async def get(self) -> RenderedPage | None:
+        stale = time.monotonic() - self._checked_at >= self.check_interval
+        if stale and not self._lock.locked():
+            return await self.refresh()
+        return self.page
@@ -0,0 +1,145 @@
+import gzip
+import zlib
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Protocol
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is an optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - zstandard is an optional dependency
+    zstandard = None
+
+
+def parse_accept_encoding(header: str | None) -> dict[str, float]:
+    """Map each coding of an `Accept-Encoding` header to its q-value."""
+    codings = {}
+    for item in (header or "").split(","):
+        coding, *params = (part.strip() for part in item.split(";"))
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        codings[coding.lower()] = quality
+    return codings
+
+
+def accepts(codings: dict[str, float], coding: str) -> bool:
+    quality = codings.get(coding, codings.get("*", 0.0))
+    return quality > 0
+
+
+def gzip_compress(data: bytes, level: int = 9) -> bytes:
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+def brotli_compress(data: bytes, quality: int = 11) -> bytes | None:
+    """Brotli encode `data`, None when brotli is not installed."""
+    if brotli is None:
+        return None
+    return brotli.compress(data, quality=quality)
+
+
+class StreamCompressor(Protocol):
+    def compress(self, data: bytes, final: bool) -> bytes:
+        """Compress a chunk and flush it so the client can decode it now."""
+
+
+class _GzipStream:
+    def __init__(self, level: int) -> None:
+        # wbits 31 writes the gzip header and trailer around the deflate data
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        mode = zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH
+        return self._compressor.compress(data) + self._compressor.flush(mode)
+
+
+class _BrotliStream:
+    def __init__(self, quality: int) -> None:
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        out = self._compressor.process(data)
+        return out + (self._compressor.finish() if final else self._compressor.flush())
+
+
+class _ZstdStream:
+    def __init__(self, level: int) -> None:
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        mode = (
+            zstandard.COMPRESSOBJ_FLUSH_FINISH
+            if final
+            else zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        )
+        return self._compressor.compress(data) + self._compressor.flush(mode)
+
+
+@dataclass(frozen=True, slots=True)
+class Codec:
+    """A content coding at a fixed level."""
+
+    name: str
+    level: int
+    # Slow enough at this level to keep off the event loop whatever the size
+    heavy: bool
+    compress: Callable[[bytes], bytes]
+    stream: Callable[[], StreamCompressor]
+
+
+def gzip_codec(level: int) -> Codec:
+    return Codec(
+        name="gzip",
+        level=level,
+        heavy=level >= 7,  # noqa: PLR2004
+        compress=lambda data: gzip_compress(data, level),
+        stream=lambda: _GzipStream(level),
+    )
+
+
+def brotli_codec(quality: int) -> Codec | None:
+    if brotli is None:
+        return None
+    return Codec(
+        name="br",
+        level=quality,
+        heavy=quality >= 6,  # noqa: PLR2004
+        compress=lambda data: brotli.compress(data, quality=quality),
+        stream=lambda: _BrotliStream(quality),
+    )
+
+
+def zstd_codec(level: int) -> Codec | None:
+    if zstandard is None:
+        return None
+    return Codec(
+        name="zstd",
+        level=level,
+        heavy=level >= 10,  # noqa: PLR2004
+        # A ZstdCompressor must not be shared between threads, one per call
+        compress=lambda data: zstandard.ZstdCompressor(level=level).compress(data),
+        stream=lambda: _ZstdStream(level),
+    )
+
+
+def select_codec(header: str | None, codecs: list[Codec]) -> Codec | None:
+    """Codec the client rates highest, ties go to the earlier one in `codecs`."""
+    accepted = parse_accept_encoding(header)
+    best, best_quality = None, 0.0
+    for codec in codecs:
+        quality = accepted.get(codec.name, accepted.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = codec, quality
+    return best
@@ -0,0 +1,93 @@
+import hashlib
+from collections.abc import Callable
+
+from fastapi import Request, Response
+from pydantic import BaseModel, TypeAdapter
+
+# Responses are per user, clients and proxies must revalidate before reuse
+CACHE_CONTROL = "private, no-cache"
+
+
+def _etag(data: bytes) -> str:
+    return f'"{hashlib.blake2b(data, digest_size=16).hexdigest()}"'
+
+
+def entity_etag(entity: BaseModel) -> str:
+    """Strong ETag of a stored entity from its id and last write time."""
+    version = getattr(entity, "updated_at", None) or entity.created_at
+    return _etag(f"{type(entity).__name__}:{entity.id}:{version}".encode())
+
+
+def content_etag(content: bytes) -> str:
+    """Strong ETag of a response body."""
+    return _etag(content)
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether `If-None-Match` holds `etag`, compared weakly as RFC 9110 says."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return any(
+        candidate.strip().removeprefix("W/") == etag for candidate in header.split(",")
+    )
+
+
+def conditional_response(
+    request: Request,
+    etag: str,
+    render: Callable[[], bytes | str],
+    media_type: str = "application/json",
+    headers: dict[str, str] | None = None,
+) -> Response:
+    """304 when the client holds `etag`, else the body `render` builds."""
+    headers = {**(headers or {}), "ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=render(), media_type=media_type, headers=headers)
+
+
+def entity_response(request: Request, entity: BaseModel) -> Response:
+    """Conditional response of an entity, the body is only built on a miss."""
+    return conditional_response(
+        request,
+        entity_etag(entity),
+        lambda: entity.model_dump_json(by_alias=True),
+    )
+
+
+def content_response(
+    request: Request,
+    content: bytes,
+    media_type: str = "application/json",
+) -> Response:
+    """Conditional response of a body whose ETag derives from its content."""
+    return conditional_response(
+        request,
+        content_etag(content),
+        lambda: content,
+        media_type=media_type,
+    )
+
+
+def dump_json(value: object, annotation: type) -> bytes:
+    """Serialize `value` the way FastAPI serializes a response model."""
+    return _adapter(annotation).dump_json(value, by_alias=True)
+
+
+def prepare_json(*annotations: type) -> None:
+    """Build the serializers `dump_json` uses ahead of the first request."""
+    for annotation in annotations:
+        _adapter(annotation)
+
+
+_adapters: dict[type, TypeAdapter] = {}
+
+
+def _adapter(annotation: type) -> TypeAdapter:
+    adapter = _adapters.get(annotation)
+    if adapter is None:
+        adapter = _adapters[annotation] = TypeAdapter(annotation)
+    return adapter
@@ -0,0 +1,46 @@
+from typing import Any
+
+from bson import ObjectId
+from fastapi.responses import JSONResponse
+
+from src.config.settings import settings
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional dependency
+    orjson = None
+
+fast_json_enabled = settings.FAST_JSON and orjson is not None
+
+
+def orjson_default(obj: Any) -> Any:
+    """Serialize types orjson does not know, datetime is handled natively."""
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    message = f"Type is not JSON serializable: {type(obj).__name__}"
+    raise TypeError(message)
+
+
+def orjson_log_default(obj: Any) -> Any:
+    """Same as `orjson_default` but never fails, like structlog's fallback."""
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    return repr(obj)
+
+
+def orjson_log_serializer(obj: Any, **_: Any) -> str:
+    """`JSONRenderer` serializer, the stdlib logger factory expects `str`."""
+    return orjson.dumps(obj, default=orjson_log_default).decode("utf-8")
+
+
+class ORJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            default=orjson_default,
+            option=orjson.OPT_NON_STR_KEYS,
+        )
+
+
+# Response class used by the app and its exception handlers
+json_response_class = ORJSONResponse if fast_json_enabled else JSONResponse
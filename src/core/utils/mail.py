@@ -1,11 +1,11 @@
-from fastapi_mail import FastMail, MessageSchema
-
-from src.config.mail_config import mail_config
-
-
 async def send_mail(
     emails: list[str], cc: list[str], subject: str, body, template_name: str,
 ) -> bool:
+    # Imported here, fastapi_mail and its config are only needed to send mail
+    from fastapi_mail import FastMail, MessageSchema  # noqa: PLC0415
+
+    from src.config.mail_config import mail_config  # noqa: PLC0415
+
     message = MessageSchema(
         subject=subject, recipients=emails, template_body=body, subtype="html", cc=cc,
     )
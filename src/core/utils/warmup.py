@@ -0,0 +1,41 @@
+from collections.abc import Iterable, Iterator
+from types import UnionType
+from typing import Union, get_args, get_origin
+
+from fastapi import FastAPI
+from fastapi.routing import APIRoute
+
+from src.core.utils.etag import prepare_json
+
+
+def api_routes(routes: Iterable) -> Iterator[APIRoute]:
+    for route in routes:
+        if isinstance(route, APIRoute):
+            yield route
+        # Newer FastAPI keeps included routers instead of copying their routes
+        included = getattr(route, "original_router", None)
+        if included is not None:
+            yield from api_routes(included.routes)
+
+
+def response_annotations(app: FastAPI) -> set[type]:
+    """Response types of the routes, the members of a union taken apart."""
+    annotations = set()
+    for route in api_routes(app.routes):
+        if route.response_model is None:
+            continue
+        if get_origin(route.response_model) in (Union, UnionType):
+            annotations.update(get_args(route.response_model))
+        else:
+            annotations.add(route.response_model)
+    return annotations
+
+
+def warm_up(app: FastAPI) -> None:
+    """Build what FastAPI and pydantic otherwise build on the first request.
+
+    The OpenAPI schema is generated on the first `/docs` or `/openapi.json`
+    request, the response serializers on the first list request.
+    """
+    app.openapi()
+    prepare_json(*response_annotations(app))
@@ -1,3 +0,0 @@
-from src.config.settings import settings
-
-print(f"DB in {settings.ENV} mode with db name {settings.DB_NAME}")
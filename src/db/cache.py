@@ -0,0 +1,154 @@
+import time
+from collections import OrderedDict
+from collections.abc import Hashable, Iterable
+from dataclasses import dataclass, field
+
+from src.config.settings import settings
+from src.core.metrics.registry import entity_cache_evictions, entity_cache_requests
+
+# Stored for lookups that found nothing, so repeated misses skip the db too
+NOT_FOUND = object()
+
+
+@dataclass(slots=True)
+class CacheEntry:
+    value: object
+    expires_at: float
+    tags: tuple[Hashable, ...] = ()
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    negative_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.negative_hits + self.misses
+        return (self.hits + self.negative_hits) / lookups if lookups else 0.0
+
+
+@dataclass
+class EntityCache:
+    """In-process TTL + LRU cache for entities of a single collection.
+
+    Entries can carry tags so every key that resolves to the same document
+    (by id, by username, ...) is dropped by a single ``invalidate_tag``.
+    Readers pass the ``version`` seen before their db round trip to ``set``
+    so a result fetched before a concurrent write is never stored after it.
+    """
+
+    name: str
+    max_size: int
+    ttl: float
+    negative_ttl: float
+    enabled: bool = True
+    version: int = 0
+    stats: CacheStats = field(default_factory=CacheStats)
+    _entries: OrderedDict = field(default_factory=OrderedDict, repr=False)
+    _tags: dict = field(default_factory=dict, repr=False)
+
+    def __post_init__(self) -> None:
+        self._hit_counter = entity_cache_requests.labels(self.name, "hit")
+        self._negative_hit_counter = entity_cache_requests.labels(
+            self.name,
+            "negative_hit",
+        )
+        self._miss_counter = entity_cache_requests.labels(self.name, "miss")
+        self._eviction_counter = entity_cache_evictions.labels(self.name)
+
+    def get(self, key: Hashable) -> object | None:
+        """Return the cached value, ``NOT_FOUND`` for a cached miss or None."""
+        if not self.enabled:
+            return None
+        entry = self._entries.get(key)
+        if entry is None or entry.expires_at <= time.monotonic():
+            if entry is not None:
+                self._remove(key)
+            self.stats.misses += 1
+            self._miss_counter.inc()
+            return None
+        self._entries.move_to_end(key)
+        if entry.value is NOT_FOUND:
+            self.stats.negative_hits += 1
+            self._negative_hit_counter.inc()
+        else:
+            self.stats.hits += 1
+            self._hit_counter.inc()
+        return entry.value
+
+    def set(
+        self,
+        key: Hashable,
+        value: object,
+        tags: Iterable[Hashable] = (),
+        version: int | None = None,
+    ) -> None:
+        if not self.enabled or self.max_size <= 0:
+            return
+        if version is not None and version != self.version:
+            return
+        ttl = self.negative_ttl if value is NOT_FOUND else self.ttl
+        if key in self._entries:
+            self._remove(key)
+        entry = CacheEntry(
+            value=value,
+            expires_at=time.monotonic() + ttl,
+            tags=tuple(tags),
+        )
+        self._entries[key] = entry
+        for tag in entry.tags:
+            self._tags.setdefault(tag, set()).add(key)
+        while len(self._entries) > self.max_size:
+            self._remove(next(iter(self._entries)))
+            self.stats.evictions += 1
+            self._eviction_counter.inc()
+
+    def set_missing(self, key: Hashable, version: int | None = None) -> None:
+        self.set(key, NOT_FOUND, version=version)
+
+    def invalidate(self, *keys: Hashable) -> None:
+        self.version += 1
+        for key in keys:
+            if key in self._entries:
+                self._remove(key)
+                self.stats.invalidations += 1
+
+    def invalidate_tag(self, tag: Hashable) -> None:
+        self.invalidate(*self._tags.get(tag, ()))
+
+    def clear(self) -> None:
+        self.version += 1
+        self._entries.clear()
+        self._tags.clear()
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key)
+        for tag in entry.tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+role_cache = EntityCache(
+    name="roles",
+    max_size=settings.ENTITY_CACHE_ROLES_SIZE,
+    ttl=settings.ENTITY_CACHE_TTL,
+    negative_ttl=settings.ENTITY_CACHE_NEGATIVE_TTL,
+    enabled=settings.ENTITY_CACHE_ENABLED,
+)
+user_cache = EntityCache(
+    name="users",
+    max_size=settings.ENTITY_CACHE_USERS_SIZE,
+    ttl=settings.ENTITY_CACHE_TTL,
+    negative_ttl=settings.ENTITY_CACHE_NEGATIVE_TTL,
+    enabled=settings.ENTITY_CACHE_ENABLED,
+)
@@ -0,0 +1,165 @@
+import asyncio
+import threading
+import time
+
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from pymongo import monitoring
+
+from src.config.settings import settings
+from src.core.metrics.registry import (
+    mongo_command_duration,
+    mongo_connections_closed,
+    mongo_connections_created,
+    mongo_pool_checked_out,
+    mongo_pool_checkout_failures,
+    mongo_pool_checkout_wait,
+    mongo_pool_connections,
+    mongo_pool_max_size,
+)
+
+
+class PoolWaitTracker:
+    """Moving average of recent connection checkout waits.
+
+    Listener events arrive on driver threads, hence the lock. The average
+    reads as 0 once no checkout happened for `window` seconds, so shedding
+    on it stops when the pool is idle.
+    """
+
+    def __init__(self, window: float = 5.0, alpha: float = 0.2) -> None:
+        self.window = window
+        self.alpha = alpha
+        self._average = 0.0
+        self._updated_at = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, duration: float) -> None:
+        with self._lock:
+            now = time.monotonic()
+            if now - self._updated_at > self.window:
+                self._average = duration
+            else:
+                self._average += self.alpha * (duration - self._average)
+            self._updated_at = now
+
+    @property
+    def average(self) -> float:
+        if time.monotonic() - self._updated_at > self.window:
+            return 0.0
+        return self._average
+
+
+pool_wait = PoolWaitTracker()
+
+
+def _address(address: tuple) -> str:
+    host, port = address
+    return f"{host}:{port}"
+
+
+class PoolMetricsListener(monitoring.ConnectionPoolListener):
+    """Report connection checkout waits, pool usage and churn as metrics.
+
+    pymongo calls listeners on the threads running the operation, the
+    prometheus client is thread safe.
+    """
+
+    def pool_created(self, event: monitoring.PoolCreatedEvent) -> None:
+        pass
+
+    def pool_ready(self, event: monitoring.PoolReadyEvent) -> None:
+        pass
+
+    def pool_cleared(self, event: monitoring.PoolClearedEvent) -> None:
+        pass
+
+    def pool_closed(self, event: monitoring.PoolClosedEvent) -> None:
+        pass
+
+    def connection_created(self, event: monitoring.ConnectionCreatedEvent) -> None:
+        mongo_connections_created.inc()
+        mongo_pool_connections.labels(_address(event.address)).inc()
+
+    def connection_ready(self, event: monitoring.ConnectionReadyEvent) -> None:
+        pass
+
+    def connection_closed(self, event: monitoring.ConnectionClosedEvent) -> None:
+        mongo_connections_closed.labels(event.reason).inc()
+        mongo_pool_connections.labels(_address(event.address)).dec()
+
+    def connection_check_out_started(
+        self,
+        event: monitoring.ConnectionCheckOutStartedEvent,
+    ) -> None:
+        pass
+
+    def connection_check_out_failed(
+        self,
+        event: monitoring.ConnectionCheckOutFailedEvent,
+    ) -> None:
+        mongo_pool_checkout_wait.labels("failed").observe(event.duration)
+        pool_wait.observe(event.duration)
+        mongo_pool_checkout_failures.labels(event.reason).inc()
+
+    def connection_checked_out(
+        self,
+        event: monitoring.ConnectionCheckedOutEvent,
+    ) -> None:
+        mongo_pool_checkout_wait.labels("ok").observe(event.duration)
+        pool_wait.observe(event.duration)
+        mongo_pool_checked_out.labels(_address(event.address)).inc()
+
+    def connection_checked_in(self, event: monitoring.ConnectionCheckedInEvent) -> None:
+        mongo_pool_checked_out.labels(_address(event.address)).dec()
+
+
+class CommandMetricsListener(monitoring.CommandListener):
+    """Time every command the driver sends, by command name."""
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        pass
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        mongo_command_duration.labels(event.command_name, "ok").observe(
+            event.duration_micros / 1_000_000,
+        )
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        mongo_command_duration.labels(event.command_name, "failed").observe(
+            event.duration_micros / 1_000_000,
+        )
+
+
+def client_options() -> dict:
+    """Pool, timeout and compression options of the Mongo client."""
+    options = {
+        "maxPoolSize": settings.MONGO_MAX_POOL_SIZE,
+        "minPoolSize": settings.MONGO_MIN_POOL_SIZE,
+        "maxIdleTimeMS": settings.MONGO_MAX_IDLE_TIME_MS,
+        "waitQueueTimeoutMS": settings.MONGO_WAIT_QUEUE_TIMEOUT_MS,
+        "serverSelectionTimeoutMS": settings.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        "connectTimeoutMS": settings.MONGO_CONNECT_TIMEOUT_MS,
+    }
+    if settings.MONGO_COMPRESSORS:
+        options["compressors"] = settings.MONGO_COMPRESSORS
+    return {key: value for key, value in options.items() if value is not None}
+
+
+def create_client() -> AsyncIOMotorClient:
+    """Mongo client configured from settings, with metrics listeners."""
+    mongo_pool_max_size.set(settings.MONGO_MAX_POOL_SIZE)
+    return AsyncIOMotorClient(
+        settings.MONGO_URI,
+        event_listeners=[PoolMetricsListener(), CommandMetricsListener()],
+        **client_options(),
+    )
+
+
+async def warm_pool(db: AsyncIOMotorDatabase, size: int) -> None:
+    """Open ``size`` connections up front with concurrent pings.
+
+    The driver fills ``minPoolSize`` in a background thread, so without this
+    the first requests after startup pay for the connection handshakes.
+    """
+    if size > 0:
+        await asyncio.gather(*(db.command("ping") for _ in range(size)))
@@ -1,6 +1,22 @@
+from pymongo import ASCENDING, IndexModel
+
+
 class CollectionNames:
     users_collection: str = "users"
     roles_collection: str = "roles"
 
 
 collections = CollectionNames()
+
+# Indexes every collection must have, reconciled by `src.db.indexes`
+indexes: dict[str, list[IndexModel]] = {
+    collections.users_collection: [
+        IndexModel([("username", ASCENDING)], name="username_unique", unique=True),
+        IndexModel([("role_id", ASCENDING)], name="role_id"),
+        IndexModel([("created_at", ASCENDING)], name="created_at"),
+    ],
+    collections.roles_collection: [
+        IndexModel([("name", ASCENDING)], name="name_unique", unique=True),
+        IndexModel([("created_at", ASCENDING)], name="created_at"),
+    ],
+}
@@ -0,0 +1,69 @@
+import asyncio
+import contextlib
+import time
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from src.config.settings import settings
+from src.core.logger.log import logger
+from src.core.metrics.registry import mongo_up
+
+
+class MongoPing:
+    """Ping Mongo every `interval` in the background for the readiness probe.
+
+    Probes read the last result instead of pinging, so their rate does not
+    reach the database. A result older than three intervals counts as down,
+    the pinger itself may be stuck.
+    """
+
+    def __init__(self, interval: float, timeout: float) -> None:
+        self.interval = interval
+        self.timeout = timeout
+        self.ok = False
+        self.checked_at: float | None = None
+        self.error: str | None = None
+        self._task: asyncio.Task | None = None
+
+    @property
+    def healthy(self) -> bool:
+        if not self.ok or self.checked_at is None:
+            return False
+        return time.monotonic() - self.checked_at < 3 * self.interval
+
+    async def check(self, db: AsyncIOMotorDatabase) -> bool:
+        try:
+            response = await asyncio.wait_for(db.command("ping"), self.timeout)
+            ok, error = int(response.get("ok", 0)) == 1, None
+        except Exception as ex:  # noqa: BLE001
+            ok, error = False, str(ex) or type(ex).__name__
+        if ok != self.ok:
+            log = logger.info if ok else logger.warning
+            log(event="app.db.ping", ok=ok, error=error)
+        self.ok, self.error = ok, error
+        self.checked_at = time.monotonic()
+        mongo_up.set(int(ok))
+        return ok
+
+    async def _run(self, db: AsyncIOMotorDatabase) -> None:
+        while True:
+            await self.check(db)
+            await asyncio.sleep(self.interval)
+
+    def start(self, db: AsyncIOMotorDatabase) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run(db))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        self.ok = False
+
+
+mongo_ping = MongoPing(
+    interval=settings.READINESS_PING_INTERVAL,
+    timeout=settings.READINESS_PING_TIMEOUT,
+)
@@ -0,0 +1,100 @@
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import IndexModel
+from pymongo.database import Database
+
+from src.core.logger.log import logger
+from src.db.collections import indexes
+
+# Index options compared when deciding whether an index matches its spec
+INDEX_OPTIONS = ("unique", "sparse", "expireAfterSeconds", "partialFilterExpression")
+
+
+def _spec(index: dict) -> tuple:
+    key = tuple((field, direction) for field, direction in index["key"].items())
+    options = tuple((option, index.get(option) or None) for option in INDEX_OPTIONS)
+    return key, options
+
+
+def plan_indexes(
+    existing: dict[str, dict],
+    declared: list[IndexModel],
+) -> tuple[list[IndexModel], list[str]]:
+    """Indexes to create so `existing` matches `declared`, and the clashes.
+
+    `existing` is the output of `index_information`. Indexes are never
+    dropped: a declared index that clashes with an existing one, by name or
+    by key, is not created and the clashing names are returned instead, as
+    Mongo would refuse to create it. Resolving them is left to an operator.
+    """
+    current = {
+        name: _spec({**info, "key": dict(info["key"])})
+        for name, info in existing.items()
+        if name != "_id_"
+    }
+    to_create, conflicts = [], []
+    for model in declared:
+        document = model.document
+        name, spec = document["name"], _spec(document)
+        if current.get(name) == spec:
+            continue
+        clashing = [
+            other
+            for other, other_spec in current.items()
+            if other == name or other_spec[0] == spec[0]
+        ]
+        if clashing:
+            conflicts.extend(other for other in clashing if other not in conflicts)
+        else:
+            to_create.append(model)
+    return to_create, conflicts
+
+
+async def ensure_indexes(db: AsyncIOMotorDatabase) -> dict[str, list[str]]:
+    """Create the missing declared indexes of every collection, idempotently.
+
+    Returns the conflicting index names of each collection that has some.
+    """
+    all_conflicts = {}
+    for collection_name, declared in indexes.items():
+        collection = db.get_collection(collection_name)
+        existing = await collection.index_information()
+        to_create, conflicts = plan_indexes(existing, declared)
+        if to_create:
+            await collection.create_indexes(to_create)
+        _log_changes(collection_name, to_create, conflicts)
+        if conflicts:
+            all_conflicts[collection_name] = conflicts
+    return all_conflicts
+
+
+def ensure_indexes_sync(db: Database) -> dict[str, list[str]]:
+    """Blocking `ensure_indexes` for scripts using pymongo directly."""
+    all_conflicts = {}
+    for collection_name, declared in indexes.items():
+        collection = db.get_collection(collection_name)
+        to_create, conflicts = plan_indexes(collection.index_information(), declared)
+        if to_create:
+            collection.create_indexes(to_create)
+        _log_changes(collection_name, to_create, conflicts)
+        if conflicts:
+            all_conflicts[collection_name] = conflicts
+    return all_conflicts
+
+
+def _log_changes(
+    collection_name: str,
+    to_create: list[IndexModel],
+    conflicts: list[str],
+) -> None:
+    if to_create:
+        logger.info(
+            event="db.indexes.created",
+            collection=collection_name,
+            created=[model.document["name"] for model in to_create],
+        )
+    if conflicts:
+        logger.warning(
+            event="db.indexes.conflict",
+            collection=collection_name,
+            conflicting=conflicts,
+        )
@@ -0,0 +1,137 @@
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from src.config.settings import settings
+from src.models.bulk import BulkItemResult
+
+DUPLICATE_KEY_ERROR = 11000
+
+
+def chunked(items: list, size: int | None = None) -> list[list]:
+    size = size or settings.BULK_CHUNK_SIZE
+    return [items[i : i + size] for i in range(0, len(items), size)]
+
+
+def write_error_status(error: dict) -> int:
+    return 409 if error.get("code") == DUPLICATE_KEY_ERROR else 500
+
+
+async def insert_many_chunked(
+    collection: AsyncIOMotorCollection,
+    documents: dict[int, dict],
+) -> list[BulkItemResult]:
+    """Insert documents keyed by request index with unordered `insert_many`."""
+    results = []
+    for chunk in chunked(list(documents.items())):
+        errors = {}
+        try:
+            await collection.insert_many([doc for _, doc in chunk], ordered=False)
+        except BulkWriteError as ex:
+            errors = {err["index"]: err for err in ex.details.get("writeErrors", [])}
+        for position, (index, doc) in enumerate(chunk):
+            error = errors.get(position)
+            results.append(
+                BulkItemResult(
+                    index=index,
+                    id=str(doc["_id"]),
+                    status_code=write_error_status(error) if error else 201,
+                    error=error.get("errmsg") if error else None,
+                ),
+            )
+    return results
+
+
+async def find_existing_ids(
+    collection: AsyncIOMotorCollection,
+    ids: list[ObjectId],
+) -> set[ObjectId]:
+    existing = set()
+    for chunk in chunked(list(set(ids))):
+        cursor = collection.find({"_id": {"$in": chunk}}, projection={"_id": 1})
+        existing.update([doc["_id"] async for doc in cursor])
+    return existing
+
+
+def not_found(index: int, entity_id: ObjectId) -> BulkItemResult:
+    return BulkItemResult(
+        index=index,
+        id=str(entity_id),
+        status_code=404,
+        error="Resource not found",
+    )
+
+
+async def update_many_by_id(
+    collection: AsyncIOMotorCollection,
+    updates: dict[int, tuple[ObjectId, dict]],
+) -> list[BulkItemResult]:
+    """Apply `$set` updates keyed by request index with unordered `bulk_write`.
+
+    The write result only counts the matched documents, the missing ids are
+    looked up after the write, and only when some did not match.
+    """
+    results = []
+    for chunk in chunked(list(updates.items())):
+        errors = {}
+        try:
+            result = await collection.bulk_write(
+                [
+                    UpdateOne({"_id": oid}, {"$set": values})
+                    for _, (oid, values) in chunk
+                ],
+                ordered=False,
+            )
+            matched = result.matched_count
+        except BulkWriteError as ex:
+            errors = {err["index"]: err for err in ex.details.get("writeErrors", [])}
+            matched = ex.details.get("nMatched", 0)
+        existing = None
+        if matched < len(chunk) - len(errors):
+            existing = await find_existing_ids(
+                collection,
+                [oid for _, (oid, _) in chunk],
+            )
+        for position, (index, (oid, _)) in enumerate(chunk):
+            error = errors.get(position)
+            if error is None and existing is not None and oid not in existing:
+                results.append(not_found(index, oid))
+                continue
+            results.append(
+                BulkItemResult(
+                    index=index,
+                    id=str(oid),
+                    status_code=write_error_status(error) if error else 200,
+                    error=error.get("errmsg") if error else None,
+                ),
+            )
+    return results
+
+
+async def delete_many_by_id(
+    collection: AsyncIOMotorCollection,
+    ids: list[ObjectId],
+) -> list[BulkItemResult]:
+    """Delete documents by id, reporting the missing ids as not found.
+
+    The write result only counts the deleted documents, so the existing ids
+    are looked up before each chunk is deleted. A repeated id is reported
+    once, at its first position in the request.
+    """
+    first_index = {}
+    for index, oid in enumerate(ids):
+        first_index.setdefault(oid, index)
+    results = []
+    for chunk in chunked(list(first_index)):
+        existing = await find_existing_ids(collection, chunk)
+        if existing:
+            await collection.delete_many({"_id": {"$in": list(existing)}})
+        for oid in chunk:
+            if oid not in existing:
+                results.append(not_found(first_index[oid], oid))
+                continue
+            results.append(
+                BulkItemResult(index=first_index[oid], id=str(oid), status_code=200),
+            )
+    return results
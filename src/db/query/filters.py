@@ -0,0 +1,11 @@
+def created_at_query(
+    created_after: str | None = None,
+    created_before: str | None = None,
+) -> dict:
+    """Build a `created_at` range filter, bounds are ISO 8601 UTC timestamps."""
+    created_at = {}
+    if created_after:
+        created_at["$gte"] = created_after
+    if created_before:
+        created_at["$lt"] = created_before
+    return {"created_at": created_at} if created_at else {}
@@ -0,0 +1,148 @@
+import asyncio
+from dataclasses import dataclass, field
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pydantic import BaseModel
+
+from src.config.settings import settings
+from src.core.metrics.registry import db_loader_batch_size, db_loader_keys
+from src.db.collections import collections
+from src.db.query.projection import projection_for
+from src.models.role import Role
+from src.models.user import User
+
+
+@dataclass
+class LoaderStats:
+    requested: int = 0
+    coalesced: int = 0
+    batches: int = 0
+    fetched: int = 0
+
+    @property
+    def dedup_ratio(self) -> float:
+        return self.coalesced / self.requested if self.requested else 0.0
+
+
+@dataclass
+class _Batch:
+    db: AsyncIOMotorDatabase
+    futures: dict[ObjectId, asyncio.Future] = field(default_factory=dict)
+
+
+class BatchLoader:
+    """Coalesce by-id lookups of one collection into `$in` queries.
+
+    Lookups issued in the same event loop tick are sent as a single query,
+    and a lookup of an id that is already queued or in flight shares its
+    future instead of querying again. ``load`` resolves to the raw document,
+    projected for ``model``, or None when it does not exist.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        collection_name: str,
+        model: type[BaseModel],
+        max_batch: int,
+    ) -> None:
+        self.name = name
+        self.collection_name = collection_name
+        self.model = model
+        self.max_batch = max_batch
+        self.stats = LoaderStats()
+        self._queued: dict[str, _Batch] = {}
+        self._in_flight: dict[tuple[str, ObjectId], asyncio.Future] = {}
+        self._tasks: set[asyncio.Task] = set()
+        self._batched_counter = db_loader_keys.labels(name, "batched")
+        self._coalesced_counter = db_loader_keys.labels(name, "coalesced")
+        self._batch_size = db_loader_batch_size.labels(name)
+
+    async def load(self, db: AsyncIOMotorDatabase, entity_id: ObjectId) -> dict | None:
+        self.stats.requested += 1
+        future = self._in_flight.get((db.name, entity_id))
+        batch = self._queued.get(db.name)
+        if future is None and batch is not None:
+            future = batch.futures.get(entity_id)
+        if future is not None:
+            self.stats.coalesced += 1
+            self._coalesced_counter.inc()
+        else:
+            self._batched_counter.inc()
+            if batch is None:
+                batch = self._queued[db.name] = _Batch(db=db)
+                asyncio.get_running_loop().call_soon(self._dispatch, db.name)
+            future = batch.futures[entity_id] = (
+                asyncio.get_running_loop().create_future()
+            )
+            if len(batch.futures) >= self.max_batch:
+                self._dispatch(db.name)
+        # A cancelled caller must not cancel the lookup other callers share
+        return await asyncio.shield(future)
+
+    def forget(self, db: AsyncIOMotorDatabase, *entity_ids: ObjectId) -> None:
+        """Make later loads of written ids query again instead of joining.
+
+        Queued lookups are kept, their query is not sent yet so it sees the
+        write. Lookups already in flight may not, so they are not shared.
+        """
+        for entity_id in entity_ids:
+            self._in_flight.pop((db.name, entity_id), None)
+
+    def _dispatch(self, db_name: str) -> None:
+        batch = self._queued.pop(db_name, None)
+        if batch is None:
+            return
+        for entity_id, future in batch.futures.items():
+            self._in_flight[(db_name, entity_id)] = future
+        self.stats.batches += 1
+        self.stats.fetched += len(batch.futures)
+        self._batch_size.observe(len(batch.futures))
+        task = asyncio.ensure_future(self._fetch(batch))
+        # The loop only keeps weak references to tasks
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _fetch(self, batch: _Batch) -> None:
+        ids = list(batch.futures)
+        try:
+            collection = batch.db.get_collection(self.collection_name)
+            cursor = collection.find(
+                {"_id": {"$in": ids}},
+                projection_for(self.model),
+            )
+            docs = {doc["_id"]: doc async for doc in cursor}
+        except Exception as ex:  # noqa: BLE001
+            for entity_id, future in batch.futures.items():
+                self._finish(batch.db.name, entity_id, future)
+                if not future.done():
+                    future.set_exception(ex)
+            return
+        for entity_id, future in batch.futures.items():
+            self._finish(batch.db.name, entity_id, future)
+            if not future.done():
+                future.set_result(docs.get(entity_id))
+
+    def _finish(
+        self,
+        db_name: str,
+        entity_id: ObjectId,
+        future: asyncio.Future,
+    ) -> None:
+        if self._in_flight.get((db_name, entity_id)) is future:
+            del self._in_flight[(db_name, entity_id)]
+
+
+role_loader = BatchLoader(
+    name="roles",
+    collection_name=collections.roles_collection,
+    model=Role,
+    max_batch=settings.DB_LOADER_MAX_BATCH,
+)
+user_loader = BatchLoader(
+    name="users",
+    collection_name=collections.users_collection,
+    model=User,
+    max_batch=settings.DB_LOADER_MAX_BATCH,
+)
@@ -0,0 +1,77 @@
+import base64
+import binascii
+from typing import TypeVar
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pydantic import BaseModel
+
+from src.config.settings import settings
+from src.core.exceptions.client_exception import ClientError
+from src.db.query.projection import projection_for
+from src.models.common import Page
+
+T = TypeVar("T", bound=BaseModel)
+
+
+def encode_cursor(last_id: ObjectId) -> str:
+    """Encode the last `_id` of a page as an opaque cursor."""
+    return base64.urlsafe_b64encode(last_id.binary).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: str) -> ObjectId:
+    """Decode a cursor produced by `encode_cursor`, a raw `_id` is accepted too."""
+    try:
+        if ObjectId.is_valid(cursor):
+            return ObjectId(cursor)
+        return ObjectId(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (binascii.Error, InvalidId, TypeError, ValueError) as ex:
+        raise ClientError(400, "db.pagination.invalid_cursor", "Invalid cursor") from ex
+
+
+def clamp_limit(limit: int | None) -> int:
+    if not limit or limit < 1:
+        return settings.PAGE_SIZE_DEFAULT
+    return min(limit, settings.PAGE_SIZE_MAX)
+
+
+async def find_page(
+    collection: AsyncIOMotorCollection,
+    model: type[T],
+    *,
+    limit: int | None = None,
+    after: str | None = None,
+    include_total: bool = False,
+) -> Page[T]:
+    """Fetch one `_id` ordered page of `collection` after the given cursor."""
+    limit = clamp_limit(limit)
+    query = {}
+    if after:
+        query["_id"] = {"$gt": decode_cursor(after)}
+
+    # One extra document tells whether another page exists
+    cursor = collection.find(query, projection_for(model)).sort("_id", 1)
+    docs = await cursor.limit(limit + 1).to_list(length=limit + 1)
+    next_cursor = None
+    if len(docs) > limit:
+        docs = docs[:limit]
+        next_cursor = encode_cursor(docs[-1]["_id"])
+
+    total = await collection.estimated_document_count() if include_total else None
+    return Page[model](
+        items=[model(**doc) for doc in docs],
+        next_cursor=next_cursor,
+        estimated_total=total,
+    )
+
+
+async def ensure_small_collection(collection: AsyncIOMotorCollection) -> None:
+    """Reject unpaginated reads of collections above `UNPAGINATED_MAX`."""
+    total = await collection.estimated_document_count()
+    if total > settings.UNPAGINATED_MAX:
+        raise ClientError(
+            400,
+            "db.pagination.collection_too_large",
+            f"Collection has about {total} documents, use paginated requests",
+        )
@@ -0,0 +1,20 @@
+from collections.abc import Mapping
+from functools import cache
+from types import MappingProxyType
+
+from pydantic import BaseModel
+
+
+@cache
+def projection_for(model: type[BaseModel]) -> Mapping[str, int]:
+    """Mongo projection fetching only the fields `model` declares.
+
+    Fields are named as stored, so `id` is projected as `_id`. Fields the
+    model does not know about, the password hash for read models, are never
+    sent over the wire. The projection is shared between callers, so it is
+    read-only.
+    """
+    projection = {}
+    for name, field in model.model_fields.items():
+        projection[field.serialization_alias or field.alias or name] = 1
+    return MappingProxyType(projection)
@@ -1,52 +1,201 @@
+from collections.abc import AsyncIterator
+
 from bson import ObjectId
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
 
 from src.core.exceptions.resource import (
+    ResourceConflictError,
     ResourceInsertionFailedError,
     ResourceNotFoundError,
 )
+from src.core.logger.spans import monitor
+from src.db.cache import NOT_FOUND, role_cache
 from src.db.collections import collections
+from src.db.query.bulk import (
+    delete_many_by_id,
+    find_existing_ids,
+    insert_many_chunked,
+    update_many_by_id,
+)
+from src.db.query.filters import created_at_query
+from src.db.query.loader import role_loader
+from src.db.query.pagination import ensure_small_collection, find_page
+from src.db.query.projection import projection_for
+from src.models.bulk import BulkItemResult
+from src.models.common import Page
 from src.models.role import Role, RoleUpdate
 
 
+def _invalidate_roles(db: AsyncIOMotorDatabase, *role_ids: str | ObjectId) -> None:
+    role_cache.invalidate(*[(db.name, str(role_id)) for role_id in role_ids])
+    role_loader.forget(db, *[ObjectId(role_id) for role_id in role_ids])
+
+
+@monitor
 async def get_roles_db(db: AsyncIOMotorDatabase) -> list[Role]:
     roles_collection = db.get_collection(collections.roles_collection)
-    roles = [r async for r in roles_collection.find()]
+    await ensure_small_collection(roles_collection)
+    roles = [r async for r in roles_collection.find({}, projection_for(Role))]
     return [Role(**role) for role in roles]
 
 
-async def get_role_db(role_id: str, db: AsyncIOMotorDatabase) -> Role:
+@monitor
+async def get_roles_page_db(
+    db: AsyncIOMotorDatabase,
+    limit: int | None = None,
+    after: str | None = None,
+    include_total: bool = False,
+) -> Page[Role]:
+    roles_collection = db.get_collection(collections.roles_collection)
+    return await find_page(
+        roles_collection, Role, limit=limit, after=after, include_total=include_total,
+    )
+
+
+async def stream_roles_db(
+    db: AsyncIOMotorDatabase,
+    batch_size: int,
+    created_after: str | None = None,
+    created_before: str | None = None,
+) -> AsyncIterator[Role]:
+    """Yield roles one at a time, holding at most one cursor batch in memory."""
     roles_collection = db.get_collection(collections.roles_collection)
-    role = await roles_collection.find_one({"_id": ObjectId(role_id)})
-    if not role:
+    cursor = roles_collection.find(
+        created_at_query(created_after, created_before),
+        projection=projection_for(Role),
+        batch_size=batch_size,
+    ).sort("_id", 1)
+    try:
+        async for role in cursor:
+            yield Role(**role)
+    finally:
+        await cursor.close()
+
+
+@monitor
+async def get_role_db(role_id: str, db: AsyncIOMotorDatabase) -> Role:
+    key = (db.name, str(role_id))
+    role = role_cache.get(key)
+    if role is None:
+        version = role_cache.version
+        role = await role_loader.load(db, ObjectId(role_id))
+        if role:
+            role = Role(**role)
+            role_cache.set(key, role, version=version)
+        else:
+            role_cache.set_missing(key, version=version)
+            role = NOT_FOUND
+    if role is NOT_FOUND:
         raise ResourceNotFoundError(
             resource_name="Role", resource_id=role_id, event="db.role.get_role_by_id",
         )
-    return Role(**role)
+    return role
 
 
+@monitor
 async def create_role_db(role: Role, db: AsyncIOMotorDatabase) -> Role:
     roles_collection = db.get_collection(collections.roles_collection)
-    result = await roles_collection.insert_one(role.model_dump_mongo())
+    document = role.model_dump_mongo()
+    try:
+        result = await roles_collection.insert_one(document)
+    except DuplicateKeyError as ex:
+        raise ResourceConflictError(
+            resource_name="Role", resource_id=role.name, event="db.role.insert_role",
+        ) from ex
     if not result.inserted_id:
         raise ResourceInsertionFailedError(
             resource_name="Role", resource_id=role.name, event="db.role.insert_role",
         )
-    return await get_role_db(role_id=result.inserted_id, db=db)
+    _invalidate_roles(db, result.inserted_id)
+    return Role(**document)
 
 
+@monitor
 async def update_role_db(
     role_id: str, role: RoleUpdate, db: AsyncIOMotorDatabase,
 ) -> Role:
     roles_collection = db.get_collection(collections.roles_collection)
-    await get_role_db(role_id=role_id, db=db)
-    await roles_collection.update_one(
-        {"_id": ObjectId(role_id)}, {"$set": role.model_dump()},
-    )
-    return await get_role_db(role_id=role_id, db=db)
+    try:
+        updated = await roles_collection.find_one_and_update(
+            {"_id": ObjectId(role_id)},
+            {"$set": role.model_dump(exclude_none=True)},
+            projection=projection_for(Role),
+            return_document=ReturnDocument.AFTER,
+        )
+    except DuplicateKeyError as ex:
+        raise ResourceConflictError(
+            resource_name="Role", resource_id=role.name, event="db.role.update_role",
+        ) from ex
+    _invalidate_roles(db, role_id)
+    if not updated:
+        raise ResourceNotFoundError(
+            resource_name="Role", resource_id=role_id, event="db.role.update_role",
+        )
+    return Role(**updated)
 
 
+@monitor
 async def delete_role_db(role_id: str, db: AsyncIOMotorDatabase) -> bool:
     roles_collection = db.get_collection(collections.roles_collection)
-    await roles_collection.delete_one({"_id": ObjectId(role_id)})
+    result = await roles_collection.delete_one({"_id": ObjectId(role_id)})
+    _invalidate_roles(db, role_id)
+    if not result.deleted_count:
+        raise ResourceNotFoundError(
+            resource_name="Role", resource_id=role_id, event="db.role.delete_role",
+        )
     return True
+
+
+@monitor
+async def get_existing_role_ids_db(
+    role_ids: set[str], db: AsyncIOMotorDatabase,
+) -> set[str]:
+    """Return the subset of `role_ids` that exist, in a single `$in` query."""
+    roles_collection = db.get_collection(collections.roles_collection)
+    existing = await find_existing_ids(
+        roles_collection, [ObjectId(role_id) for role_id in role_ids],
+    )
+    return {str(role_id) for role_id in existing}
+
+
+@monitor
+async def create_roles_bulk_db(
+    roles: dict[int, Role], db: AsyncIOMotorDatabase,
+) -> list[BulkItemResult]:
+    roles_collection = db.get_collection(collections.roles_collection)
+    documents = {index: role.model_dump_mongo() for index, role in roles.items()}
+    results = await insert_many_chunked(roles_collection, documents)
+    _invalidate_roles(db, *[document["_id"] for document in documents.values()])
+    return results
+
+
+@monitor
+async def update_roles_bulk_db(
+    updates: dict[int, tuple[str, RoleUpdate]], db: AsyncIOMotorDatabase,
+) -> list[BulkItemResult]:
+    roles_collection = db.get_collection(collections.roles_collection)
+    results = await update_many_by_id(
+        roles_collection,
+        {
+            index: (
+                ObjectId(role_id), role.model_dump(exclude_none=True, exclude={"id"}),
+            )
+            for index, (role_id, role) in updates.items()
+        },
+    )
+    _invalidate_roles(db, *[role_id for role_id, _ in updates.values()])
+    return results
+
+
+@monitor
+async def delete_roles_bulk_db(
+    role_ids: list[str], db: AsyncIOMotorDatabase,
+) -> list[BulkItemResult]:
+    roles_collection = db.get_collection(collections.roles_collection)
+    results = await delete_many_by_id(
+        roles_collection, [ObjectId(role_id) for role_id in role_ids],
+    )
+    _invalidate_roles(db, *role_ids)
+    return results
@@ -1,40 +1,121 @@
+from collections.abc import AsyncIterator
+
 from bson import ObjectId
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
 
 from src.core.exceptions.resource import (
+    ResourceConflictError,
     ResourceInsertionFailedError,
     ResourceNotFoundError,
 )
 from src.core.logger.spans import monitor
+from src.db.cache import NOT_FOUND, user_cache
 from src.db.collections import collections
+from src.db.query.bulk import (
+    delete_many_by_id,
+    insert_many_chunked,
+    update_many_by_id,
+)
+from src.db.query.filters import created_at_query
+from src.db.query.loader import user_loader
+from src.db.query.pagination import ensure_small_collection, find_page
+from src.db.query.projection import projection_for
+from src.models.bulk import BulkItemResult
+from src.models.common import Page
 from src.models.user import User, UserIn, UserOut, UserUpdate
 
 
 @monitor
 async def get_all_users_db(db: AsyncIOMotorDatabase) -> list[User]:
     users_collection = db.get_collection(collections.users_collection)
+    await ensure_small_collection(users_collection)
     users = []
-    async for u in users_collection.find({}):
+    async for u in users_collection.find({}, projection_for(User)):
         users.append(u)
     return [User(**user) for user in users]
 
 
 @monitor
-async def get_user_by_username(username: str, db: AsyncIOMotorDatabase) -> UserOut:
+async def get_users_page_db(
+    db: AsyncIOMotorDatabase,
+    limit: int | None = None,
+    after: str | None = None,
+    include_total: bool = False,
+) -> Page[User]:
+    users_collection = db.get_collection(collections.users_collection)
+    return await find_page(
+        users_collection, User, limit=limit, after=after, include_total=include_total,
+    )
+
+
+def _invalidate_user(db: AsyncIOMotorDatabase, user_id: str) -> None:
+    # Drops the by-id entry and any by-username entry tagged with the same id
+    user_cache.invalidate_tag((db.name, str(user_id)))
+    user_loader.forget(db, ObjectId(user_id))
+
+
+async def stream_users_db(
+    db: AsyncIOMotorDatabase,
+    batch_size: int,
+    role_id: str | None = None,
+    created_after: str | None = None,
+    created_before: str | None = None,
+) -> AsyncIterator[User]:
+    """Yield users one at a time, holding at most one cursor batch in memory."""
+    query = created_at_query(created_after, created_before)
+    if role_id:
+        query["role_id"] = role_id
     users_collection = db.get_collection(collections.users_collection)
-    user = await users_collection.find_one({"username": username})
-    if not user:
+    cursor = users_collection.find(
+        query, projection=projection_for(User), batch_size=batch_size,
+    ).sort("_id", 1)
+    try:
+        async for user in cursor:
+            yield User(**user)
+    finally:
+        await cursor.close()
+
+
+@monitor
+async def get_user_by_username(username: str, db: AsyncIOMotorDatabase) -> UserOut:
+    key = (db.name, "username", username)
+    user = user_cache.get(key)
+    if user is None:
+        version = user_cache.version
+        users_collection = db.get_collection(collections.users_collection)
+        # The login path is the only reader of the password hash
+        user = await users_collection.find_one(
+            {"username": username}, projection_for(UserOut),
+        )
+        if user:
+            user = UserOut(**user)
+            user_cache.set(key, user, tags=[(db.name, user.id)], version=version)
+        else:
+            user_cache.set_missing(key, version=version)
+            user = NOT_FOUND
+    if user is NOT_FOUND:
         raise ResourceNotFoundError(
             resource_name="User", resource_id=username, event="db.user.find_user",
         )
-    return UserOut(**user)
+    return user
 
 
 @monitor
 async def get_user_db(user_id: str, db: AsyncIOMotorDatabase) -> User:
-    users_collection = db.get_collection(collections.users_collection)
-    user = await users_collection.find_one({"_id": ObjectId(user_id)})
-    if not user:
+    key = (db.name, "id", str(user_id))
+    user = user_cache.get(key)
+    if user is None:
+        version = user_cache.version
+        user = await user_loader.load(db, ObjectId(user_id))
+        if user:
+            user = User(**user)
+            user_cache.set(key, user, tags=[(db.name, str(user_id))], version=version)
+        else:
+            user_cache.set_missing(key, version=version)
+            user = NOT_FOUND
+    if user is NOT_FOUND:
         raise ResourceNotFoundError(
             resource_name="User", resource_id=user_id, event="db.user.find_user",
         )
@@ -44,12 +125,25 @@ async def get_user_db(user_id: str, db: AsyncIOMotorDatabase) -> User:
 @monitor
 async def create_user_db(user: UserIn, db: AsyncIOMotorDatabase) -> User:
     users_collection = db.get_collection(collections.users_collection)
-    result = await users_collection.insert_one(user.model_dump_mongo())
+    document = user.model_dump_mongo()
+    try:
+        result = await users_collection.insert_one(document)
+    except DuplicateKeyError as ex:
+        raise ResourceConflictError(
+            resource_name="User",
+            resource_id=user.username,
+            event="db.user.insert_user",
+        ) from ex
     if not result.inserted_id:
         raise ResourceInsertionFailedError(
             resource_name="User", resource_id=user.name, event="db.user.insert_user",
         )
-    return await get_user_db(result.inserted_id, db)
+    # Drop negative entries left by lookups that ran before the insert
+    user_cache.invalidate(
+        (db.name, "id", str(result.inserted_id)),
+        (db.name, "username", user.username),
+    )
+    return User(**document)
 
 
 @monitor
@@ -57,15 +151,74 @@ async def update_user_db(
     user_id: str, user: UserUpdate, db: AsyncIOMotorDatabase,
 ) -> User:
     users_collection = db.get_collection(collections.users_collection)
-    await get_user_db(user_id=user_id, db=db)
-    await users_collection.update_one(
-        {"_id": ObjectId(user_id)}, {"$set": user.model_dump()},
+    updated = await users_collection.find_one_and_update(
+        {"_id": ObjectId(user_id)},
+        {"$set": user.model_dump(exclude_none=True)},
+        projection=projection_for(User),
+        return_document=ReturnDocument.AFTER,
     )
-    return await get_user_db(user_id=user_id, db=db)
+    _invalidate_user(db, user_id)
+    if not updated:
+        raise ResourceNotFoundError(
+            resource_name="User", resource_id=user_id, event="db.user.update_user",
+        )
+    return User(**updated)
 
 
 @monitor
 async def delete_user_db(user_id: str, db: AsyncIOMotorDatabase) -> bool:
     users_collection = db.get_collection(collections.users_collection)
-    await users_collection.delete_one({"_id": ObjectId(user_id)})
+    result = await users_collection.delete_one({"_id": ObjectId(user_id)})
+    _invalidate_user(db, user_id)
+    if not result.deleted_count:
+        raise ResourceNotFoundError(
+            resource_name="User", resource_id=user_id, event="db.user.delete_user",
+        )
     return True
+
+
+@monitor
+async def create_users_bulk_db(
+    users: dict[int, UserIn], db: AsyncIOMotorDatabase,
+) -> list[BulkItemResult]:
+    users_collection = db.get_collection(collections.users_collection)
+    documents = {index: user.model_dump_mongo() for index, user in users.items()}
+    results = await insert_many_chunked(users_collection, documents)
+    for document in documents.values():
+        user_cache.invalidate(
+            (db.name, "id", str(document["_id"])),
+            (db.name, "username", document["username"]),
+        )
+    return results
+
+
+@monitor
+async def update_users_bulk_db(
+    updates: dict[int, tuple[str, UserUpdate]], db: AsyncIOMotorDatabase,
+) -> list[BulkItemResult]:
+    users_collection = db.get_collection(collections.users_collection)
+    results = await update_many_by_id(
+        users_collection,
+        {
+            index: (
+                ObjectId(user_id), user.model_dump(exclude_none=True, exclude={"id"}),
+            )
+            for index, (user_id, user) in updates.items()
+        },
+    )
+    for user_id, _ in updates.values():
+        _invalidate_user(db, user_id)
+    return results
+
+
+@monitor
+async def delete_users_bulk_db(
+    user_ids: list[str], db: AsyncIOMotorDatabase,
+) -> list[BulkItemResult]:
+    users_collection = db.get_collection(collections.users_collection)
+    results = await delete_many_by_id(
+        users_collection, [ObjectId(user_id) for user_id in user_ids],
+    )
+    for user_id in user_ids:
+        _invalidate_user(db, user_id)
+    return results
@@ -1,67 +1,127 @@
-import os
-import signal
+import tomllib
 from contextlib import asynccontextmanager
+from functools import cache
+from importlib import metadata
 from pathlib import Path
 from typing import Annotated
 
-import markdown
-import toml
 from fastapi import Depends, FastAPI, HTTPException, Request, status
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, Response
 from jwt import ExpiredSignatureError
-from motor.motor_asyncio import AsyncIOMotorClient
 from pydantic import ValidationError
 
 from src.config.settings import settings
 from src.core.exceptions.client_exception import ClientError
+from src.core.exceptions.service_exception import ServiceUnavailableError
 from src.core.exceptions.token_exception import TokenExceptionError
 from src.core.logger.context import request_id
-from src.core.logger.log import logger
+from src.core.logger.log import logger, start_logging, stop_logging
+from src.core.logger.tracing import shutdown_tracing
+from src.core.metrics.loop_lag import loop_lag_monitor, loop_watchdog
+from src.core.metrics.registry import mark_process_dead, render_metrics
+from src.core.middlewares.admission import AdmissionASGIMiddleware
+from src.core.middlewares.compression import (
+    CompressionASGIMiddleware,
+    compression_pool,
+)
+from src.core.middlewares.drain import DrainASGIMiddleware, drain_state
 from src.core.middlewares.logger import LoggingASGIMiddleware
+from src.core.middlewares.metrics import MetricsASGIMiddleware
 from src.core.security.get_current_user import get_current_user
+from src.core.security.password import password_hasher
+from src.core.utils.changelog import CachedMarkdown
+from src.core.utils.compression import accepts, parse_accept_encoding
+from src.core.utils.etag import conditional_response
+from src.core.utils.json import json_response_class
+from src.core.utils.warmup import warm_up
+from src.db.client import create_client, warm_pool
+from src.db.health import mongo_ping
+from src.db.indexes import ensure_indexes
 from src.models.token import TokenDecrypted
 from src.services.router import router
 
-toml_path = Path(__file__).parent.parent / "pyproject.toml"
 changelog_path = Path(__file__).parent.parent / "changelog.md"
-config = None
-
-logger.info(event="app.main.prepare", extra_str=f"toml path: {toml_path}")
-
-if toml_path.exists() and toml_path.is_file():
-    config = toml.load(toml_path)
+changelog_page = CachedMarkdown(
+    changelog_path,
+    check_interval=settings.CHANGELOG_CHECK_INTERVAL,
+)
+toml_path = Path(__file__).parent.parent / "pyproject.toml"
 
-app_version = "unknown"
 
-if config:
-    project = config.get("project", None)
-    app_version = "unknown" if not project else project.get("version", "unknown")
+@cache
+def get_app_version() -> str:
+    """Version of the installed package, else of the source tree."""
+    try:
+        return metadata.version("fastapi-template")
+    except metadata.PackageNotFoundError:
+        # Run from a checkout, uv does not install the project itself
+        if toml_path.is_file():
+            with toml_path.open("rb") as file:
+                return tomllib.load(file).get("project", {}).get("version", "unknown")
+        return "unknown"
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan for app."""
+    start_logging()
     # Connect to db
     try:
-        client = AsyncIOMotorClient(settings.MONGO_URI)
+        logger.info(
+            event="app.main.db",
+            env=settings.ENV,
+            db_name=settings.DB_NAME,
+        )
+        client = create_client()
         app.state.db = client.get_database(settings.DB_NAME)
         ping_response = await app.state.db.command("ping")
         if int(ping_response["ok"]) != 1:
             raise Exception("Problem connecting to database cluster.")
+        if settings.MONGO_ENSURE_INDEXES:
+            await ensure_indexes(app.state.db)
+        await warm_pool(app.state.db, settings.MONGO_MIN_POOL_SIZE)
+        await changelog_page.refresh()
+        warm_up(app)
+        loop_lag_monitor.start()
+        if settings.LOOP_WATCHDOG_ENABLED:
+            loop_watchdog.start()
+        mongo_ping.start(app.state.db)
+        drain_state.install(delay=settings.SHUTDOWN_DRAIN_DELAY)
         yield
+        drain_state.begin()
+        drained = await drain_state.wait_idle(settings.SERVER_GRACEFUL_SHUTDOWN)
+        logger.info(
+            event="app.drain.end",
+            drained=drained,
+            in_flight=drain_state.in_flight,
+        )
+        await mongo_ping.stop()
+        loop_watchdog.stop()
+        await loop_lag_monitor.stop()
+        password_hasher.shutdown()
+        compression_pool.shutdown()
         client.close()
     except Exception as ex:
         logger.error("Error in starting application !", error=str(ex))
+        # Fail the server startup instead of serving without a database
+        raise
     finally:
-        os.kill(os.getpid(), signal.SIGTERM)
+        drain_state.uninstall()
+        mark_process_dead()
+        shutdown_tracing()
+        stop_logging()
 
 
-app = FastAPI(lifespan=lifespan)
+app = FastAPI(lifespan=lifespan, default_response_class=json_response_class)
 
 origins = settings.get_origins()
 
+# Innermost so that CORS headers are added to the 503s it sends
+if settings.ADMISSION_ENABLED:
+    app.add_middleware(AdmissionASGIMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[str(i) for i in origins],
@@ -70,7 +130,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionASGIMiddleware)
 app.add_middleware(LoggingASGIMiddleware)
+app.add_middleware(MetricsASGIMiddleware)
+# Outermost so that every request counts while draining
+app.add_middleware(DrainASGIMiddleware)
 
 
 @app.exception_handler(HTTPException)
@@ -79,7 +144,7 @@ async def http_exception_handler(request: Request, exc: HTTPException) -> JSONRe
     origin = request.headers.get("origin")
     cors_origin = origin if origin in origins else ""
 
-    response = JSONResponse(
+    response = json_response_class(
         content={"detail": exc.detail, "trace_id": request_id.get()},
         status_code=exc.status_code,
     )
@@ -87,12 +152,57 @@ async def http_exception_handler(request: Request, exc: HTTPException) -> JSONRe
     return response
 
 
-@app.exception_handler(Exception)
-async def client_server_exception_handler(
-    request: Request,
-    exc: Exception,
-) -> JSONResponse:
+def error_response(exc: Exception, status_code: int) -> JSONResponse:
+    response = json_response_class(
+        content={"detail": str(exc), "trace_id": request_id.get()},
+        status_code=status_code,
+    )
+    if isinstance(exc, ServiceUnavailableError):
+        response.headers.append("Retry-After", str(exc.retry_after))
+    return response
+
+
+# Handlers of specific exception classes run in the ExceptionMiddleware, inside
+# the middleware stack, so their responses are logged, counted and get CORS
+# and compression. Only the `Exception` one runs outside of it.
+
+
+@app.exception_handler(ClientError)
+async def client_exception_handler(_: Request, exc: ClientError) -> JSONResponse:
     """Client exception handler."""
+    return error_response(exc, exc.status_code)
+
+
+@app.exception_handler(ValidationError)
+async def validation_exception_handler(
+    _: Request,
+    exc: ValidationError,
+) -> JSONResponse:
+    """Model validation exception handler."""
+    return error_response(exc, status.HTTP_422_UNPROCESSABLE_ENTITY)
+
+
+@app.exception_handler(ExpiredSignatureError)
+async def expired_token_handler(
+    _: Request,
+    exc: ExpiredSignatureError,
+) -> JSONResponse:
+    """Expired token handler."""
+    return error_response(exc, status.HTTP_403_FORBIDDEN)
+
+
+@app.exception_handler(TokenExceptionError)
+async def token_exception_handler(
+    _: Request,
+    exc: TokenExceptionError,
+) -> JSONResponse:
+    """Token exception handler."""
+    return error_response(exc, status.HTTP_401_UNAUTHORIZED)
+
+
+@app.exception_handler(Exception)
+async def server_exception_handler(request: Request, _: Exception) -> JSONResponse:
+    """Internal server error handler."""
     origin = request.headers.get("origin")
     if origins[0] == "*":
         cors_origin = origins[0]
@@ -101,37 +211,14 @@ async def client_server_exception_handler(
     else:
         cors_origin = ""
 
-    response = None
-    trace_id = request_id.get()
-    if isinstance(exc, ClientError):
-        response = JSONResponse(
-            content={"detail": str(exc), "trace_id": trace_id},
-            status_code=exc.status_code,
-        )
-    elif isinstance(exc, ValidationError):
-        response = JSONResponse(
-            content={"detail": str(exc), "trace_id": trace_id},
-            status_code=422,
-        )
-    elif isinstance(exc, ExpiredSignatureError):
-        response = JSONResponse(
-            content={"detail": str(exc), "trace_id": trace_id},
-            status_code=403,
-        )
-    elif isinstance(exc, TokenExceptionError):
-        response = JSONResponse(
-            content={"detail": str(exc), "trace_id": trace_id},
-            status_code=401,
-        )
-    else:
-        response = JSONResponse(
-            content={
-                "detail": "Internal server error",
-                "trace_id": trace_id,
-            },
-            status_code=500,
-        )
-
+    response = json_response_class(
+        content={
+            "detail": "Internal server error",
+            "trace_id": request_id.get(),
+        },
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+    )
+    # Sent from outside the middleware stack, the CORS middleware misses it
     response.headers.append("Access-Control-Allow-Origin", cors_origin)
     return response
 
@@ -146,7 +233,7 @@ async def request_validation_handler(
         {"field": err.get("loc"), "message": err.get("msg")} for err in exc.errors()
     ]
     logger.warning(event="app.main.request_validation_error", error=errors)
-    return JSONResponse(
+    return json_response_class(
         content={
             "detail": exc.errors(),
             "trace_id": request_id.get(),
@@ -167,13 +254,38 @@ async def root() -> dict:
 @app.get("/version")
 async def version() -> dict:
     """Return version of application."""
-    return {"version": app_version}
+    return {"version": get_app_version()}
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    """Prometheus scrape endpoint."""
+    data, content_type = render_metrics()
+    return Response(content=data, media_type=content_type)
 
 
 @app.get("/changelog", response_class=HTMLResponse)
-async def changelog(_: Annotated[TokenDecrypted, Depends(get_current_user)]) -> str:
+async def changelog(
+    request: Request,
+    _: Annotated[TokenDecrypted, Depends(get_current_user)],
+) -> Response:
     """Return changelog of application."""
-    data = ""
-    with Path.open(changelog_path) as f:
-        data = f.read()
-    return markdown.markdown(data)
+    page = await changelog_page.get()
+    if page is None:
+        raise HTTPException(status_code=404, detail="Changelog not found")
+    codings = parse_accept_encoding(request.headers.get("accept-encoding"))
+    coding = next(
+        (c for c in ("br", "gzip") if c in page.variants and accepts(codings, c)),
+        "identity",
+    )
+    etag, body = page.variant(coding)
+    headers = {"Vary": "Accept-Encoding"}
+    if coding != "identity":
+        headers["Content-Encoding"] = coding
+    return conditional_response(
+        request,
+        etag,
+        lambda: body,
+        media_type="text/html; charset=utf-8",
+        headers=headers,
+    )
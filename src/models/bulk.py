@@ -0,0 +1,33 @@
+from typing import Annotated
+
+from pydantic import BaseModel, Field
+
+from src.config.settings import settings
+
+ObjectIdStr = Annotated[str, Field(pattern=r"^[0-9a-f]{24}$")]
+
+
+class BulkDelete(BaseModel):
+    ids: list[ObjectIdStr] = Field(
+        description="Ids of the entities to delete",
+        max_length=settings.BULK_MAX_ITEMS,
+    )
+
+
+class BulkItemResult(BaseModel):
+    index: int = Field(description="Position of the item in the request")
+    id: str | None = Field(description="Mongodb entity id", default=None)
+    status_code: int
+    error: str | None = None
+
+
+class BulkResult(BaseModel):
+    succeeded: int
+    failed: int
+    results: list[BulkItemResult]
+
+    @classmethod
+    def from_items(cls, items: list[BulkItemResult]) -> "BulkResult":
+        items = sorted(items, key=lambda item: item.index)
+        failed = sum(1 for item in items if item.error is not None)
+        return cls(succeeded=len(items) - failed, failed=failed, results=items)
@@ -1,19 +1,31 @@
+from typing import Generic, TypeVar
 
 from bson import ObjectId
-from pydantic import BaseModel, model_validator
+from pydantic import BaseModel, Field, model_validator
 
 from src.core.utils.time import get_utc_now
 
+T = TypeVar("T")
+
 
 class CreatedAtProps(BaseModel):
     created_by: str | None = None
-    created_at: str = get_utc_now()
+    created_at: str = Field(default_factory=get_utc_now)
+    # Written by updates, entity ETags derive from it
+    updated_at: str | None = None
 
 
 class UpdatedAtProps(BaseModel):
-    updated_at: str = get_utc_now()
+    # Stamped by the server, a value sent by the client (eg. null from a
+    # round-tripped entity) is replaced
+    updated_at: str | None = None
     updated_by: str | None = None
 
+    @model_validator(mode="after")
+    def stamp_updated_at(self) -> "UpdatedAtProps":
+        self.updated_at = get_utc_now()
+        return self
+
 
 class CommonMethods(BaseModel):
     def model_dump_mongo(self) -> dict:
@@ -33,3 +45,13 @@ class CommonMethods(BaseModel):
 
 class StatusResponse(BaseModel):
     status: str = "Running"
+
+
+class Page(BaseModel, Generic[T]):
+    items: list[T]
+    next_cursor: str | None = Field(
+        description="Pass as `after` to fetch the next page", default=None,
+    )
+    estimated_total: int | None = Field(
+        description="Estimated collection size", default=None,
+    )
@@ -38,3 +38,7 @@ class Role(CreatedAtProps, CommonMethods):
 class RoleUpdate(UpdatedAtProps):
     name: str | None = Field(description="Role name", default=None)
     permissions: list[str] | None = Field(description="Permissions", default=None)
+
+
+class RoleBulkUpdate(RoleUpdate):
+    id: str = Field(description="Mongodb entity id", pattern=r"^[0-9a-f]{24}$")
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 from src.models.user import User
 
@@ -12,6 +12,9 @@ class Token(BaseModel):
 
 
 class TokenDecrypted(BaseModel):
+    # Instances are shared between requests by the token cache
+    model_config = ConfigDict(frozen=True)
+
     sub: str
     scopes: list[str]
     user_id: str
@@ -1,6 +1,5 @@
 from typing import Annotated
 
-import bcrypt
 from pydantic import (
     BeforeValidator,
     Field,
@@ -9,6 +8,7 @@ from pydantic import (
     field_validator,
 )
 
+from src.core.security.password import password_hasher
 from src.models.common import CommonMethods, CreatedAtProps, UpdatedAtProps
 
 PyObjectId = Annotated[str, BeforeValidator(str)]
@@ -33,10 +33,17 @@ class UserIn(User):
     @field_validator("password")
     @classmethod
     def hash_password(cls, password: SecretStr) -> SecretStr:
-        return SecretStr(
-            bcrypt.hashpw(
-                password.get_secret_value().encode("utf-8"), bcrypt.gensalt(),
-            ).decode("utf-8"),
+        return SecretStr(password_hasher.hash_sync(password.get_secret_value()))
+
+
+class UserCreate(User):
+    password: SecretStr = Field(description="User password")
+
+    async def to_user_in(self) -> UserIn:
+        """Hash the password on the worker pool and build the insert model."""
+        hashed = await password_hasher.hash(self.password.get_secret_value())
+        return UserIn.model_construct(
+            **self.model_dump(exclude={"password"}), password=SecretStr(hashed),
         )
 
 
@@ -45,12 +52,20 @@ class UserOut(User):
     password: SecretStr = Field(description="User password")
 
     def verify_password(self, plain_password: str) -> bool:
-        return bcrypt.checkpw(
-            plain_password.encode("utf-8"),
-            self.password.get_secret_value().encode("utf-8"),
+        return password_hasher.verify_sync(
+            plain_password, self.password.get_secret_value(),
+        )
+
+    async def verify_password_async(self, plain_password: str) -> bool:
+        return await password_hasher.verify(
+            plain_password, self.password.get_secret_value(),
         )
 
 
 class UserUpdate(UpdatedAtProps):
     name: str | None = None
     role_id: str | None = None
+
+
+class UserBulkUpdate(UserUpdate):
+    id: str = Field(description="Mongodb entity id", pattern=r"^[0-9a-f]{24}$")
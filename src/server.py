@@ -0,0 +1,86 @@
+"""Production server: `python -m src.server`.
+
+Runs ``SERVER_WORKERS`` uvicorn worker processes, the CPU count by default,
+on uvloop and httptools when they are installed. Workers are spawned, not
+forked, so each one imports the app fresh and opens its own Motor client in
+the lifespan. Caches stay local to their worker.
+"""
+
+import importlib.util
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import uvicorn
+
+from src.config.settings import settings
+
+
+def worker_count() -> int:
+    return settings.SERVER_WORKERS or os.cpu_count() or 1
+
+
+def event_loop() -> str:
+    return "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+
+
+def http_protocol() -> str:
+    return "httptools" if importlib.util.find_spec("httptools") else "h11"
+
+
+def check_shared_secret(workers: int) -> None:
+    """Tokens issued by one worker must verify in the others."""
+    if workers > 1 and "JWT_SECRET" not in settings.model_fields_set:
+        message = "JWT_SECRET must be set to run several workers"
+        raise SystemExit(message)
+
+
+def prepare_metrics_dir(workers: int) -> Path | None:
+    """Give the workers a directory without samples to aggregate metrics in.
+
+    Returns the temporary directory created when PROMETHEUS_MULTIPROC_DIR is
+    not set, for the caller to remove.
+    """
+    if workers == 1:
+        return None
+    path = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if path is None:
+        path = os.environ["PROMETHEUS_MULTIPROC_DIR"] = tempfile.mkdtemp(
+            prefix="prometheus-",
+        )
+        return Path(path)
+    directory = Path(path)
+    directory.mkdir(parents=True, exist_ok=True)
+    # Samples of a previous run would be added to the new ones, only the
+    # sample files are removed, the directory may hold anything else
+    for samples in directory.glob("*.db"):
+        samples.unlink(missing_ok=True)
+    return None
+
+
+def main() -> None:
+    workers = worker_count()
+    check_shared_secret(workers)
+    metrics_dir = prepare_metrics_dir(workers)
+    try:
+        uvicorn.run(
+            "src.main:app",
+            host=settings.SERVER_HOST,
+            port=settings.SERVER_PORT,
+            workers=workers,
+            loop=event_loop(),
+            http=http_protocol(),
+            backlog=settings.SERVER_BACKLOG,
+            timeout_graceful_shutdown=settings.SERVER_GRACEFUL_SHUTDOWN,
+            proxy_headers=True,
+            server_header=False,
+            access_log=False,
+        )
+    finally:
+        if metrics_dir is not None:
+            shutil.rmtree(metrics_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
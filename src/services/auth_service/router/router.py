@@ -1,4 +1,4 @@
-from datetime import timedelta
+from datetime import UTC, datetime, timedelta
 from typing import Annotated
 
 import jwt
@@ -8,7 +8,6 @@ from fastapi.security import OAuth2PasswordRequestForm
 
 from src.config.settings import settings
 from src.core.logger.log import logger
-from src.core.utils.time import get_utc_now
 from src.db.query.roles import get_role_db
 from src.db.query.users import get_user_by_username
 from src.models.login import Login
@@ -27,7 +26,7 @@ def create_token(user: User, role: Role) -> str:
         role_id=str(role.id),
         scopes=scopes,
         user_id=str(user.id),
-        exp=get_utc_now() + timedelta(minutes=settings.TOKEN_EXPIRY_PERIOD),
+        exp=datetime.now(UTC) + timedelta(minutes=settings.TOKEN_EXPIRY_PERIOD),
     )
     return jwt.encode(
         user_token.model_dump(),
@@ -44,7 +43,7 @@ async def login(formdata: Login, request: Request) -> Token:
     # check user password
 
     logger.info("auth.login.check_password")
-    if not user.verify_password(formdata.password):
+    if not await user.verify_password_async(formdata.password):
         raise HTTPException(status_code=401, detail="Username or password incorrect !")
     # get the role
 
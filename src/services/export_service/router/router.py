@@ -0,0 +1,111 @@
+from collections.abc import AsyncIterator
+from datetime import UTC, datetime
+from typing import Annotated
+
+from fastapi import APIRouter, Query, Request, Security
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from src.config.model_permissions import Role as RolePermissions
+from src.config.model_permissions import User as UserPermissions
+from src.config.settings import settings
+from src.core.logger.log import logger
+from src.core.security.get_current_user import get_current_user
+from src.db.query.roles import stream_roles_db
+from src.db.query.users import stream_users_db
+from src.models.token import TokenDecrypted
+
+router = APIRouter()
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+BatchSize = Annotated[
+    int,
+    Query(ge=1, le=settings.EXPORT_BATCH_SIZE_MAX, description="Cursor batch size"),
+]
+
+
+def to_utc_iso(value: datetime | None) -> str | None:
+    """Match the format `created_at` is stored in."""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+    return value.astimezone(UTC).isoformat()
+
+
+async def ndjson_lines(
+    request: Request,
+    items: AsyncIterator[BaseModel],
+    batch_size: int,
+) -> AsyncIterator[str]:
+    """Serialize items as NDJSON, one chunk per cursor batch."""
+    lines = []
+    async for item in items:
+        lines.append(item.model_dump_json(by_alias=True))
+        if len(lines) >= batch_size:
+            yield "\n".join(lines) + "\n"
+            lines = []
+            if await request.is_disconnected():
+                logger.info("router.export.client_disconnected")
+                break
+    if lines:
+        yield "\n".join(lines) + "\n"
+    # Closes the db cursor when the loop stopped early
+    await items.aclose()
+
+
+@router.get("/users", response_class=StreamingResponse)
+async def export_users(
+    request: Request,
+    _: Annotated[
+        TokenDecrypted,
+        Security(
+            get_current_user,
+            scopes=[UserPermissions.permissions().read],
+        ),
+    ],
+    role_id: Annotated[str | None, Query(pattern=r"^[0-9a-f]{24}$")] = None,
+    created_after: datetime | None = None,
+    created_before: datetime | None = None,
+    batch_size: BatchSize = settings.EXPORT_BATCH_SIZE,
+) -> StreamingResponse:
+    logger.info("router.export.export_users")
+    users = stream_users_db(
+        db=request.app.state.db,
+        batch_size=batch_size,
+        role_id=role_id,
+        created_after=to_utc_iso(created_after),
+        created_before=to_utc_iso(created_before),
+    )
+    return StreamingResponse(
+        ndjson_lines(request, users, batch_size),
+        media_type=NDJSON_MEDIA_TYPE,
+    )
+
+
+@router.get("/roles", response_class=StreamingResponse)
+async def export_roles(
+    request: Request,
+    _: Annotated[
+        TokenDecrypted,
+        Security(
+            get_current_user,
+            scopes=[RolePermissions.permissions().read],
+        ),
+    ],
+    created_after: datetime | None = None,
+    created_before: datetime | None = None,
+    batch_size: BatchSize = settings.EXPORT_BATCH_SIZE,
+) -> StreamingResponse:
+    logger.info("router.export.export_roles")
+    roles = stream_roles_db(
+        db=request.app.state.db,
+        batch_size=batch_size,
+        created_after=to_utc_iso(created_after),
+        created_before=to_utc_iso(created_before),
+    )
+    return StreamingResponse(
+        ndjson_lines(request, roles, batch_size),
+        media_type=NDJSON_MEDIA_TYPE,
+    )
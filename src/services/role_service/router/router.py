@@ -1,19 +1,26 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Path, Request, Security
+from fastapi import APIRouter, Body, Path, Query, Request, Security
 
 from src.config.model_permissions import Role as RolePermissions
+from src.config.settings import settings
 from src.core.logger.log import logger
 from src.core.security.get_current_user import get_current_user
+from src.core.utils.etag import content_response, dump_json, entity_response
 from src.db.query.roles import (
     create_role_db,
+    create_roles_bulk_db,
     delete_role_db,
+    delete_roles_bulk_db,
     get_role_db,
     get_roles_db,
+    get_roles_page_db,
     update_role_db,
+    update_roles_bulk_db,
 )
-from src.models.common import StatusResponse
-from src.models.role import Role, RoleUpdate
+from src.models.bulk import BulkDelete, BulkResult
+from src.models.common import Page, StatusResponse
+from src.models.role import Role, RoleBulkUpdate, RoleUpdate
 from src.models.token import TokenDecrypted
 
 router = APIRouter()
@@ -25,9 +32,24 @@ async def get_all_roles(
     _: Annotated[TokenDecrypted, Security(
         get_current_user, scopes=[RolePermissions.permissions().read],
     )],
-) -> list[Role]:
+    limit: Annotated[int | None, Query(ge=1, description="Page size")] = None,
+    after: Annotated[str | None, Query(description="Cursor of the last page")] = None,
+    include_total: Annotated[bool, Query()] = False,
+    paginate: Annotated[
+        bool, Query(description="Set false to list a small collection at once"),
+    ] = True,
+) -> Page[Role] | list[Role]:
     logger.info("router.role.get_all_roles")
-    return await get_roles_db(db=request.app.state.db)
+    if not paginate:
+        roles = await get_roles_db(db=request.app.state.db)
+        return content_response(request, dump_json(roles, list[Role]))
+    page = await get_roles_page_db(
+        db=request.app.state.db,
+        limit=limit,
+        after=after,
+        include_total=include_total,
+    )
+    return content_response(request, dump_json(page, Page[Role]))
 
 
 @router.get("/my-role")
@@ -38,7 +60,8 @@ async def get_my_role(
     )],
 ) -> Role:
     logger.info("router.role.get_my_role")
-    return await get_role_db(role_id=user.role_id, db=request.app.state.db)
+    role = await get_role_db(role_id=user.role_id, db=request.app.state.db)
+    return entity_response(request, role)
 
 
 @router.get("/{role_id}")
@@ -50,7 +73,57 @@ async def get_role(
     )],
 ) -> Role:
     logger.info("router.role.get_role_by_id")
-    return await get_role_db(role_id=role_id, db=request.app.state.db)
+    role = await get_role_db(role_id=role_id, db=request.app.state.db)
+    return entity_response(request, role)
+
+
+@router.post("/bulk")
+async def create_roles_bulk(
+    roles: Annotated[list[Role], Body(max_length=settings.BULK_MAX_ITEMS)],
+    request: Request,
+    current_user: Annotated[TokenDecrypted, Security(
+        get_current_user, scopes=[RolePermissions.permissions().write],
+    )],
+) -> BulkResult:
+    logger.info("router.role.create_roles_bulk", extra_str=f"items: {len(roles)}")
+    for role in roles:
+        role.created_by = current_user.sub
+    results = await create_roles_bulk_db(
+        dict(enumerate(roles)), db=request.app.state.db,
+    )
+    return BulkResult.from_items(results)
+
+
+@router.patch("/bulk")
+async def update_roles_bulk(
+    roles: Annotated[list[RoleBulkUpdate], Body(max_length=settings.BULK_MAX_ITEMS)],
+    request: Request,
+    current_user: Annotated[TokenDecrypted, Security(
+        get_current_user, scopes=[RolePermissions.permissions().write],
+    )],
+) -> BulkResult:
+    logger.info("router.role.update_roles_bulk", extra_str=f"items: {len(roles)}")
+    for role in roles:
+        role.updated_by = current_user.sub
+    results = await update_roles_bulk_db(
+        {index: (role.id, role) for index, role in enumerate(roles)},
+        db=request.app.state.db,
+    )
+    return BulkResult.from_items(results)
+
+
+@router.post("/bulk/delete")
+async def delete_roles_bulk(
+    roles: BulkDelete,
+    request: Request,
+    _: Annotated[TokenDecrypted, Security(
+        get_current_user, scopes=[RolePermissions.permissions().write],
+    )],
+) -> BulkResult:
+    logger.info("router.role.delete_roles_bulk", extra_str=f"items: {len(roles.ids)}")
+    results = await delete_roles_bulk_db(roles.ids, db=request.app.state.db)
+    return BulkResult.from_items(results)
+
 
 @router.post("", status_code=201)
 async def create_role(
@@ -1,7 +1,10 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Response, status
 
+from src.core.middlewares.drain import drain_state
+from src.db.health import mongo_ping
 from src.models.common import StatusResponse
 from src.services.auth_service.router.router import router as auth_router
+from src.services.export_service.router.router import router as export_router
 from src.services.role_service.router.router import router as role_router
 from src.services.user_service.router.router import router as user_router
 
@@ -10,8 +13,27 @@ router = APIRouter()
 router.include_router(auth_router, prefix="/auth", tags=["Auth"])
 router.include_router(user_router, prefix="/users", tags=["User"])
 router.include_router(role_router, prefix="/roles", tags=["Role"])
+router.include_router(export_router, prefix="/export", tags=["Export"])
 
 
 @router.get("/health", response_model=StatusResponse)
 async def health_test():
-    return StatusResponse
+    return StatusResponse()
+
+
+@router.get("/health/live")
+async def liveness() -> StatusResponse:
+    """The process serves requests, checks nothing else."""
+    return StatusResponse()
+
+
+@router.get("/health/ready")
+async def readiness(response: Response) -> StatusResponse:
+    """Whether to route traffic here, from the last background Mongo ping."""
+    if drain_state.draining:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        return StatusResponse(status="Draining")
+    if not mongo_ping.healthy:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        return StatusResponse(status="Database unavailable")
+    return StatusResponse(status="Ready")
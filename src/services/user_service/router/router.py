@@ -1,21 +1,31 @@
+import asyncio
 from typing import Annotated
 
-from fastapi import APIRouter, Path, Request, Security
+from fastapi import APIRouter, Body, Path, Query, Request, Security
 
 from src.config.model_permissions import User as UserPermissions
+from src.config.settings import settings
+from src.core.exceptions.service_exception import ServiceUnavailableError
 from src.core.logger.log import logger
 from src.core.security.get_current_user import get_current_user
-from src.db.query.roles import get_role_db
+from src.core.security.password import password_hasher
+from src.core.utils.etag import content_response, dump_json, entity_response
+from src.db.query.roles import get_existing_role_ids_db, get_role_db
 from src.db.query.users import (
     create_user_db,
+    create_users_bulk_db,
     delete_user_db,
+    delete_users_bulk_db,
     get_all_users_db,
     get_user_db,
+    get_users_page_db,
     update_user_db,
+    update_users_bulk_db,
 )
-from src.models.common import StatusResponse
+from src.models.bulk import BulkDelete, BulkItemResult, BulkResult
+from src.models.common import Page, StatusResponse
 from src.models.token import TokenDecrypted
-from src.models.user import User, UserIn, UserUpdate
+from src.models.user import User, UserBulkUpdate, UserCreate, UserIn, UserUpdate
 
 router = APIRouter()
 
@@ -26,9 +36,24 @@ async def get_all_users(
     _: Annotated[TokenDecrypted, Security(
         get_current_user, scopes=[UserPermissions.permissions().read],
     )],
-) -> list[User]:
+    limit: Annotated[int | None, Query(ge=1, description="Page size")] = None,
+    after: Annotated[str | None, Query(description="Cursor of the last page")] = None,
+    include_total: Annotated[bool, Query()] = False,
+    paginate: Annotated[
+        bool, Query(description="Set false to list a small collection at once"),
+    ] = True,
+) -> Page[User] | list[User]:
     logger.info("router.user.get_all_user")
-    return await get_all_users_db(db=request.app.state.db)
+    if not paginate:
+        users = await get_all_users_db(db=request.app.state.db)
+        return content_response(request, dump_json(users, list[User]))
+    page = await get_users_page_db(
+        db=request.app.state.db,
+        limit=limit,
+        after=after,
+        include_total=include_total,
+    )
+    return content_response(request, dump_json(page, Page[User]))
 
 
 @router.get("/me")
@@ -39,7 +64,8 @@ async def get_me(
     )],
 ) -> User:
     logger.info("router.user.get_me")
-    return await get_user_db(user_id=current_user.user_id, db=request.app.state.db)
+    user = await get_user_db(user_id=current_user.user_id, db=request.app.state.db)
+    return entity_response(request, user)
 
 
 @router.get("/{user_id}")
@@ -51,12 +77,108 @@ async def get_user(
     )],
 ) -> User:
     logger.info("router.user.get_user_by_id")
-    return await get_user_db(user_id=user_id, db=request.app.state.db)
+    user = await get_user_db(user_id=user_id, db=request.app.state.db)
+    return entity_response(request, user)
+
+
+async def hash_users(
+    users: dict[int, UserCreate],
+) -> tuple[dict[int, UserIn], list[BulkItemResult]]:
+    """Hash passwords in parallel without taking more than the pool's workers."""
+    semaphore = asyncio.Semaphore(password_hasher.workers)
+
+    async def hash_user(user: UserCreate) -> UserIn:
+        async with semaphore:
+            return await user.to_user_in()
+
+    hashed = await asyncio.gather(
+        *[hash_user(user) for user in users.values()], return_exceptions=True,
+    )
+    users_in, errors = {}, []
+    for index, user in zip(users, hashed, strict=True):
+        if isinstance(user, ServiceUnavailableError):
+            errors.append(
+                BulkItemResult(
+                    index=index,
+                    id=users[index].id,
+                    status_code=user.status_code,
+                    error=str(user),
+                ),
+            )
+        elif isinstance(user, BaseException):
+            raise user
+        else:
+            users_in[index] = user
+    return users_in, errors
+
+
+@router.post("/bulk")
+async def create_users_bulk(
+    users: Annotated[list[UserCreate], Body(max_length=settings.BULK_MAX_ITEMS)],
+    request: Request,
+    current_user: Annotated[TokenDecrypted, Security(
+        get_current_user, scopes=[UserPermissions.permissions().write],
+    )],
+) -> BulkResult:
+    logger.info("router.user.create_users_bulk", extra_str=f"items: {len(users)}")
+    role_ids = await get_existing_role_ids_db(
+        {user.role_id for user in users}, request.app.state.db,
+    )
+    results, valid = [], {}
+    for index, user in enumerate(users):
+        if user.role_id not in role_ids:
+            results.append(
+                BulkItemResult(
+                    index=index,
+                    id=user.id,
+                    status_code=404,
+                    error=f"Resource Role - {user.role_id} not found!",
+                ),
+            )
+            continue
+        user.created_by = current_user.user_id
+        valid[index] = user
+
+    users_in, errors = await hash_users(valid)
+    results.extend(errors)
+    results.extend(await create_users_bulk_db(users_in, db=request.app.state.db))
+    return BulkResult.from_items(results)
+
+
+@router.patch("/bulk")
+async def update_users_bulk(
+    users: Annotated[list[UserBulkUpdate], Body(max_length=settings.BULK_MAX_ITEMS)],
+    request: Request,
+    current_user: Annotated[TokenDecrypted, Security(
+        get_current_user, scopes=[UserPermissions.permissions().write],
+    )],
+) -> BulkResult:
+    logger.info("router.user.update_users_bulk", extra_str=f"items: {len(users)}")
+    for user in users:
+        user.updated_by = current_user.sub
+    results = await update_users_bulk_db(
+        {index: (user.id, user) for index, user in enumerate(users)},
+        db=request.app.state.db,
+    )
+    return BulkResult.from_items(results)
+
+
+@router.post("/bulk/delete")
+async def delete_users_bulk(
+    users: BulkDelete,
+    request: Request,
+    _: Annotated[TokenDecrypted, Security(
+        get_current_user, scopes=[UserPermissions.permissions().write],
+    )],
+) -> BulkResult:
+    logger.info("router.user.delete_users_bulk", extra_str=f"items: {len(users.ids)}")
+    results = await delete_users_bulk_db(users.ids, db=request.app.state.db)
+    return BulkResult.from_items(results)
 
 
 @router.post("", status_code=201)
 async def create_user(
-    user: UserIn,
+    user: UserCreate,
     request: Request,
     current_user: Annotated[TokenDecrypted, Security(
         get_current_user, scopes=[UserPermissions.permissions().write],
@@ -65,7 +187,7 @@ async def create_user(
     logger.info("router.user.create_user")
     user.created_by = current_user.user_id
     await get_role_db(user.role_id, request.app.state.db)
-    return await create_user_db(user, db=request.app.state.db)
+    return await create_user_db(await user.to_user_in(), db=request.app.state.db)
 
 
 @router.patch("/{user_id}")
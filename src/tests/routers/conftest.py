@@ -7,6 +7,7 @@ from bson import ObjectId
 
 from src.models.token import TokenDecrypted
 from src.core.security.get_current_user import get_current_user
+from src.db.indexes import ensure_indexes
 from src.tests.utils.routers import get_role, get_user
 
 os.environ["ENV"] = "test"
@@ -85,6 +86,7 @@ def get_token_user(user: User, role: Role):
 @pytest.fixture(scope="session")
 async def client(db: AsyncIOMotorDatabase, user: User) -> AsyncIterator[AsyncClient]:
     role = await db.get_collection("roles").find_one({"_id": ObjectId(user.role_id)})
+    await ensure_indexes(db)
     app.state.db = db
     app.dependency_overrides[get_current_user] = get_token_user(user, Role(**role))
     async with AsyncClient(app=app, base_url="http://testserver") as client:
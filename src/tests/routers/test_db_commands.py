@@ -0,0 +1,99 @@
+# ruff: noqa: S101
+"""Count the Mongo commands each write endpoint sends."""
+
+import os
+from collections.abc import AsyncIterator
+
+import pytest
+from fastapi import status
+from httpx import AsyncClient
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from pymongo import monitoring
+
+from src.db.cache import role_cache, user_cache
+from src.main import app
+from src.models.role import Role
+from src.tests.utils.routers import get_role, get_user
+
+pytestmark = pytest.mark.anyio
+
+
+class CommandCounter(monitoring.CommandListener):
+    def __init__(self) -> None:
+        self.commands: list[str] = []
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        self.commands.append(event.command_name)
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        pass
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        pass
+
+    def take(self) -> list[str]:
+        commands, self.commands = self.commands, []
+        return commands
+
+
+@pytest.fixture
+async def counter(
+    client: AsyncClient,  # noqa: ARG001 - points app.state.db at the test db first
+    db: AsyncIOMotorDatabase,
+) -> AsyncIterator[CommandCounter]:
+    counter = CommandCounter()
+    counted_client = AsyncIOMotorClient(
+        os.environ.get("MONGO_URI", "mongodb://localhost:27017"),
+        event_listeners=[counter],
+    )
+    app.state.db = counted_client.get_database(db.name)
+    role_cache.clear()
+    user_cache.clear()
+    yield counter
+    app.state.db = db
+    counted_client.close()
+
+
+async def test_role_write_commands(client: AsyncClient, counter: CommandCounter):
+    role = get_role(name="Counted").model_dump()
+    response = await client.post("/roles", json=role)
+    assert response.status_code == status.HTTP_201_CREATED
+    assert counter.take() == ["insert"]
+
+    response = await client.patch(f"/roles/{role['id']}", json={"name": "Renamed"})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["name"] == "Renamed"
+    assert counter.take() == ["findAndModify"]
+
+    response = await client.delete(f"/roles/{role['id']}")
+    assert response.status_code == status.HTTP_200_OK
+    assert counter.take() == ["delete"]
+
+    response = await client.delete(f"/roles/{role['id']}")
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert counter.take() == ["delete"]
+
+
+async def test_user_write_commands(
+    client: AsyncClient,
+    counter: CommandCounter,
+    role: Role,
+):
+    user = get_user(role_id=str(role.id))
+    response = await client.post("/users", json=user.model_dump())
+    assert response.status_code == status.HTTP_201_CREATED
+    # Role validation and the insert
+    assert counter.take() == ["find", "insert"]
+
+    response = await client.patch(f"/users/{user.id}", json={"name": "Renamed"})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["name"] == "Renamed"
+    assert counter.take() == ["findAndModify"]
+
+    response = await client.delete(f"/users/{user.id}")
+    assert response.status_code == status.HTTP_200_OK
+    assert counter.take() == ["delete"]
+
+    response = await client.patch(f"/users/{user.id}", json={"name": "Gone"})
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert counter.take() == ["findAndModify"]
@@ -0,0 +1,36 @@
+# ruff: noqa: S101
+import json
+
+import pytest
+from fastapi import status
+from httpx import AsyncClient
+
+from src.models.role import Role
+from src.models.user import User
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_export_users(client: AsyncClient, user: User) -> None:
+    response = await client.get("/export/users", params={"batch_size": 1})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"] == "application/x-ndjson"
+    users = [json.loads(line) for line in response.text.splitlines()]
+    assert user.id in [u["_id"] for u in users]
+    assert all("password" not in u for u in users)
+
+
+async def test_export_users_filters(client: AsyncClient, role: Role) -> None:
+    response = await client.get(
+        "/export/users",
+        params={"role_id": role.id, "created_before": "2000-01-01T00:00:00"},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.text == ""
+
+
+async def test_export_roles(client: AsyncClient, role: Role) -> None:
+    response = await client.get("/export/roles")
+    assert response.status_code == status.HTTP_200_OK
+    roles = [json.loads(line) for line in response.text.splitlines()]
+    assert role.id in [r["_id"] for r in roles]
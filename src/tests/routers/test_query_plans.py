@@ -0,0 +1,151 @@
+# ruff: noqa: S101
+"""Explain every query of `src.db.query` and fail on collection scans."""
+
+import inspect
+import os
+from collections.abc import AsyncIterator
+
+import pytest
+from bson import ObjectId
+from httpx import AsyncClient
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+
+from src.db.cache import role_cache, user_cache
+from src.db.query import roles, users
+from src.models.role import Role, RoleUpdate
+from src.models.user import UserUpdate
+from src.tests.utils.explain import CommandRecorder, find_collscans
+from src.tests.utils.routers import get_role, get_user
+
+pytestmark = pytest.mark.anyio
+
+# Unpaginated reads of whole collections, bounded by UNPAGINATED_MAX
+FULL_SCANS = {"get_all_users_db", "get_roles_db"}
+# Inserts send no command a plan can be explained for
+INSERTS = {
+    "create_role_db",
+    "create_roles_bulk_db",
+    "create_user_db",
+    "create_users_bulk_db",
+}
+
+
+def query_functions() -> set[str]:
+    """Names of the public query functions of the query modules."""
+    return {
+        name
+        for module in (roles, users)
+        for name, function in vars(module).items()
+        if not name.startswith("_")
+        and getattr(function, "__module__", None) == module.__name__
+        and (
+            inspect.iscoroutinefunction(inspect.unwrap(function))
+            or inspect.isasyncgenfunction(inspect.unwrap(function))
+        )
+    }
+
+
+@pytest.fixture
+async def recorded(
+    client: AsyncClient,  # noqa: ARG001 - points app.state.db at the test db first
+    db: AsyncIOMotorDatabase,
+) -> AsyncIterator[tuple[AsyncIOMotorDatabase, CommandRecorder]]:
+    recorder = CommandRecorder()
+    recorded_client = AsyncIOMotorClient(
+        os.environ.get("MONGO_URI", "mongodb://localhost:27017"),
+        event_listeners=[recorder],
+    )
+    role_cache.clear()
+    user_cache.clear()
+    yield recorded_client.get_database(db.name), recorder
+    recorded_client.close()
+
+
+async def drain(iterator: AsyncIterator) -> None:
+    async for _ in iterator:
+        pass
+
+
+async def test_queries_use_indexes(
+    recorded: tuple[AsyncIOMotorDatabase, CommandRecorder],
+    role: Role,
+) -> None:
+    db, recorder = recorded
+    new_role = get_role(name=f"Plan {ObjectId()}")
+    new_user = get_user(role_id=new_role.id)
+    bulk_roles = [get_role(name=f"Plan {ObjectId()}") for _ in range(2)]
+    bulk_users = [get_user(role_id=new_role.id) for _ in range(2)]
+    after = str(ObjectId(role.id))
+
+    queries = {
+        "create_role_db": lambda: roles.create_role_db(new_role, db),
+        "create_user_db": lambda: users.create_user_db(new_user, db),
+        "create_roles_bulk_db": lambda: roles.create_roles_bulk_db(
+            dict(enumerate(bulk_roles)),
+            db,
+        ),
+        "create_users_bulk_db": lambda: users.create_users_bulk_db(
+            dict(enumerate(bulk_users)),
+            db,
+        ),
+        "get_roles_db": lambda: roles.get_roles_db(db),
+        "get_roles_page_db": lambda: roles.get_roles_page_db(db, after=after),
+        "stream_roles_db": lambda: drain(
+            roles.stream_roles_db(db, 10, created_after="2000-01-01"),
+        ),
+        "get_role_db": lambda: roles.get_role_db(new_role.id, db),
+        "update_role_db": lambda: roles.update_role_db(
+            new_role.id,
+            RoleUpdate(name=f"Plan {ObjectId()}"),
+            db,
+        ),
+        "get_existing_role_ids_db": lambda: roles.get_existing_role_ids_db(
+            {new_role.id},
+            db,
+        ),
+        "get_all_users_db": lambda: users.get_all_users_db(db),
+        "get_users_page_db": lambda: users.get_users_page_db(db, after=after),
+        "stream_users_db": lambda: drain(
+            users.stream_users_db(db, 10, role_id=new_role.id),
+        ),
+        "get_user_by_username": lambda: users.get_user_by_username(
+            new_user.username,
+            db,
+        ),
+        "get_user_db": lambda: users.get_user_db(new_user.id, db),
+        "update_user_db": lambda: users.update_user_db(
+            new_user.id,
+            UserUpdate(name="Plan"),
+            db,
+        ),
+        "update_users_bulk_db": lambda: users.update_users_bulk_db(
+            {0: (new_user.id, UserUpdate(name="Plan"))},
+            db,
+        ),
+        "update_roles_bulk_db": lambda: roles.update_roles_bulk_db(
+            {0: (bulk_roles[0].id, RoleUpdate(name=f"Plan {ObjectId()}"))},
+            db,
+        ),
+        "delete_users_bulk_db": lambda: users.delete_users_bulk_db(
+            [user.id for user in bulk_users],
+            db,
+        ),
+        "delete_roles_bulk_db": lambda: roles.delete_roles_bulk_db(
+            [role.id for role in bulk_roles],
+            db,
+        ),
+        "delete_user_db": lambda: users.delete_user_db(new_user.id, db),
+        "delete_role_db": lambda: roles.delete_role_db(new_role.id, db),
+    }
+    assert set(queries) == query_functions()
+
+    scans = {}
+    for name, query in queries.items():
+        recorder.take()
+        await query()
+        commands = recorder.take()
+        if name not in FULL_SCANS | INSERTS:
+            assert commands, f"{name} sent no explainable command"
+            scans[name] = await find_collscans(db, commands)
+
+    assert {name: found for name, found in scans.items() if found} == {}
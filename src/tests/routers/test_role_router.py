@@ -10,16 +10,36 @@ pytestmark = pytest.mark.anyio
 
 
 def get_role() -> dict:
-    role = Role(id=str(ObjectId()), name="Level 1", permissions=Permissions.read_only())
+    role = Role(
+        id=str(ObjectId()),
+        name=f"Level {ObjectId()}",
+        permissions=Permissions.read_only(),
+    )
     return {**role.model_dump(), "password": "test"}
 
 
 async def test_role_get_all(client: AsyncClient) -> None:
     response = await client.get("/roles")
     assert response.status_code == status.HTTP_200_OK
+    assert isinstance(response.json()["items"], list)
+
+    response = await client.get("/roles", params={"paginate": False})
+    assert response.status_code == status.HTTP_200_OK
     assert isinstance(response.json(), list)
 
 
+async def test_role_list_etag(client: AsyncClient) -> None:
+    response = await client.get("/roles")
+    etag = response.headers["etag"]
+    response = await client.get("/roles", headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    response = await client.post("/roles", json=get_role())
+    assert response.status_code == status.HTTP_201_CREATED
+    response = await client.get("/roles", headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_200_OK
+
+
 async def test_role_post(client: AsyncClient) -> None:
     role = get_role()
     response = await client.post("/roles", json=role)
@@ -32,7 +52,7 @@ async def test_role_update(client: AsyncClient) -> None:
     assert response.status_code == status.HTTP_201_CREATED
 
     role = Role(**role).model_dump(by_alias=True)
-    role["name"] = "Level 2"
+    role["name"] = f"Level {ObjectId()}"
     update = await client.patch(
         f"/roles/{role['_id']}",
         json=role,
@@ -47,4 +67,44 @@ async def test_role_delete(client: AsyncClient):
 
     response = await client.delete(f"/roles/{role['id']}")
     assert response.status_code == status.HTTP_200_OK
-    assert response.json() == {"status": True}
+    assert response.json() == {"status": "True"}
+
+
+async def test_role_bulk(client: AsyncClient) -> None:
+    roles = [get_role() for _ in range(3)]
+    response = await client.post("/roles/bulk", json=roles)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["succeeded"] == len(roles)
+
+    missing = str(ObjectId())
+    response = await client.patch(
+        "/roles/bulk",
+        json=[{"id": role["id"], "name": f"Bulk {role['id']}"} for role in roles]
+        + [{"id": missing, "name": "Missing"}],
+    )
+    assert response.status_code == status.HTTP_200_OK
+    result = response.json()
+    assert result["failed"] == 1
+    assert result["results"][-1]["status_code"] == status.HTTP_404_NOT_FOUND
+
+    # A repeated id is reported once, a missing one as not found
+    response = await client.post(
+        "/roles/bulk/delete",
+        json={"ids": [role["id"] for role in roles] + [roles[0]["id"], missing]},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    result = response.json()
+    assert result["succeeded"] == len(roles)
+    assert result["failed"] == 1
+    assert [item["index"] for item in result["results"]] == [0, 1, 2, 4]
+    assert result["results"][-1]["status_code"] == status.HTTP_404_NOT_FOUND
+
+
+async def test_role_name_is_unique(client: AsyncClient) -> None:
+    role = get_role()
+    response = await client.post("/roles", json=role)
+    assert response.status_code == status.HTTP_201_CREATED
+
+    duplicate = {**get_role(), "name": role["name"]}
+    response = await client.post("/roles", json=duplicate)
+    assert response.status_code == status.HTTP_409_CONFLICT
@@ -1,18 +1,70 @@
 #ruff: noqa: S101
 import pytest
+from bson import ObjectId
 from fastapi import status
 from httpx import AsyncClient
 
 from src.models.role import Role
+from src.models.user import User
 from src.tests.utils.routers import get_user
 
 pytestmark = pytest.mark.anyio
 
+PAGE_SIZE = 2
+
 
 async def test_user_get_all(client: AsyncClient) -> None:
     response = await client.get("/users")
     assert response.status_code == status.HTTP_200_OK
-    assert isinstance(response.json(), list)
+    assert isinstance(response.json()["items"], list)
+
+
+async def test_user_get_all_pages(client: AsyncClient, role: Role) -> None:
+    for _ in range(3):
+        user = get_user(role_id=str(role.id))
+        response = await client.post("/users", json=user.model_dump())
+        assert response.status_code == status.HTTP_201_CREATED
+
+    ids, cursor = [], None
+    while True:
+        params = {"limit": PAGE_SIZE}
+        if cursor:
+            params["after"] = cursor
+        response = await client.get("/users", params=params)
+        assert response.status_code == status.HTTP_200_OK
+        page = response.json()
+        assert len(page["items"]) <= PAGE_SIZE
+        ids.extend(item["_id"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+    assert ids == sorted(ids)
+    assert len(ids) == len(set(ids))
+
+    response = await client.get("/users", params={"paginate": False})
+    assert response.status_code == status.HTTP_200_OK
+    assert [user["_id"] for user in response.json()] == ids
+
+
+async def test_user_get_all_invalid_cursor(client: AsyncClient) -> None:
+    response = await client.get("/users", params={"after": "not-a-cursor"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+async def test_user_me_etag(client: AsyncClient, user: User) -> None:
+    response = await client.get("/users/me")
+    assert response.status_code == status.HTTP_200_OK
+    etag = response.headers["etag"]
+
+    response = await client.get("/users/me", headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.content == b""
+
+    response = await client.patch(f"/users/{user.id}", json={"name": "ETag"})
+    assert response.status_code == status.HTTP_200_OK
+    response = await client.get("/users/me", headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["etag"] != etag
 
 
 async def test_user_post(client: AsyncClient, role: Role) -> None:
@@ -22,6 +74,17 @@ async def test_user_post(client: AsyncClient, role: Role) -> None:
     assert response.json()
 
 
+async def test_user_username_is_unique(client: AsyncClient, role: Role) -> None:
+    user = get_user(role_id=str(role.id))
+    response = await client.post("/users", json=user.model_dump())
+    assert response.status_code == status.HTTP_201_CREATED
+
+    duplicate = get_user(role_id=str(role.id)).model_dump()
+    duplicate["username"] = user.username
+    response = await client.post("/users", json=duplicate)
+    assert response.status_code == status.HTTP_409_CONFLICT
+
+
 async def test_user_update(client: AsyncClient, role: Role) -> None:
     user = get_user(role_id=str(role.id))
     response = await client.post("/users", json=user.model_dump())
@@ -40,10 +103,34 @@ async def test_user_update(client: AsyncClient, role: Role) -> None:
 
 async def test_user_delete(client: AsyncClient, role: Role):
     user = get_user(role_id=str(role.id))
-    response = await client.post("/users", json=user.model_dump(by_alias=True))
+    response = await client.post("/users", json=user.model_dump())
     assert response.status_code == status.HTTP_201_CREATED
-    assert response.json()
+    user_id = response.json()["_id"]
+
+    response = await client.delete(f"/users/{user_id}")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {"status": "True"}
+
+    response = await client.delete(f"/users/{user_id}")
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+async def test_user_bulk(client: AsyncClient, role: Role) -> None:
+    users = [get_user(role_id=str(role.id)).model_dump() for _ in range(3)]
+    users[1]["role_id"] = str(ObjectId())
+    response = await client.post("/users/bulk", json=users)
+    assert response.status_code == status.HTTP_200_OK
+    result = response.json()
+    assert (result["succeeded"], result["failed"]) == (2, 1)
+    assert result["results"][1]["status_code"] == status.HTTP_404_NOT_FOUND
+
+    ids = [item["id"] for item in result["results"] if item["error"] is None]
+    response = await client.patch(
+        "/users/bulk", json=[{"id": user_id, "name": "Bulk"} for user_id in ids],
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["succeeded"] == len(ids)
 
-    response = await client.delete(f"/users/{user.id}")
+    response = await client.post("/users/bulk/delete", json={"ids": ids})
     assert response.status_code == status.HTTP_200_OK
-    assert response.json() == {"status": True}
+    assert response.json()["succeeded"] == len(ids)
@@ -0,0 +1,57 @@
+# ruff: noqa: S101
+import gzip
+import os
+from pathlib import Path
+
+import pytest
+
+from src.core.utils.changelog import CachedMarkdown
+from src.core.utils.compression import accepts, parse_accept_encoding
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture(scope="session")
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+async def test_renders_once_and_again_on_mtime_change(tmp_path: Path) -> None:
+    path = tmp_path / "changelog.md"
+    path.write_text("# One")
+    page = CachedMarkdown(path, check_interval=0)
+
+    first = await page.get()
+    assert first.variants["identity"] == b"<h1>One</h1>"
+    assert gzip.decompress(first.variants["gzip"]) == b"<h1>One</h1>"
+    assert await page.get() is first
+
+    path.write_text("# Two")
+    os.utime(path, (first.mtime + 10, first.mtime + 10))
+    second = await page.get()
+    assert second.variants["identity"] == b"<h1>Two</h1>"
+    assert second.variant("gzip")[0] != first.variant("gzip")[0]
+
+
+async def test_mtime_is_checked_at_most_once_per_interval(tmp_path: Path) -> None:
+    path = tmp_path / "changelog.md"
+    path.write_text("# One")
+    page = CachedMarkdown(path, check_interval=3600)
+    first = await page.refresh()
+
+    path.write_text("# Two")
+    os.utime(path, (first.mtime + 10, first.mtime + 10))
+    assert await page.get() is first
+
+
+async def test_missing_file_is_not_served(tmp_path: Path) -> None:
+    page = CachedMarkdown(tmp_path / "missing.md", check_interval=0)
+    assert await page.get() is None
+
+
+def test_accept_encoding_quality_values() -> None:
+    codings = parse_accept_encoding("gzip;q=0.5, br;q=0, *;q=0.1")
+    assert accepts(codings, "gzip")
+    assert not accepts(codings, "br")
+    assert accepts(codings, "zstd")
+    assert not accepts(parse_accept_encoding(None), "gzip")
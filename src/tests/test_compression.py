@@ -0,0 +1,134 @@
+# ruff: noqa: S101
+import gzip
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from httpx import ASGITransport, AsyncClient
+
+from src.core.middlewares.compression import CompressionASGIMiddleware
+from src.core.utils.compression import (
+    brotli_codec,
+    gzip_codec,
+    select_codec,
+    zstd_codec,
+)
+
+pytestmark = pytest.mark.anyio
+
+STREAM_LINES = 100
+BODY = b'{"items": [' + b",".join(b'{"name": "user"}' for _ in range(500)) + b"]}"
+
+
+@pytest.fixture(scope="session")
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/large")
+    async def large() -> Response:
+        return Response(BODY, media_type="application/json", headers={"ETag": '"v1"'})
+
+    @app.get("/small")
+    async def small() -> Response:
+        return Response(b'{"a": 1}', media_type="application/json")
+
+    @app.get("/encoded")
+    async def encoded() -> Response:
+        return Response(
+            gzip.compress(BODY),
+            media_type="application/json",
+            headers={"Content-Encoding": "gzip"},
+        )
+
+    @app.get("/text")
+    async def text() -> PlainTextResponse:
+        return PlainTextResponse("x" * 4096)
+
+    @app.get("/stream")
+    async def stream() -> StreamingResponse:
+        async def lines():
+            for i in range(STREAM_LINES):
+                yield f'{{"n": {i}}}\n'.encode()
+
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    app.add_middleware(CompressionASGIMiddleware, codecs=[gzip_codec(6)])
+    return app
+
+
+@pytest.fixture
+async def client() -> AsyncClient:
+    transport = ASGITransport(app=build_app())
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+
+async def test_large_body_is_compressed(client: AsyncClient) -> None:
+    response = await client.get("/large", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert int(response.headers["content-length"]) < len(BODY)
+    assert response.headers["etag"] == 'W/"v1"'
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert response.content == BODY
+
+
+async def test_uncompressed_cases(client: AsyncClient) -> None:
+    response = await client.get("/large", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+    assert response.headers["etag"] == '"v1"'
+
+    response = await client.get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+
+    response = await client.get("/encoded", headers={"Accept-Encoding": "gzip"})
+    assert response.content == BODY  # decoded once, not compressed twice
+
+
+async def test_text_is_compressed(client: AsyncClient) -> None:
+    response = await client.get("/text", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.text == "x" * 4096
+
+
+async def test_stream_is_compressed_chunk_by_chunk(client: AsyncClient) -> None:
+    response = await client.get("/stream", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert len(response.text.splitlines()) == STREAM_LINES
+
+
+def test_codec_selection_follows_q_values() -> None:
+    codecs = [gzip_codec(6)]
+    assert select_codec("br, gzip;q=0.5", codecs).name == "gzip"
+    assert select_codec("gzip;q=0", codecs) is None
+    assert select_codec(None, codecs) is None
+
+
+def test_optional_codecs_round_trip() -> None:
+    brotli = pytest.importorskip("brotli")
+    zstandard = pytest.importorskip("zstandard")
+
+    br, zstd = brotli_codec(4), zstd_codec(3)
+    assert brotli.decompress(br.compress(BODY)) == BODY
+    stream = zstd.stream()
+    data = stream.compress(BODY[:100], final=False) + stream.compress(
+        BODY[100:],
+        final=True,
+    )
+    assert zstandard.ZstdDecompressor().decompressobj().decompress(data) == BODY
+    assert select_codec("gzip, br, zstd", [zstd, br]).name == "zstd"
+
+
+def test_zstd_compress_is_thread_safe() -> None:
+    zstandard = pytest.importorskip("zstandard")
+    codec = zstd_codec(3)
+    bodies = [BODY[:size] for size in range(1000, len(BODY), 7)]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        compressed = list(executor.map(codec.compress, bodies))
+    decompressor = zstandard.ZstdDecompressor()
+    assert [decompressor.decompress(data) for data in compressed] == bodies
@@ -0,0 +1,57 @@
+# ruff: noqa: S101
+from src.db.cache import NOT_FOUND, EntityCache
+
+
+def get_cache(**kwargs) -> EntityCache:
+    options = {"name": "test", "max_size": 2, "ttl": 60, "negative_ttl": 60}
+    return EntityCache(**{**options, **kwargs})
+
+
+def test_entity_cache_hit_and_negative_hit() -> None:
+    cache = get_cache()
+    assert cache.get("a") is None
+    cache.set("a", 1)
+    cache.set_missing("b")
+    assert cache.get("a") == 1
+    assert cache.get("b") is NOT_FOUND
+    assert cache.stats.hits == 1
+    assert cache.stats.negative_hits == 1
+    assert cache.stats.hit_ratio == 2 / 3
+
+
+def test_entity_cache_ttl_and_lru() -> None:
+    cache = get_cache(ttl=0)
+    cache.set("a", 1)
+    assert cache.get("a") is None
+
+    cache = get_cache()
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.stats.evictions == 1
+
+
+def test_entity_cache_invalidate_tag() -> None:
+    cache = get_cache()
+    keys = [("id", "1"), ("username", "one")]
+    for key in keys:
+        cache.set(key, 1, tags=["1"])
+    cache.invalidate_tag("1")
+    assert len(cache) == 0
+    assert cache.stats.invalidations == len(keys)
+
+
+def test_entity_cache_skips_stale_write() -> None:
+    cache = get_cache()
+    version = cache.version
+    cache.invalidate("a")
+    cache.set("a", 1, version=version)
+    assert cache.get("a") is None
+
+
+def test_entity_cache_disabled() -> None:
+    cache = get_cache(enabled=False)
+    cache.set("a", 1)
+    assert cache.get("a") is None
@@ -0,0 +1,67 @@
+# ruff: noqa: S101
+from fastapi import status
+from starlette.requests import Request
+
+from src.core.utils.etag import (
+    conditional_response,
+    content_etag,
+    entity_etag,
+    etag_matches,
+)
+from src.models.role import Role, RoleUpdate
+
+
+def make_request(if_none_match: str | None = None) -> Request:
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({"type": "http", "method": "GET", "headers": headers})
+
+
+def test_entity_etag_changes_with_updates_only() -> None:
+    role = Role(id="0" * 24, name="root", permissions=[])
+    assert entity_etag(role) == entity_etag(role.model_copy())
+    updated = role.model_copy(update={"updated_at": "2030-01-01T00:00:00+00:00"})
+    assert entity_etag(updated) != entity_etag(role)
+
+
+def test_created_at_is_set_per_instance() -> None:
+    first = Role(name="a", permissions=[])
+    second = Role(name="b", permissions=[])
+    assert first.created_at <= second.created_at
+    assert Role.model_fields["created_at"].default_factory is not None
+
+
+def test_updates_are_stamped_by_the_server() -> None:
+    # A read entity sent back as an update carries "updated_at": null
+    role = Role(name="a", permissions=[]).model_dump()
+    assert role["updated_at"] is None
+    update = RoleUpdate.model_validate({**role, "updated_at": "1999-01-01"})
+    assert update.updated_at > "2000"
+    assert RoleUpdate.model_validate(role).updated_at is not None
+
+
+def test_if_none_match_parsing() -> None:
+    etag = content_etag(b"body")
+    assert etag_matches(make_request(etag), etag)
+    assert etag_matches(make_request(f'"other", W/{etag}'), etag)
+    assert etag_matches(make_request("*"), etag)
+    assert not etag_matches(make_request('"other"'), etag)
+    assert not etag_matches(make_request(), etag)
+
+
+def test_not_modified_skips_rendering() -> None:
+    etag = content_etag(b"body")
+    calls = []
+
+    def render() -> bytes:
+        calls.append(1)
+        return b"body"
+
+    response = conditional_response(make_request(etag), etag, render)
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.headers["etag"] == etag
+    assert calls == []
+
+    response = conditional_response(make_request('"stale"'), etag, render)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.body == b"body"
+    assert calls == [1]
@@ -0,0 +1,153 @@
+# ruff: noqa: S101
+import asyncio
+import os
+import signal
+import time
+
+import pytest
+from fastapi import FastAPI, status
+from httpx import ASGITransport, AsyncClient
+
+from src.core.middlewares.drain import DrainASGIMiddleware, DrainState, drain_state
+from src.db.health import MongoPing, mongo_ping
+from src.services.router import router
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture(scope="session")
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+class FakeDb:
+    def __init__(self) -> None:
+        self.pings = 0
+        self.error: Exception | None = None
+
+    async def command(self, name: str) -> dict:
+        assert name == "ping"
+        self.pings += 1
+        if self.error is not None:
+            raise self.error
+        return {"ok": 1.0}
+
+
+def client_for(app: FastAPI) -> AsyncClient:
+    return AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+
+
+async def test_mongo_ping_is_cached_between_probes() -> None:
+    db = FakeDb()
+    ping = MongoPing(interval=60, timeout=1)
+    assert not ping.healthy
+
+    ping.start(db)
+    await asyncio.sleep(0.01)
+    assert ping.healthy
+    assert [ping.healthy for _ in range(10)] == [True] * 10
+    assert db.pings == 1
+
+    db.error = ConnectionError("down")
+    assert not await ping.check(db)
+    assert not ping.healthy
+    assert ping.error == "down"
+    await ping.stop()
+
+
+async def test_stale_ping_result_is_not_healthy() -> None:
+    ping = MongoPing(interval=1, timeout=1)
+    await ping.check(FakeDb())
+    assert ping.healthy
+    ping.checked_at = time.monotonic() - 3
+    assert not ping.healthy
+
+
+async def test_readiness_follows_ping_and_drain(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    app = FastAPI()
+    app.include_router(router)
+    monkeypatch.setattr(mongo_ping, "ok", False)
+    monkeypatch.setattr(mongo_ping, "checked_at", None)
+    drain_state.install(delay=0)
+
+    try:
+        async with client_for(app) as client:
+            live = await client.get("/health/live")
+            assert live.status_code == status.HTTP_200_OK
+            ready = await client.get("/health/ready")
+            assert ready.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+
+            await mongo_ping.check(FakeDb())
+            ready = await client.get("/health/ready")
+            assert ready.status_code == status.HTTP_200_OK
+            assert ready.json() == {"status": "Ready"}
+
+            drain_state.begin()
+            draining = await client.get("/health/ready")
+            assert draining.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+            assert draining.json() == {"status": "Draining"}
+    finally:
+        drain_state.uninstall()
+
+
+async def test_install_clears_a_previous_drain() -> None:
+    state = DrainState()
+    state.install(delay=0)
+    state.begin()
+    state.request_started()
+    state.uninstall()
+
+    # The app started again in the same process, eg. by a test client
+    state.install(delay=0)
+    try:
+        assert not state.draining
+        assert state.in_flight == 0
+        assert await state.wait_idle(grace=0)
+    finally:
+        state.uninstall()
+
+
+async def test_drain_waits_for_in_flight_and_closes_connections() -> None:
+    state = DrainState()
+    release = asyncio.Event()
+    app = FastAPI()
+
+    @app.get("/slow")
+    async def slow() -> dict:
+        await release.wait()
+        return {"ok": True}
+
+    app.add_middleware(DrainASGIMiddleware, state=state)
+    async with client_for(app) as client:
+        running = asyncio.ensure_future(client.get("/slow"))
+        await asyncio.sleep(0.01)
+        assert state.in_flight == 1
+
+        state.begin()
+        assert not await state.wait_idle(grace=0.01)
+
+        release.set()
+        assert await state.wait_idle(grace=1)
+        response = await running
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["connection"] == "close"
+
+
+async def test_sigterm_fails_readiness_before_reaching_the_server() -> None:
+    received = []
+    original = signal.signal(signal.SIGTERM, lambda *_: received.append(True))
+    state = DrainState()
+    try:
+        state.install(delay=0.05)
+        os.kill(os.getpid(), signal.SIGTERM)
+        await asyncio.sleep(0.01)
+        assert state.draining
+        assert received == []
+
+        await asyncio.sleep(0.1)
+        assert received == [True]
+    finally:
+        state.uninstall()
+        signal.signal(signal.SIGTERM, original)
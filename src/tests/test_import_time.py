@@ -0,0 +1,43 @@
+# ruff: noqa: S101
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).parents[2]
+# Relative to fastapi so the machine speed cancels out, measured around 2.2
+IMPORT_BUDGET_RATIO = 2.6
+LAZY_MODULES = ("fastapi_mail", "markdown", "toml")
+
+
+def import_main(cwd: Path) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import src.main"],
+        cwd=cwd,
+        env={"PYTHONPATH": str(ROOT), "ENV": "test"},
+        capture_output=True,
+        text=True,
+        check=True,
+        timeout=60,
+    )
+
+
+def parse_importtime(stderr: str) -> dict[str, int]:
+    """Cumulative import time in microseconds of each module."""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        if cumulative.strip().isdigit():
+            modules[name.strip()] = int(cumulative)
+    return modules
+
+
+def test_import_is_fast_and_has_no_side_effects(tmp_path: Path) -> None:
+    result = import_main(tmp_path)
+    modules = parse_importtime(result.stderr)
+
+    assert modules["src.main"] / modules["fastapi"] < IMPORT_BUDGET_RATIO
+    assert [name for name in LAZY_MODULES if name in modules] == []
+    assert result.stdout == ""
+    assert not (tmp_path / "logs").exists()
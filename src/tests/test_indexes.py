@@ -0,0 +1,57 @@
+# ruff: noqa: S101
+import mongomock
+from pymongo import ASCENDING, IndexModel
+
+from src.db.collections import collections
+from src.db.indexes import ensure_indexes_sync, plan_indexes
+
+DECLARED = [
+    IndexModel([("username", ASCENDING)], name="username_unique", unique=True),
+    IndexModel([("created_at", ASCENDING)], name="created_at"),
+]
+
+
+def test_plan_creates_missing_indexes() -> None:
+    existing = {"_id_": {"v": 2, "key": [("_id", 1)]}}
+    to_create, conflicts = plan_indexes(existing, DECLARED)
+    assert conflicts == []
+    assert [model.document["name"] for model in to_create] == [
+        "username_unique",
+        "created_at",
+    ]
+
+
+def test_plan_is_a_noop_when_indexes_match() -> None:
+    existing = {
+        "_id_": {"v": 2, "key": [("_id", 1)]},
+        "username_unique": {"v": 2, "key": [("username", 1)], "unique": True},
+        "created_at": {"v": 2, "key": [("created_at", 1)]},
+        "manual": {"v": 2, "key": [("name", 1)]},
+    }
+    assert plan_indexes(existing, DECLARED) == ([], [])
+
+
+def test_plan_reports_clashing_indexes_without_dropping() -> None:
+    existing = {
+        "username_unique": {"v": 2, "key": [("username", 1)]},
+        "created_at_1": {"v": 2, "key": [("created_at", 1)]},
+    }
+    to_create, conflicts = plan_indexes(existing, DECLARED)
+    assert to_create == []
+    assert conflicts == ["username_unique", "created_at_1"]
+
+
+def test_plan_creates_indexes_that_do_not_clash() -> None:
+    existing = {"created_at_1": {"v": 2, "key": [("created_at", 1)]}}
+    to_create, conflicts = plan_indexes(existing, DECLARED)
+    assert [model.document["name"] for model in to_create] == ["username_unique"]
+    assert conflicts == ["created_at_1"]
+
+
+def test_ensure_indexes_returns_the_conflicts() -> None:
+    db = mongomock.MongoClient().get_database("indexes")
+    users = db.get_collection(collections.users_collection)
+    users.create_index([("username", ASCENDING)], name="username_1")
+
+    assert ensure_indexes_sync(db) == {collections.users_collection: ["username_1"]}
+    assert ensure_indexes_sync(db) == {collections.users_collection: ["username_1"]}
@@ -0,0 +1,22 @@
+# ruff: noqa: S101
+import json
+from datetime import UTC, datetime
+
+import pytest
+from bson import ObjectId
+
+from src.core.utils.json import ORJSONResponse, orjson_log_serializer
+
+pytest.importorskip("orjson")
+
+
+def test_orjson_response_objectid_and_datetime() -> None:
+    oid = ObjectId()
+    now = datetime(2024, 10, 18, 12, 30, tzinfo=UTC)
+    body = json.loads(ORJSONResponse({"_id": oid, "at": now}).body)
+    assert body == {"_id": str(oid), "at": "2024-10-18T12:30:00+00:00"}
+
+
+def test_orjson_log_serializer_falls_back_to_repr() -> None:
+    line = orjson_log_serializer({"event": "x", "value": object, "id": ObjectId()})
+    assert json.loads(line)["value"] == repr(object)
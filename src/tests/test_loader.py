@@ -0,0 +1,108 @@
+# ruff: noqa: S101
+import asyncio
+
+import pytest
+from bson import ObjectId
+
+from src.db.query.loader import BatchLoader
+from src.models.role import Role
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture(scope="session")
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+class FakeCursor:
+    def __init__(self, docs: list[dict]) -> None:
+        self.docs = docs
+
+    async def __aiter__(self):
+        for doc in self.docs:
+            await asyncio.sleep(0)
+            yield doc
+
+
+class FakeDb:
+    """Records the `$in` lists queried through `get_collection().find()`."""
+
+    name = "fake"
+
+    def __init__(self, docs: list[dict]) -> None:
+        self.docs = {doc["_id"]: doc for doc in docs}
+        self.queries: list[list[ObjectId]] = []
+
+    def get_collection(self, _: str) -> "FakeDb":
+        return self
+
+    def find(self, query: dict, _: dict) -> FakeCursor:
+        ids = query["_id"]["$in"]
+        self.queries.append(ids)
+        return FakeCursor([self.docs[i] for i in ids if i in self.docs])
+
+
+def make_loader(max_batch: int = 100) -> BatchLoader:
+    return BatchLoader("test", "roles", Role, max_batch=max_batch)
+
+
+async def test_same_tick_lookups_share_one_query() -> None:
+    ids = [ObjectId() for _ in range(3)]
+    db = FakeDb([{"_id": i, "name": str(i)} for i in ids[:2]])
+    loader = make_loader()
+
+    results = await asyncio.gather(
+        *(loader.load(db, i) for i in [*ids, ids[0], ids[0]]),
+    )
+
+    assert db.queries == [ids]
+    assert [r["name"] if r else None for r in results] == [
+        str(ids[0]),
+        str(ids[1]),
+        None,
+        str(ids[0]),
+        str(ids[0]),
+    ]
+    assert loader.stats.batches == 1
+    assert loader.stats.dedup_ratio == pytest.approx(2 / 5)
+
+
+async def test_in_flight_lookup_is_shared_until_forgotten() -> None:
+    entity_id = ObjectId()
+    db = FakeDb([{"_id": entity_id, "name": "a"}])
+    loader = make_loader()
+
+    first = asyncio.ensure_future(loader.load(db, entity_id))
+    await asyncio.sleep(0)  # dispatched, query in flight
+    joined = asyncio.ensure_future(loader.load(db, entity_id))
+    await asyncio.sleep(0)
+    loader.forget(db, entity_id)
+    fresh = asyncio.ensure_future(loader.load(db, entity_id))
+
+    await asyncio.gather(first, joined, fresh)
+    assert db.queries == [[entity_id], [entity_id]]
+
+
+async def test_batches_are_capped() -> None:
+    ids = [ObjectId() for _ in range(5)]
+    db = FakeDb([])
+    loader = make_loader(max_batch=2)
+    await asyncio.gather(*(loader.load(db, i) for i in ids))
+    assert [len(query) for query in db.queries] == [2, 2, 1]
+
+
+async def test_failed_query_fails_every_waiter() -> None:
+    class BrokenDb(FakeDb):
+        def find(self, *_: dict) -> FakeCursor:
+            message = "down"
+            raise RuntimeError(message)
+
+    loader = make_loader()
+    db = BrokenDb([])
+    results = await asyncio.gather(
+        loader.load(db, ObjectId()),
+        loader.load(db, ObjectId()),
+        return_exceptions=True,
+    )
+    assert all(isinstance(result, RuntimeError) for result in results)
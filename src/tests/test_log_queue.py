@@ -0,0 +1,39 @@
+# ruff: noqa: S101
+import logging
+import queue
+
+from src.core.logger.log import BoundedQueueHandler
+
+
+def get_record(message: str) -> logging.LogRecord:
+    return logging.LogRecord("test", logging.INFO, __file__, 0, message, None, None)
+
+
+def test_bounded_queue_handler_drops_when_full() -> None:
+    handler = BoundedQueueHandler(queue.Queue(maxsize=1), block=False, timeout=0)
+    messages = ("first", "second", "third")
+    for message in messages:
+        handler.emit(get_record(message))
+    assert handler.queue.get_nowait().getMessage() == "first"
+    assert handler.dropped == len(messages) - 1
+
+
+def test_bounded_queue_handler_blocks_then_drops() -> None:
+    handler = BoundedQueueHandler(queue.Queue(maxsize=1), block=True, timeout=0.01)
+    handler.emit(get_record("first"))
+    handler.emit(get_record("second"))
+    assert handler.dropped == 1
+
+
+def test_bounded_queue_handler_starts_the_consumer_once() -> None:
+    started = []
+    handler = BoundedQueueHandler(
+        queue.Queue(),
+        block=False,
+        timeout=0,
+        start=lambda: started.append(True),
+    )
+    handler.emit(get_record("first"))
+    handler.emit(get_record("second"))
+    assert started == [True]
+    assert handler.dropped == 0
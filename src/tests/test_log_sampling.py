@@ -0,0 +1,70 @@
+# ruff: noqa: S101
+import json
+
+import pytest
+import structlog
+
+from src.core.logger import log
+from src.core.logger.context import request_log_state
+from src.core.logger.log import drop_unsampled, get_processors, replay_events
+from src.core.logger.sampling import (
+    RequestLogState,
+    RouteSampler,
+    parse_route_rates,
+)
+
+
+def test_route_sampler_keeps_one_in_n_per_route() -> None:
+    sampler = RouteSampler(rate=0.25, route_rates={"/health": 0, "/auth": 1})
+    samples = [sampler.sample("/users") for _ in range(8)]
+    assert samples.count(True) == len(samples) * 0.25
+    assert sampler.sample("/roles")
+    assert not any(sampler.sample("/health") for _ in range(4))
+    assert all(sampler.sample("/auth") for _ in range(4))
+
+
+def test_parse_route_rates() -> None:
+    assert parse_route_rates("/health=0, /auth=1") == {"/health": 0, "/auth": 1}
+    assert parse_route_rates(None) == {}
+
+
+def test_drop_unsampled_keeps_warnings() -> None:
+    token = request_log_state.set(RequestLogState(scope={}, sampled=False))
+    try:
+        with pytest.raises(structlog.DropEvent):
+            drop_unsampled(None, "info", {"event": "x"})
+        assert drop_unsampled(None, "warning", {"event": "x"}) == {"event": "x"}
+    finally:
+        request_log_state.reset(token)
+    assert drop_unsampled(None, "info", {"event": "x"}) == {"event": "x"}
+
+
+def test_unsampled_events_are_held_until_settled() -> None:
+    state = RequestLogState(scope={}, sampled=False)
+    token = request_log_state.set(state)
+    try:
+        with pytest.raises(structlog.DropEvent):
+            drop_unsampled(None, "info", {"event": "x"})
+    finally:
+        request_log_state.reset(token)
+    assert state.settle() == [("info", {"event": "x"})]
+    state.hold("info", {"event": "y"})
+    assert state.pending == []
+
+
+def test_replay_events_keeps_the_original_timestamp(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    records = []
+    monkeypatch.setattr(log.app_logger, "info", records.append)
+    config = structlog.get_config()
+    structlog.configure(processors=get_processors("production"))
+    try:
+        replay_events([("info", {"event": "x", "timestamp": "then"})])
+    finally:
+        structlog.configure(processors=config["processors"])
+    assert json.loads(records[0]) == {
+        "event": "x",
+        "timestamp": "then",
+        "level": "info",
+    }
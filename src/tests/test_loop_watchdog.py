@@ -0,0 +1,88 @@
+# ruff: noqa: S101
+import asyncio
+import time
+
+import pytest
+
+from src.core.logger.context import request_id
+from src.core.metrics import loop_lag
+from src.core.metrics.loop_lag import LoopLagMonitor, LoopWatchdog
+
+pytestmark = pytest.mark.anyio
+
+THRESHOLD = 0.05
+
+
+@pytest.fixture(scope="session")
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+@pytest.fixture
+def reports(monkeypatch: pytest.MonkeyPatch) -> list[dict]:
+    reports = []
+    monkeypatch.setattr(
+        loop_lag.logger,
+        "warning",
+        lambda **kwargs: reports.append(kwargs),
+    )
+    return reports
+
+
+def block_the_loop(seconds: float) -> None:
+    time.sleep(seconds)
+
+
+async def handle_request(seconds: float) -> None:
+    request_id.set("req-blocking")
+    block_the_loop(seconds)
+
+
+async def test_blocking_callback_is_reported_once_with_its_stack(
+    reports: list[dict],
+) -> None:
+    monitor = LoopLagMonitor(interval=0.01)
+    watchdog = LoopWatchdog(monitor, threshold=THRESHOLD)
+    monitor.start()
+    watchdog.start()
+    try:
+        await asyncio.sleep(0.05)
+        await asyncio.ensure_future(handle_request(0.3))
+        await asyncio.sleep(0.1)
+    finally:
+        watchdog.stop()
+        await monitor.stop()
+
+    assert watchdog.stalls == 1
+    (report,) = reports
+    assert report["event"] == "app.loop.blocked"
+    assert report["request_id"] == "req-blocking"
+    assert report["blocked_ms"] >= THRESHOLD * 1000
+    assert "block_the_loop" in report["stack"]
+
+
+async def test_healthy_loop_is_not_reported(reports: list[dict]) -> None:
+    monitor = LoopLagMonitor(interval=0.01)
+    watchdog = LoopWatchdog(monitor, threshold=THRESHOLD)
+    monitor.start()
+    watchdog.start()
+    try:
+        await asyncio.sleep(0.2)
+    finally:
+        watchdog.stop()
+        await monitor.stop()
+
+    assert watchdog.stalls == 0
+    assert reports == []
+
+
+def test_lag_quantiles_over_recent_probes() -> None:
+    monitor = LoopLagMonitor(interval=0.01, window=100)
+    assert monitor.quantiles() == {0.5: 0.0, 0.9: 0.0, 0.99: 0.0}
+
+    monitor._samples.extend(i / 1000 for i in range(1, 101))  # noqa: SLF001
+
+    quantiles = monitor.quantiles()
+    assert quantiles[0.5] == pytest.approx(0.05, abs=0.001)
+    assert quantiles[0.9] == pytest.approx(0.09, abs=0.001)
+    assert quantiles[0.99] == pytest.approx(0.099, abs=0.001)
@@ -0,0 +1,74 @@
+# ruff: noqa: S101
+import pytest
+from fastapi import APIRouter, FastAPI, status
+from fastapi.responses import Response
+from httpx import ASGITransport, AsyncClient
+
+from src.core.exceptions.client_exception import ClientError
+from src.core.metrics.registry import render_metrics
+from src.core.middlewares.metrics import MetricsASGIMiddleware
+from src.main import client_exception_handler
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture(scope="session")
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+def build_app() -> FastAPI:
+    router = APIRouter()
+
+    @router.get("/{item_id}")
+    async def get_item(item_id: str) -> dict:
+        return {"id": item_id}
+
+    app = FastAPI()
+    app.include_router(router, prefix="/metrics-test")
+
+    @app.get("/metrics")
+    async def metrics() -> Response:
+        data, content_type = render_metrics()
+        return Response(content=data, media_type=content_type)
+
+    app.add_middleware(MetricsASGIMiddleware)
+    return app
+
+
+async def test_requests_are_labelled_by_route_template() -> None:
+    transport = ASGITransport(app=build_app())
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        await client.get("/metrics-test/1")
+        await client.get("/metrics-test/2")
+        await client.get("/missing")
+        response = await client.get("/metrics")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert (
+        'http_requests_total{method="GET",route="/metrics-test/{item_id}",'
+        'status="200"} 2.0'
+    ) in body
+    assert 'route="unmatched",status="404"' in body
+    assert "http_request_duration_seconds_bucket" in body
+
+
+async def test_client_errors_are_counted() -> None:
+    # Specific exception handlers run inside the middleware stack, a ClientError
+    # response goes through the metrics middleware like any other
+    app = build_app()
+    app.add_exception_handler(ClientError, client_exception_handler)
+
+    @app.get("/missing-item")
+    async def missing_item() -> dict:
+        raise ClientError(status.HTTP_404_NOT_FOUND)
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/missing-item")
+        metrics = await client.get("/metrics")
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert 'route="/missing-item",status="404"} 1.0' in metrics.text
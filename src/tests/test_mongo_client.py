@@ -0,0 +1,65 @@
+# ruff: noqa: S101
+import pytest
+from prometheus_client import REGISTRY
+from pymongo import monitoring
+
+from src.config.settings import settings
+from src.db.client import PoolMetricsListener, client_options, create_client
+
+ADDRESS = ("db.test", 27017)
+POOL_SIZE = 7
+
+
+def sample(name: str, **labels: str) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_client_options_skip_unset_values(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "MONGO_MAX_POOL_SIZE", POOL_SIZE)
+    monkeypatch.setattr(settings, "MONGO_WAIT_QUEUE_TIMEOUT_MS", None)
+    monkeypatch.setattr(settings, "MONGO_COMPRESSORS", "zlib")
+    options = client_options()
+    assert options["maxPoolSize"] == POOL_SIZE
+    assert options["compressors"] == "zlib"
+    assert "waitQueueTimeoutMS" not in options
+
+
+def test_create_client_applies_pool_options(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "MONGO_MAX_POOL_SIZE", POOL_SIZE)
+    monkeypatch.setattr(settings, "MONGO_WAIT_QUEUE_TIMEOUT_MS", 250)
+    client = create_client()
+    try:
+        pool_options = client.delegate.options.pool_options
+        assert pool_options.max_pool_size == POOL_SIZE
+        assert pool_options.wait_queue_timeout == 250 / 1000
+        assert sample("mongo_pool_max_size") == POOL_SIZE
+    finally:
+        client.close()
+
+
+def test_pool_listener_tracks_checkouts_and_churn() -> None:
+    listener = PoolMetricsListener()
+    address = "db.test:27017"
+    created = sample("mongo_connections_created_total")
+    timeouts = sample("mongo_pool_checkout_failures_total", reason="timeout")
+
+    listener.connection_created(monitoring.ConnectionCreatedEvent(ADDRESS, 1))
+    listener.connection_checked_out(
+        monitoring.ConnectionCheckedOutEvent(ADDRESS, 1, 0.002),
+    )
+    assert sample("mongo_pool_checked_out", address=address) == 1
+    assert sample("mongo_pool_connections", address=address) == 1
+
+    listener.connection_check_out_failed(
+        monitoring.ConnectionCheckOutFailedEvent(ADDRESS, "timeout", 0.5),
+    )
+    listener.connection_checked_in(monitoring.ConnectionCheckedInEvent(ADDRESS, 1))
+    listener.connection_closed(monitoring.ConnectionClosedEvent(ADDRESS, 1, "idle"))
+
+    assert sample("mongo_pool_checked_out", address=address) == 0
+    assert sample("mongo_pool_connections", address=address) == 0
+    assert sample("mongo_connections_created_total") == created + 1
+    assert sample("mongo_connections_closed_total", reason="idle") >= 1
+    assert (
+        sample("mongo_pool_checkout_failures_total", reason="timeout") == timeouts + 1
+    )
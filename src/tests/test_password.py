@@ -0,0 +1,40 @@
+# ruff: noqa: S101
+import asyncio
+
+import pytest
+from fastapi import status
+
+from src.core.exceptions.service_exception import ServiceUnavailableError
+from src.core.security.password import PasswordHasher
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture(scope="session")
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+async def test_hash_and_verify() -> None:
+    hasher = PasswordHasher(workers=2, max_queue=2)
+    hashed = await hasher.hash("secret")
+    verified = [await hasher.verify(password, hashed) for password in ("secret", "x")]
+    assert verified == [True, False]
+    assert hasher.verify_sync("secret", hashed)
+    # verify_sync runs on the calling thread, the pool ran the hash and verify
+    assert hasher.stats.completed == 1 + len(verified)
+    assert hasher.pending == 0
+    hasher.shutdown()
+
+
+async def test_hash_rejects_when_queue_full() -> None:
+    workers, max_queue = 1, 1
+    hasher = PasswordHasher(workers=workers, max_queue=max_queue)
+    hashed = hasher.hash_sync("secret")
+    calls = [hasher.verify("secret", hashed) for _ in range(4)]
+    results = await asyncio.gather(*calls, return_exceptions=True)
+    rejected = [r for r in results if isinstance(r, ServiceUnavailableError)]
+    assert len(rejected) == len(calls) - workers - max_queue
+    assert rejected[0].status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert hasher.stats.rejected == len(rejected)
+    hasher.shutdown()
@@ -0,0 +1,30 @@
+# ruff: noqa: S101
+import pytest
+
+from src.db.query.projection import projection_for
+from src.models.role import Role
+from src.models.user import User, UserOut
+
+
+def test_read_models_never_project_the_password() -> None:
+    projection = projection_for(User)
+    assert "password" not in projection
+    assert projection["_id"] == 1
+    assert "id" not in projection
+    assert {"username", "name", "role_id", "created_at"} <= projection.keys()
+
+
+def test_login_model_projects_the_password() -> None:
+    assert projection_for(UserOut)["password"] == 1
+
+
+def test_projection_is_cached_per_model() -> None:
+    assert projection_for(Role) is projection_for(Role)
+    assert "permissions" in projection_for(Role)
+
+
+def test_cached_projection_is_read_only() -> None:
+    projection = projection_for(Role)
+    with pytest.raises(TypeError):
+        projection["password"] = 1
+    assert "password" not in projection_for(Role)
@@ -0,0 +1,80 @@
+# ruff: noqa: S101
+from pathlib import Path
+
+import pytest
+
+from src import server
+from src.config.settings import Settings
+
+CPU_COUNT = 6
+
+
+def test_workers_default_to_cpu_count(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(server.settings, "SERVER_WORKERS", None)
+    monkeypatch.setattr(server.os, "cpu_count", lambda: CPU_COUNT)
+    assert server.worker_count() == CPU_COUNT
+
+    monkeypatch.setattr(server.settings, "SERVER_WORKERS", CPU_COUNT // 2)
+    assert server.worker_count() == CPU_COUNT // 2
+
+
+@pytest.fixture
+def no_env_file(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    # Settings also read `.env` from the working directory
+    monkeypatch.chdir(tmp_path)
+
+
+@pytest.mark.usefixtures("no_env_file")
+def test_several_workers_need_a_shared_secret(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("JWT_SECRET", raising=False)
+    monkeypatch.setattr(server, "settings", Settings())
+
+    server.check_shared_secret(1)
+    with pytest.raises(SystemExit):
+        server.check_shared_secret(2)
+
+    monkeypatch.setenv("JWT_SECRET", "shared")
+    monkeypatch.setattr(server, "settings", Settings())
+    server.check_shared_secret(2)
+
+
+@pytest.mark.usefixtures("no_env_file")
+def test_production_requires_jwt_secret(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("ENV", "prod")
+    monkeypatch.delenv("JWT_SECRET", raising=False)
+    with pytest.raises(ValueError, match="JWT_SECRET"):
+        Settings()
+
+    monkeypatch.setenv("JWT_SECRET", "shared")
+    assert Settings().JWT_SECRET == "shared"  # noqa: S105
+
+
+def test_metrics_dir_is_emptied_for_several_workers(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    stale = tmp_path / "gauge_livesum_123.db"
+    stale.write_bytes(b"old")
+    unrelated = tmp_path / "notes.txt"
+    unrelated.write_text("kept")
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+
+    assert server.prepare_metrics_dir(1) is None
+    assert stale.exists()
+
+    assert server.prepare_metrics_dir(4) is None
+    assert list(tmp_path.iterdir()) == [unrelated]
+
+
+def test_metrics_dir_is_created_when_unset(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    environ: dict[str, str] = {}
+    monkeypatch.setattr(server.os, "environ", environ)
+    monkeypatch.setattr(server.tempfile, "tempdir", str(tmp_path))
+
+    created = server.prepare_metrics_dir(4)
+    assert created is not None
+    assert created.parent == tmp_path
+    assert environ["PROMETHEUS_MULTIPROC_DIR"] == str(created)
@@ -0,0 +1,49 @@
+# ruff: noqa: S101
+from datetime import UTC, datetime, timedelta
+
+from src.core.security.token_cache import TokenCache
+from src.models.token import TokenDecrypted
+
+
+def get_token(minutes: int = 5) -> TokenDecrypted:
+    return TokenDecrypted(
+        sub="tester",
+        scopes=["user:read", "role:read"],
+        user_id="0" * 24,
+        role_id="1" * 24,
+        exp=datetime.now(UTC) + timedelta(minutes=minutes),
+    )
+
+
+def test_token_cache_hit_and_miss() -> None:
+    cache = TokenCache(max_size=2)
+    assert cache.get("a") is None
+    entry = cache.put("a", get_token())
+    assert cache.get("a") is entry
+    assert entry.scopes >= {"user:read"}
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_token_cache_expires_at_exp() -> None:
+    cache = TokenCache(max_size=2)
+    cache.put("a", get_token(minutes=-1))
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_token_cache_evicts_lru() -> None:
+    cache = TokenCache(max_size=2)
+    cache.put("a", get_token())
+    cache.put("b", get_token())
+    cache.get("a")
+    cache.put("c", get_token())
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.evictions == 1
+
+
+def test_token_cache_disabled() -> None:
+    cache = TokenCache(max_size=0)
+    cache.put("a", get_token())
+    assert cache.get("a") is None
+    assert len(cache) == 0
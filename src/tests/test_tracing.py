@@ -0,0 +1,97 @@
+# ruff: noqa: S101
+from collections.abc import Iterator
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+    InMemorySpanExporter,
+)
+from opentelemetry.trace import StatusCode
+
+from src.core.logger.spans import create_span, get_span_tree, monitor
+from src.core.logger.tracing import add_span_exporter
+from src.core.middlewares.logger import LoggingASGIMiddleware
+
+pytestmark = pytest.mark.anyio
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+TRACEPARENT = f"00-{TRACE_ID}-00f067aa0ba902b7-01"
+
+
+@pytest.fixture(scope="session")
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+@pytest.fixture
+def exporter() -> Iterator[InMemorySpanExporter]:
+    exporter = InMemorySpanExporter()
+    processor = add_span_exporter(exporter, batch=False)
+    yield exporter
+    processor.shutdown()
+
+
+@monitor
+async def inner() -> None:
+    with create_span("inner.step", step=1):
+        pass
+
+
+@monitor("outer")
+async def outer() -> list[dict]:
+    await inner()
+    return get_span_tree()
+
+
+def get_app() -> FastAPI:
+    app = FastAPI()
+
+    # The span is named after the route template, not the requested path
+    @app.get("/spans/{item_id}")
+    async def spans(item_id: str) -> list[dict]:  # noqa: ARG001
+        return await outer()
+
+    return app
+
+
+async def test_spans_are_a_tree_exported_with_traceparent(
+    exporter: InMemorySpanExporter,
+) -> None:
+    async with AsyncClient(
+        transport=ASGITransport(app=LoggingASGIMiddleware(get_app())),
+        base_url="http://test",
+    ) as client:
+        response = await client.get("/spans/1", headers={"traceparent": TRACEPARENT})
+
+    assert response.headers["traceparent"].split("-")[1] == TRACE_ID
+    tree = response.json()
+    assert tree[0]["name"] == "outer"
+    assert tree[0]["children"][0]["name"] == "inner"
+    assert tree[0]["children"][0]["children"][0]["attributes"] == {"step": 1}
+
+    spans = {span.name: span for span in exporter.get_finished_spans()}
+    server = spans["GET /spans/{item_id}"]
+    assert format(server.context.trace_id, "032x") == TRACE_ID
+    assert spans["outer"].parent.span_id == server.context.span_id
+    assert spans["inner"].parent.span_id == spans["outer"].context.span_id
+    assert spans["inner.step"].parent.span_id == spans["inner"].context.span_id
+
+
+async def test_requests_do_not_share_spans() -> None:
+    async with AsyncClient(
+        transport=ASGITransport(app=LoggingASGIMiddleware(get_app())),
+        base_url="http://test",
+    ) as client:
+        first = await client.get("/spans/1")
+        second = await client.get("/spans/2")
+    assert len(first.json()) == len(second.json()) == 1
+
+
+def test_span_error_status(exporter: InMemorySpanExporter) -> None:
+    message = "boom"
+    with pytest.raises(ValueError, match=message), create_span("failing"):
+        raise ValueError(message)
+    (span,) = exporter.get_finished_spans()
+    assert span.status.status_code == StatusCode.ERROR
+    assert span.events[0].name == "exception"
@@ -0,0 +1,40 @@
+# ruff: noqa: S101
+from fastapi import APIRouter, FastAPI
+from pydantic import BaseModel
+
+from src.core.utils import etag
+from src.core.utils.warmup import response_annotations, warm_up
+
+
+class Item(BaseModel):
+    name: str
+
+
+def build_app() -> FastAPI:
+    router = APIRouter()
+
+    @router.get("")
+    async def items() -> list[Item] | Item:
+        return []
+
+    app = FastAPI()
+    app.include_router(router, prefix="/items")
+
+    @app.get("/status")
+    async def status() -> dict:
+        return {}
+
+    return app
+
+
+def test_response_annotations_include_routers_and_split_unions() -> None:
+    assert response_annotations(build_app()) == {list[Item], Item, dict}
+
+
+def test_warm_up_builds_schema_and_serializers() -> None:
+    app = build_app()
+    warm_up(app)
+
+    assert app.openapi_schema is not None
+    assert "/items" in app.openapi_schema["paths"]
+    assert list[Item] in etag._adapters  # noqa: SLF001
@@ -0,0 +1,64 @@
+"""Find the commands of a test run that Mongo answers with a collection scan."""
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import monitoring
+
+# Commands `explain` accepts, writes are explained one statement at a time
+EXPLAINABLE = {"find", "aggregate", "count", "distinct", "findAndModify"}
+STATEMENTS = {"update": "updates", "delete": "deletes"}
+
+
+class CommandRecorder(monitoring.CommandListener):
+    """Record the explainable commands sent through a client."""
+
+    def __init__(self) -> None:
+        self.commands: list[dict] = []
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        name = event.command_name
+        command = {
+            key: value
+            for key, value in event.command.items()
+            if not key.startswith("$") and key not in ("lsid", "txnNumber")
+        }
+        if name in EXPLAINABLE:
+            self.commands.append(command)
+        elif name in STATEMENTS:
+            field = STATEMENTS[name]
+            for statement in command[field]:
+                self.commands.append({**command, field: [statement]})
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        pass
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        pass
+
+    def take(self) -> list[dict]:
+        commands, self.commands = self.commands, []
+        return commands
+
+
+def _stages(plan: object) -> set[str]:
+    if isinstance(plan, list):
+        return set().union(*(_stages(item) for item in plan))
+    if not isinstance(plan, dict):
+        return set()
+    stages = {plan["stage"]} if isinstance(plan.get("stage"), str) else set()
+    return stages.union(*(_stages(value) for value in plan.values()))
+
+
+async def find_collscans(db: AsyncIOMotorDatabase, commands: list[dict]) -> list[dict]:
+    """Return the commands whose winning plan contains a COLLSCAN stage."""
+    scans = []
+    for command in commands:
+        explained = await db.command(
+            {"explain": command, "verbosity": "queryPlanner"},
+        )
+        planner = explained.get("queryPlanner") or explained["stages"][0].get(
+            "$cursor",
+            {},
+        ).get("queryPlanner", {})
+        if "COLLSCAN" in _stages(planner.get("winningPlan", {})):
+            scans.append(command)
+    return scans
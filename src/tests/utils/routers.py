@@ -11,7 +11,7 @@ def get_role(name: str = "Root"):
 def get_user(role_id: str):
     return UserIn(
         id=str(ObjectId()),
-        username="test_user",
+        username=f"test_user_{ObjectId()}",
         name="Tester",
         role_id=role_id,
         password="123",